@@ -1,14 +1,15 @@
 import random
 import sys
 import os
-import shutil
 import sqlite3
 import time
 import threading
+import multiprocessing
 import pytz
 import logging
 import json
 import re
+import html
 from datetime import datetime
 
 # DEBUG: Print which Python is being used
@@ -18,7 +19,7 @@ print(f"PYTHON VERSION: {sys.version}")
 print(f"="*70)
 
 import pandas as pd
-from PyQt5.QtCore import Qt, QUrl, QTimer, QPropertyAnimation, QEasingCurve, QRect, QRectF, pyqtProperty, pyqtSignal
+from PyQt5.QtCore import Qt, QUrl, QTimer, QThread, QPropertyAnimation, QEasingCurve, QRect, QRectF, pyqtProperty, pyqtSignal
 from PyQt5.QtGui import QDesktopServices, QIcon, QKeySequence, QFont, QPalette, QColor, QPixmap, QPainter, QLinearGradient, QPen, QBrush, QTextCursor
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
@@ -37,7 +38,29 @@ from modern_components import (
     ModernSplitter, ModernStatusBar, ModernToolBar
 )
 from multi_vehicle_compare import MultiVehicleCompareDialog
-from database_utils import get_prequal_data, get_unique_makes, get_unique_models, get_unique_years
+from database_utils import load_setting_from_db, save_setting_to_db, initialize_db, load_saved_paths
+from repository import stored_year
+from prequal_repository import query_prequal, get_prequal_data, get_prequal_years, get_prequal_makes, get_prequal_models
+from dtc_repository import dtc_list_exists, get_dtc_rows, search_dtc
+from mag_glass_repository import mag_glass_exists, get_mag_glass_rows
+from carsys_repository import get_carsys_rows
+from chart_repository import chart_exists, get_chart_rows, get_chart_years, get_chart_makes
+from user_repository import (
+    get_users, get_user_pin, get_user_by_pin, add_user, ensure_user, update_user, set_user_pin, delete_user
+)
+from audit_repository import log_user_action, get_last_action
+from parse_cache import get_cache_settings, inspect_parse_cache, clear_parse_cache
+from import_engine import (
+    run_import, is_streaming_enabled, get_valid_excel_files, build_import_jobs,
+    CONFIG_TABLES, interrupted_imports, discard_interrupted_imports, get_memory_budget_mb
+)
+from folder_watcher import FolderWatcher
+from db_connections import read_connection, write_connection, close_connections
+from folder_backup import request_backup, get_backup_settings
+from changelog import recent_generations, generation_changes
+from dtc_search import DTC_SEARCH_TABLES, CODE_SEARCH_TABLES
+from spreadsheet_readers import available_engines
+from preflight import preflight_jobs, loadable_jobs, preflight_problems
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -437,164 +460,32 @@ class ModernDialog(QDialog):
         """)
 
 # Copy all the utility functions and database functions from the original
-def initialize_db(db_path='data.db'):
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS prequal (
-                id INTEGER PRIMARY KEY,
-                folder_path TEXT,
-                data TEXT
-            );
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS carsys (
-                id INTEGER PRIMARY KEY,
-                genericSystemName TEXT,
-                dtcSys TEXT,
-                carMake TEXT,
-                comments TEXT
-            );
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS blacklist (
-                id INTEGER PRIMARY KEY,
-                dtcCode TEXT,
-                genericSystemName TEXT,
-                dtcDescription TEXT,
-                dtcSys TEXT,
-                carMake TEXT,
-                comments TEXT
-            );
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS goldlist (
-                id INTEGER PRIMARY KEY,
-                dtcCode TEXT,
-                genericSystemName TEXT,
-                dtcDescription TEXT,
-                dtcSys TEXT,
-                carMake TEXT,
-                comments TEXT
-            );
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS mag_glass (
-                id INTEGER PRIMARY KEY,
-                genericSystemName TEXT,
-                adasModuleName TEXT,
-                carMake TEXT,
-                manufacturer TEXT,
-                autelOrBosch TEXT
-            );
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS manufacturer_chart (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                Year TEXT,
-                Make TEXT,
-                Model TEXT,
-                Calibration_Type TEXT,
-                Protech_Generic_System_Name TEXT,
-                SME_Generic_System_Name TEXT,
-                SME_Calibration_Type TEXT,
-                Feature TEXT,
-                Service_Information_Hyperlink TEXT,
-                Calibration_Pre_Requisites TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS leader_log (
-                id INTEGER PRIMARY KEY,
-                pin TEXT,
-                name TEXT
-            );
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_actions (
-                id INTEGER PRIMARY KEY,
-                user TEXT,
-                action TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            );
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS paths (
-                config_type TEXT PRIMARY KEY,
-                folder_path TEXT
-            );
-        ''')
-
-        # Insert the "Set Up" user if it doesn't exist
-        cursor.execute('SELECT * FROM leader_log WHERE name = "Set Up"')
-        if not cursor.fetchone():
-            cursor.execute('INSERT INTO leader_log (pin, name) VALUES (?, ?)', ('0000', 'Set Up'))
-
-        # Create indexes on frequently queried columns
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_leader_log_pin ON leader_log (pin)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_leader_log_name ON leader_log (name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_blacklist_dtcCode ON blacklist (dtcCode)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_blacklist_carMake ON blacklist (carMake)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_goldlist_dtcCode ON goldlist (dtcCode)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_goldlist_carMake ON goldlist (carMake)')
-
-        conn.commit()
-    except sqlite3.Error as e:
-        logging.error(f"Failed to initialize database tables: {e}")
-    finally:
-        conn.close()
-
 def get_db_connection(db_path='data.db'):
-    """Get a database connection"""
-    return sqlite3.connect(db_path)
+    """Get the calling thread's shared read connection (see db_connections); close() leaves it open"""
+    return read_connection(db_path)
 
 def handle_error(func, path, exc_info):
     """Handle file operation errors"""
     logging.error(f"Error in {func}: {path} - {exc_info}")
 
 def save_path_to_db(config_type, folder_path, db_path='data.db'):
-    import os, shutil, sqlite3, logging
-    conn = sqlite3.connect(db_path)
+    import sqlite3, logging
     try:
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO paths (config_type, folder_path)
-            VALUES (?, ?)
-        ''', (config_type, folder_path))
-        conn.commit()
-
-        # Normalize paths to avoid issues with backslashes
-        backup_path = os.path.normpath(os.path.join(folder_path, f"{config_type}_backup"))
-        folder_path = os.path.normpath(folder_path)
-
-        # Handle existing backup - remove it if it exists
-        if os.path.exists(backup_path):
-            logging.info(f"Backup path already exists: {backup_path}. Removing to overwrite.")
-            try:
-                shutil.rmtree(backup_path)
-            except (PermissionError, OSError) as e:
-                logging.error(f"Error removing existing backup: {e}. Operations may be incomplete.")
-
-        # Create the new backup
-        logging.info(f"Creating backup from {folder_path} to {backup_path}.")
-        try:
-            shutil.copytree(folder_path, backup_path, symlinks=False)
-            logging.info(f"Backup successfully created at {backup_path}")
-        except shutil.Error as e:
-            logging.warning(f"Some errors during backup: {e}")
-        except OSError as e:
-            logging.error(f"OS error during copy operation: {e}")
+        with write_connection(db_path) as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO paths (config_type, folder_path)
+                VALUES (?, ?)
+            ''', (config_type, folder_path))
+
+        # Snapshot the folder in the background; unchanged workbooks are linked, not copied
+        request_backup(folder_path, db_path)
     except sqlite3.Error as e:
         logging.error(f"Failed to save path to database: {e}")
-    finally:
-        conn.close()
 
 def load_path_from_db(config_type, db_path='data.db'):
     import sqlite3, logging
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_db_connection(db_path)
         cursor = conn.cursor()
         cursor.execute('''
             SELECT folder_path FROM paths WHERE config_type = ?
@@ -607,27 +498,11 @@ def load_path_from_db(config_type, db_path='data.db'):
     finally:
         conn.close()
 
-def update_configuration(config_type, folder_path, data, db_path='data.db'):
-    import sqlite3, json
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    if config_type == 'mag_glass':
-        cursor.executemany('''
-            INSERT INTO mag_glass (genericSystemName, adasModuleName, carMake, manufacturer, autelOrBosch)
-            VALUES (?, ?, ?, ?, ?)
-        ''', [(item['genericSystemName'], item['adasModuleName'], item['carMake'], item['manufacturer'], item['autelOrBosch']) for item in data])
-    else:
-        data_json = json.dumps(data)
-        cursor.execute(f'''
-            INSERT INTO {config_type} (folder_path, data)
-            VALUES (?, ?)
-        ''', (folder_path, data_json))
-    conn.commit()
-    conn.close()
-
 def load_configuration(config_type, db_path='data.db'):
     import sqlite3, json, logging, pandas as pd
-    conn = sqlite3.connect(db_path)
+    if config_type == 'prequal':
+        return get_prequal_data(db_path)
+    conn = get_db_connection(db_path)
     result = []
     try:
         cursor = conn.cursor()
@@ -652,365 +527,71 @@ def load_configuration(config_type, db_path='data.db'):
         conn.close()
         return result
 
-def normalize_col(col):
-    # Lowercase, remove non-alphanumeric, strip spaces
-    return re.sub(r'[^a-z0-9]', '', col.lower())
+class ImportJob(QThread):
+    """Runs run_import off the UI thread and reports progress through signals"""
+    progress = pyqtSignal(dict)
+    file_progress = pyqtSignal(int, int, str)
+    row_progress = pyqtSignal(int)
+    finished_report = pyqtSignal(dict)
+    failed = pyqtSignal(str)
 
-def load_excel_data_to_db(excel_path, table_name, db_path='data.db', sheet_index=0, parent=None):
-    import pandas as pd, sqlite3, logging, json
-    from PyQt5.QtWidgets import QMessageBox
-    error_messages = []
-    try:
-        df = pd.read_excel(excel_path, sheet_name=sheet_index)
-        logging.debug(f"Data loaded from sheet index '{sheet_index}': {df.head()}")
-        logging.error(error_message)
-        error_messages.append(error_message)
-        QMessageBox.critical(parent, "File Access Error", error_message)
-        return error_message
-        error_message = f"File not found: {excel_path}"
-        logging.error(error_message)
-        if parent:
-            QMessageBox.critical(parent, "File Not Found", error_message)
-        return error_message
-    except Exception as read_error:
-        error_message = f"Error reading Excel file {excel_path}: {str(read_error)}"
-        logging.error(error_message)
-        error_messages.append(error_message)
-        if parent:
-            QMessageBox.critical(parent, "File Read Error", error_message)
-            return error_message
-        # Normalize columns
-        original_cols = list(df.columns)
-        norm_map = {col: normalize_col(col) for col in original_cols}
-        df.columns = [normalize_col(col) for col in df.columns]
-        # Define expected columns for each table (normalized)
-        if table_name == 'mag_glass':
-            expected_map = {
-                'genericSystemName': 'generic system name',
-                'adasModuleName': 'adas module name',
-                'carMake': 'car make',
-                'manufacturer': 'manufacturer',
-                'autelOrBosch': 'autel or bosch'
-            }
-            expected_norm = {k: normalize_col(v) for k, v in expected_map.items()}
-            rename_dict = {v: k for k, v in expected_norm.items()}
-            df = df.rename(columns=rename_dict)
-            df = df[list(expected_map.keys())]
-            df = df.where(pd.notnull(df), None)
-            df.dropna(how='all', inplace=True)
-            conn = sqlite3.connect(db_path)
-            df.to_sql(table_name, conn, if_exists='replace', index=False)
-            conn.close()
-            return "Data loaded successfully"
-        elif table_name in ['blacklist', 'goldlist']:
-            expected_map = {
-                'genericSystemName': 'generic system name',
-                'dtcCode': 'dtc code',
-                'dtcDescription': 'dtc description',
-                'dtcSys': 'dtc sys',
-                'carMake': 'car make',
-                'comments': 'comments'
-            }
-            expected_norm = {k: normalize_col(v) for k, v in expected_map.items()}
-            rename_dict = {v: k for k, v in expected_norm.items()}
-            df = df.rename(columns=rename_dict)
-            df = df[list(expected_map.keys())]
-            df = df.where(pd.notnull(df), None)
-            df.dropna(how='all', inplace=True)
-            df['dtcCode'] = df['dtcCode'].astype(str)
-            conn = sqlite3.connect(db_path)
-            df.to_sql(table_name, conn, if_exists='replace', index=False)
-            conn.close()
-            return "Data loaded successfully"
-        elif table_name == 'prequal':
-            # For prequal, just store as JSON - ignore comment columns
-            # Remove any columns that contain 'comment' in their name (case insensitive)
-            comment_columns = [col for col in df.columns if 'comment' in col.lower()]
-            if comment_columns:
-                df = df.drop(columns=comment_columns)
-                logging.info(f"Removed comment columns from prequal data: {comment_columns}")
-            
-            df = df.where(pd.notnull(df), None)
-            df.dropna(how='all', inplace=True)
-            data = df.to_dict(orient='records')
-            folder_path = os.path.dirname(excel_path)
-            update_configuration('prequal', folder_path, data, db_path)
-            return "Data loaded successfully"
-        elif table_name == 'carsys':
-            expected_map = {
-                'genericSystemName': 'generic system name',
-                'dtcSys': 'dtcsys',
-                'carMake': 'car make',
-                'comments': 'comments'
-            }
-            expected_norm = {k: normalize_col(v) for k, v in expected_map.items()}
-            rename_dict = {v: k for k, v in expected_norm.items()}
-            df = df.rename(columns=rename_dict)
-            df = df[list(expected_map.keys())]
-            df = df.where(pd.notnull(df), None)
-            df.dropna(how='all', inplace=True)
-            conn = sqlite3.connect(db_path)
-            df.to_sql(table_name, conn, if_exists='replace', index=False)
-            conn.close()
-            return "Data loaded successfully"
-        elif table_name == 'CarSys':
-            # Handle CarSys specifically - use first sheet and specific columns
-            df = pd.read_excel(excel_path, sheet_name=0, usecols="A:D", header=0)
-            df.columns = df.columns.str.strip()
-            expected_columns = ['Generic System Name', 'DTCsys', 'CarMake', 'Comments']
-            if not all(col in df.columns for col in expected_columns):
-                missing_cols = [col for col in expected_columns if col not in df.columns]
-                raise ValueError(f"Missing expected columns in the Excel file: {', '.join(missing_cols)}")
-            df = df.rename(columns={
-                'Generic System Name': 'genericSystemName',
-                'DTCsys': 'dtcSys',
-                'CarMake': 'carMake',
-                'Comments': 'comments'
-            })
-            df = df[['genericSystemName', 'dtcSys', 'carMake', 'comments']]
-            df['genericSystemName'] = df['genericSystemName'].astype(str)
-            df['dtcSys'] = df['dtcSys'].astype(str)
-            df['carMake'] = df['carMake'].astype(str)
-            df['comments'] = df['comments'].astype(str)
-            df = df.where(pd.notnull(df), None)
-            df.dropna(how='all', inplace=True)
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            cursor.execute('DROP TABLE IF EXISTS carsys')
-            conn.commit()
-            df.to_sql('carsys', conn, if_exists='replace', index=False)
-            conn.close()
-            return "Data loaded successfully"
-        elif table_name == 'manufacturer_chart':
-            # For manufacturer chart, create table with expected columns and load all data
-            # Define expected columns for manufacturer chart (normalized)
-            expected_columns = [
-                'Year', 'Make', 'Model', 'Calibration_Type', 'Protech_Generic_System_Name',
-                'SME_Generic_System_Name', 'SME_Calibration_Type', 'Feature',
-                'Service_Information_Hyperlink', 'Calibration_Pre_Requisites'
-            ]
-            
-            # Normalize the dataframe columns to match expected format
-            df.columns = [col.strip() for col in df.columns]
-            
-            # Create the table with proper schema
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Check if table exists, if not create it
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='manufacturer_chart'")
-            if not cursor.fetchone():
-                logging.info("Creating manufacturer_chart table")
-            
-                # Create table with all expected columns
-                create_table_sql = """
-                CREATE TABLE manufacturer_chart (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    Year TEXT,
-                    Make TEXT,
-                    Model TEXT,
-                    Calibration_Type TEXT,
-                    Protech_Generic_System_Name TEXT,
-                    SME_Generic_System_Name TEXT,
-                    SME_Calibration_Type TEXT,
-                    Feature TEXT,
-                    Service_Information_Hyperlink TEXT,
-                    Calibration_Pre_Requisites TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-                cursor.execute(create_table_sql)
-                logging.info("Created manufacturer_chart table")
-            
-            # Log available columns for debugging
-            logging.info(f"Available columns in Excel file: {list(df.columns)}")
-            
-            # Debug: Check if this looks like an Acura file by checking the data
-            if len(df) > 0:
-                sample_make = str(df.iloc[0].get('Make', df.iloc[0].get('make', '')))
-                if 'acura' in sample_make.lower():
-                    logging.info(f"This appears to be an Acura file. Sample make: '{sample_make}'")
-                    logging.info(f"All column names: {[col for col in df.columns]}")
-            
-            # Create a mapping dictionary to handle various column name formats
-            column_mapping = {}
-            for col in df.columns:
-                col_lower = col.lower().strip()
-                col_clean = col_lower.replace(' ', '').replace('-', '').replace('_', '')
-                
-                # Map exact matches first
-                if col_lower == 'year':
-                    column_mapping['Year'] = col
-                elif col_lower == 'make':
-                    column_mapping['Make'] = col
-                elif col_lower == 'model':
-                    column_mapping['Model'] = col
-                elif col_lower == 'calibration type':
-                    column_mapping['Calibration_Type'] = col
-                elif col_lower == 'protech generic system name':
-                    column_mapping['Protech_Generic_System_Name'] = col
-                elif col_lower == 'sme generic system name':
-                    column_mapping['SME_Generic_System_Name'] = col
-                elif col_lower == 'sme calibration type':
-                    column_mapping['SME_Calibration_Type'] = col
-                elif col_lower == 'feature':
-                    column_mapping['Feature'] = col
-                elif col_lower == 'service information hyperlink':
-                    column_mapping['Service_Information_Hyperlink'] = col
-                elif col_lower == 'calibration pre-requisites':
-                    column_mapping['Calibration_Pre_Requisites'] = col
-                # Fallback to partial matches
-                elif 'year' in col_lower:
-                    column_mapping['Year'] = col
-                elif 'make' in col_lower:
-                    column_mapping['Make'] = col
-                elif 'model' in col_lower:
-                    column_mapping['Model'] = col
-                elif 'calibration' in col_lower and 'type' in col_lower:
-                    column_mapping['Calibration_Type'] = col
-                elif 'protech' in col_lower and 'system' in col_lower and 'name' in col_lower:
-                    column_mapping['Protech_Generic_System_Name'] = col
-                elif 'sme' in col_lower and 'system' in col_lower and 'name' in col_lower:
-                    column_mapping['SME_Generic_System_Name'] = col
-                elif 'sme' in col_lower and 'calibration' in col_lower and 'type' in col_lower:
-                    column_mapping['SME_Calibration_Type'] = col
-                elif 'feature' in col_lower:
-                    column_mapping['Feature'] = col
-                elif 'service' in col_lower and 'hyperlink' in col_lower:
-                    column_mapping['Service_Information_Hyperlink'] = col
-                elif 'prerequisites' in col_lower or 'pre-requisites' in col_lower:
-                    column_mapping['Calibration_Pre_Requisites'] = col
-            
-            logging.info(f"Column mapping: {column_mapping}")
-            
-            # Insert data - map columns as best as possible
-            for index, row in df.iterrows():
-                # Extract values using the mapping
-                year = str(row.get(column_mapping.get('Year', 'Year'), '')).strip() if pd.notna(row.get(column_mapping.get('Year', 'Year'), '')) else ''
-                make = str(row.get(column_mapping.get('Make', 'Make'), '')).strip() if pd.notna(row.get(column_mapping.get('Make', 'Make'), '')) else ''
-                model = str(row.get(column_mapping.get('Model', 'Model'), '')).strip() if pd.notna(row.get(column_mapping.get('Model', 'Model'), '')) else ''
-                calibration_type = str(row.get(column_mapping.get('Calibration_Type', 'Calibration Type'), '')).strip() if pd.notna(row.get(column_mapping.get('Calibration_Type', 'Calibration Type'), '')) else ''
-                protech_system = str(row.get(column_mapping.get('Protech_Generic_System_Name', 'Protech Generic System Name'), '')).strip() if pd.notna(row.get(column_mapping.get('Protech_Generic_System_Name', 'Protech Generic System Name'), '')) else ''
-                sme_system = str(row.get(column_mapping.get('SME_Generic_System_Name', 'SME Generic System Name'), '')).strip() if pd.notna(row.get(column_mapping.get('SME_Generic_System_Name', 'SME Generic System Name'), '')) else ''
-                sme_calibration = str(row.get(column_mapping.get('SME_Calibration_Type', 'SME Calibration Type'), '')).strip() if pd.notna(row.get(column_mapping.get('SME_Calibration_Type', 'SME Calibration Type'), '')) else ''
-                feature = str(row.get(column_mapping.get('Feature', 'Feature'), '')).strip() if pd.notna(row.get(column_mapping.get('Feature', 'Feature'), '')) else ''
-                service_link = str(row.get(column_mapping.get('Service_Information_Hyperlink', 'Service Information Hyperlink'), '')).strip() if pd.notna(row.get(column_mapping.get('Service_Information_Hyperlink', 'Service Information Hyperlink'), '')) else ''
-                prerequisites = str(row.get(column_mapping.get('Calibration_Pre_Requisites', 'Calibration Pre-Requisites'), '')).strip() if pd.notna(row.get(column_mapping.get('Calibration_Pre_Requisites', 'Calibration Pre-Requisites'), '')) else ''
-                
-                # Insert the record
-                insert_sql = """
-                INSERT INTO manufacturer_chart (
-                    Year, Make, Model, Calibration_Type, Protech_Generic_System_Name,
-                    SME_Generic_System_Name, SME_Calibration_Type, Feature,
-                    Service_Information_Hyperlink, Calibration_Pre_Requisites
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """
-                cursor.execute(insert_sql, (
-                    year, make, model, calibration_type, protech_system,
-                    sme_system, sme_calibration, feature, service_link, prerequisites
-                ))
-                
-                # Log the first few records for debugging
-                if index < 3:
-                    logging.info(f"Inserted record {index + 1}: Year='{year}', Make='{make}', Model='{model}'")
-                
-                # Log every 1000th record to see what data is being loaded
-                if index % 1000 == 0:
-                    logging.info(f"Processing record {index}: Year='{year}', Make='{make}', Model='{model}'")
-                
-                # Log specifically if we find Acura data
-                if make.upper() == 'ACURA':
-                    logging.info(f"Found Acura record {index}: Year='{year}', Make='{make}', Model='{model}'")
-            
-            conn.commit()
-            conn.close()
-            return "Data loaded successfully"
-        else:
-            error_message = f"Unknown table name: {table_name}"
-            logging.error(error_message)
-            error_messages.append(error_message)
-    except Exception as e:
-        error_message = f"Failed to load data from {excel_path} into {table_name}: {str(e)}"
-        logging.error(error_message)
-        error_messages.append(error_message)
-    if error_messages:
-        QMessageBox.critical(parent, "Errors Encountered", "\n".join(error_messages))
-        return "\n".join(error_messages)
-    return "Data loaded successfully"
-
-def load_carsys_data_to_db(excel_path, table_name='carsys', db_path='data.db', parent=None):
-    import pandas as pd, sqlite3, logging
-    from PyQt5.QtWidgets import QMessageBox
-    error_messages = []
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
-        conn.commit()
-        df = pd.read_excel(excel_path, sheet_name=0, usecols="A:D", header=0)
-        logging.debug(f"Data loaded from sheet index '0': {df.head()}")
-        df.columns = df.columns.str.strip()
-        expected_columns = ['Generic System Name', 'DTCsys', 'CarMake', 'Comments']
-        if not all(col in df.columns for col in expected_columns):
-            missing_cols = [col for col in expected_columns if col not in df.columns]
-            raise ValueError(f"Missing expected columns in the Excel file: {', '.join(missing_cols)}")
-        df = df.rename(columns={
-            'Generic System Name': 'genericSystemName',
-            'DTCsys': 'dtcSys',
-            'CarMake': 'carMake',
-            'Comments': 'comments'
-        })
-        df = df[['genericSystemName', 'dtcSys', 'carMake', 'comments']]
-        df['genericSystemName'] = df['genericSystemName'].astype(str)
-        df['dtcSys'] = df['dtcSys'].astype(str)
-        df['carMake'] = df['carMake'].astype(str)
-        df['comments'] = df['comments'].astype(str)
-        df = df.where(pd.notnull(df), None)
-        df.dropna(how='all', inplace=True)
-        df.to_sql(table_name, conn, if_exists='replace', index=False)
-        df_saved = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
-        logging.debug(f"Data saved to {table_name}: {df_saved.head()}")
-        conn.close()
-        return "Data loaded successfully"
-    except Exception as e:
-        error_message = f"Failed to load data from {excel_path} into {table_name}: {str(e)}"
-        logging.error(error_message)
-        error_messages.append(error_message)
-    if error_messages:
-        QMessageBox.critical(parent, "Errors Encountered", "\n".join(error_messages))
-        return "\n".join(error_messages)
-    return "Data loaded successfully"
-
-def load_mag_glass_data(excel_path, table_name='mag_glass', db_path='data.db'):
-    import pandas as pd, sqlite3, logging
-    from PyQt5.QtWidgets import QMessageBox
-    error_messages = []
-    try:
+    def __init__(self, jobs, db_path='data.db', workers=None, incremental=False, streaming=None,
+                 save_paths=False, held_back=None, parent=None):
+        super().__init__(parent)
+        self.jobs = jobs
+        self.held_back = held_back
+        self.db_path = db_path
+        self.workers = workers
+        self.incremental = incremental
+        self.streaming = streaming
+        self.save_paths = save_paths
+        self.cancel_event = threading.Event()
+        self.last_files_done = -1
+        self.last_rows = -1
+
+    def run(self):
         try:
-            df = pd.read_excel(excel_path, sheet_name="Mag Glass")
-            logging.debug(f"Data loaded from 'Mag Glass' sheet: {df.head()}")
-        except Exception as sheet_error:
-            error_message = f"Failed to find 'Mag Glass' sheet in {excel_path}: {str(sheet_error)}"
-            logging.warning(error_message)
-            error_messages.append(error_message)
-            return error_message
-        df = df.where(pd.notnull(df), None)
-        df.dropna(how='all', inplace=True)
-        conn = sqlite3.connect(db_path)
-        df.to_sql(table_name, conn, if_exists='replace', index=False)
-        conn.close()
-        return "Data loaded successfully"
-    except Exception as e:
-        error_message = f"Failed to load data from {excel_path} into {table_name}: {str(e)}"
-        logging.error(error_message)
-        error_messages.append(error_message)
-    if error_messages:
-        QMessageBox.critical(None, "Errors Encountered", "\n".join(error_messages))
-        return "\n".join(error_messages)
-    return "Data loaded successfully"
-
-def load_mag_glass_data_from_5th_sheet(excel_path, table_name='mag_glass', db_path='data.db'):
-    return load_mag_glass_data(excel_path, table_name, db_path)
+            report = run_import(self.jobs, self.db_path, self.workers, progress_callback=self.emit_progress,
+                                incremental=self.incremental, streaming=self.streaming,
+                                cancel_event=self.cancel_event, held_back=self.held_back)
+            if self.save_paths and not report['cancelled']:
+                for config_type, folder_path in dict((job[0], job[1]) for job in self.jobs).items():
+                    save_path_to_db(config_type, folder_path, self.db_path)
+            self.finished_report.emit(report)
+        except Exception as e:
+            logging.error(f"Import failed: {str(e)}")
+            self.failed.emit(str(e))
+
+    def emit_progress(self, progress):
+        self.progress.emit(progress)
+        if progress['files_done'] != self.last_files_done:
+            self.last_files_done = progress['files_done']
+            self.file_progress.emit(progress['files_done'], progress['files_total'], progress['file'] or '')
+        if progress['rows'] != self.last_rows:
+            self.last_rows = progress['rows']
+            self.row_progress.emit(progress['rows'])
+
+    def cancel(self):
+        """Ask the import to stop; the live tables are left untouched and the staging tables kept so it can resume"""
+        self.cancel_event.set()
+
+class PreflightJob(QThread):
+    """Runs preflight_jobs off the UI thread and hands back its reports"""
+    finished_reports = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+    def __init__(self, jobs, workers=None, db_path='data.db', parent=None):
+        super().__init__(parent)
+        self.jobs = jobs
+        self.workers = workers
+        self.db_path = db_path
+
+    def run(self):
+        try:
+            self.finished_reports.emit(preflight_jobs(self.jobs, self.workers, self.db_path))
+        except Exception as e:
+            logging.error(f"Preflight failed: {str(e)}")
+            self.failed.emit(str(e))
 
 class PopOutWindow(ModernDialog):
     def __init__(self, title, content, parent=None):
@@ -1232,11 +813,7 @@ class PinManagementDialog(ModernDialog):
     def load_users_and_pins(self):
         """Load users from database and display in list"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute('SELECT pin, name FROM leader_log ORDER BY name')
-            users = cursor.fetchall()
-            conn.close()
+            users = get_users()
             
             self.user_list.clear()
             for pin, name in users:
@@ -1247,11 +824,7 @@ class PinManagementDialog(ModernDialog):
     def show_all_users(self):
         """Show all users in a message box"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute('SELECT pin, name FROM leader_log ORDER BY name')
-            users = cursor.fetchall()
-            conn.close()
+            users = get_users()
             
             if users:
                 user_text = "Current Users:\n\n"
@@ -1304,11 +877,7 @@ class PinManagementDialog(ModernDialog):
         
         if reply == QMessageBox.Yes:
             try:
-                conn = get_db_connection()
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM leader_log WHERE name = ?', (name,))
-                conn.commit()
-                conn.close()
+                delete_user(name)
                 self.load_users_and_pins()
                 QMessageBox.information(self, "Success", f"User '{name}' deleted successfully.")
             except Exception as e:
@@ -1377,11 +946,7 @@ class AddUserDialog(ModernDialog):
             return
         
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute('INSERT INTO leader_log (pin, name) VALUES (?, ?)', (pin, name))
-            conn.commit()
-            conn.close()
+            add_user(pin, name)
             QMessageBox.information(self, "Success", f"User '{name}' added successfully.")
             self.accept()
         except sqlite3.IntegrityError:
@@ -1420,12 +985,7 @@ class EditUserDialog(ModernDialog):
         
         # Get current PIN
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute('SELECT pin FROM leader_log WHERE name = ?', (self.user_name,))
-            result = cursor.fetchone()
-            conn.close()
-            current_pin = result[0] if result else ""
+            current_pin = get_user_pin(self.user_name) or ""
         except:
             current_pin = ""
         
@@ -1464,12 +1024,7 @@ class EditUserDialog(ModernDialog):
             return
         
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute('UPDATE leader_log SET pin = ?, name = ? WHERE name = ?', 
-                          (pin, name, self.user_name))
-            conn.commit()
-            conn.close()
+            update_user(self.user_name, pin, name)
             QMessageBox.information(self, "Success", f"User updated successfully.")
             self.accept()
         except sqlite3.IntegrityError:
@@ -1620,11 +1175,7 @@ class SignupDialog(ModernDialog):
         username = first_name[0] + last_name
         
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute('INSERT INTO leader_log (pin, name) VALUES (?, ?)', (pin, username))
-            conn.commit()
-            conn.close()
+            add_user(pin, username)
             QMessageBox.information(self, "Success", f"Account created successfully!\nUsername: {username}\nPIN: {pin}")
             self.accept()
         except sqlite3.IntegrityError:
@@ -1733,34 +1284,22 @@ class ResetPinDialog(ModernDialog):
         expected_username = first_name[0] + last_name
         
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
             # Check if user exists
-            cursor.execute('SELECT pin FROM leader_log WHERE name = ?', (expected_username,))
-            existing_user = cursor.fetchone()
+            old_pin = get_user_pin(expected_username)
             
-            if not existing_user:
+            if old_pin is None:
                 QMessageBox.warning(self, "Account Not Found", 
                                    f"No user found with username '{expected_username}'.\n"
                                    "Please check your name spelling or create a new account.")
-                conn.close()
                 return
             
             # Check if new PIN is already used by another user
-            old_pin = existing_user[0]
-            if pin != old_pin:
-                cursor.execute('SELECT name FROM leader_log WHERE pin = ? AND pin != ?', (pin, old_pin))
-                pin_user = cursor.fetchone()
-                if pin_user:
-                    QMessageBox.warning(self, "Error", "This PIN is already in use by another user.")
-                    conn.close()
-                    return
+            if pin != old_pin and get_user_by_pin(pin):
+                QMessageBox.warning(self, "Error", "This PIN is already in use by another user.")
+                return
             
             # Update PIN
-            cursor.execute('UPDATE leader_log SET pin = ? WHERE name = ?', (pin, expected_username))
-            conn.commit()
-            conn.close()
+            set_user_pin(expected_username, pin)
             
             QMessageBox.information(self, "Success", "PIN reset successfully!")
             self.accept()
@@ -1831,6 +1370,93 @@ class ManageDataListsDialog(ModernDialog):
 
             card_layout.addWidget(section_card)
 
+        # Number of parser processes used by Save & Load
+        workers_row = QHBoxLayout()
+        workers_label = QLabel("Import worker processes (0 = automatic):")
+        workers_label.setStyleSheet("font-size: 13px; color: #495057;")
+        workers_row.addWidget(workers_label)
+        self.workers_spinbox = QSpinBox()
+        self.workers_spinbox.setRange(0, os.cpu_count() or 1)
+        try:
+            self.workers_spinbox.setValue(int(load_setting_from_db('import_workers', 0, self.parent.db_path)))
+        except (TypeError, ValueError):
+            self.workers_spinbox.setValue(0)
+        workers_row.addWidget(self.workers_spinbox)
+        workers_row.addStretch()
+        card_layout.addLayout(workers_row)
+
+        # Memory the app and its parser processes may use before workbooks stop being parsed ahead
+        memory_row = QHBoxLayout()
+        memory_label = QLabel("Import memory budget in MB (0 = unlimited):")
+        memory_label.setStyleSheet("font-size: 13px; color: #495057;")
+        memory_row.addWidget(memory_label)
+        self.memory_spinbox = QSpinBox()
+        self.memory_spinbox.setRange(0, 1024 * 1024)
+        self.memory_spinbox.setSingleStep(256)
+        self.memory_spinbox.setValue(get_memory_budget_mb(self.parent.db_path))
+        memory_row.addWidget(self.memory_spinbox)
+        memory_row.addStretch()
+        card_layout.addLayout(memory_row)
+
+        # Backup generations of each source folder kept in its _backups folder
+        backup_row = QHBoxLayout()
+        generations, max_age_days = get_backup_settings(self.parent.db_path)
+        backup_label = QLabel("Backups to keep:")
+        backup_label.setStyleSheet("font-size: 13px; color: #495057;")
+        backup_row.addWidget(backup_label)
+        self.backup_generations_spinbox = QSpinBox()
+        self.backup_generations_spinbox.setRange(1, 100)
+        self.backup_generations_spinbox.setValue(max(1, generations))
+        backup_row.addWidget(self.backup_generations_spinbox)
+        backup_age_label = QLabel("Drop backups older than (days, 0 = never):")
+        backup_age_label.setStyleSheet("font-size: 13px; color: #495057;")
+        backup_row.addWidget(backup_age_label)
+        self.backup_age_spinbox = QSpinBox()
+        self.backup_age_spinbox.setRange(0, 3650)
+        self.backup_age_spinbox.setValue(max_age_days)
+        backup_row.addWidget(self.backup_age_spinbox)
+        backup_row.addStretch()
+        card_layout.addLayout(backup_row)
+
+        # Read manufacturer charts row by row to keep memory flat on large sheets
+        self.stream_checkbox = QCheckBox("Stream manufacturer charts (low memory)")
+        self.stream_checkbox.setStyleSheet("font-size: 13px; color: #495057;")
+        self.stream_checkbox.setChecked(is_streaming_enabled(self.parent.db_path))
+        card_layout.addWidget(self.stream_checkbox)
+
+        # Excel backend used to parse workbooks; automatic picks the fastest one with identical output
+        reader_row = QHBoxLayout()
+        reader_label = QLabel("Spreadsheet reader:")
+        reader_label.setStyleSheet("font-size: 13px; color: #495057;")
+        reader_row.addWidget(reader_label)
+        self.reader_combo = QComboBox()
+        self.reader_combo.addItem("Automatic", 'auto')
+        for engine in available_engines():
+            self.reader_combo.addItem(engine, engine)
+        index = self.reader_combo.findData(load_setting_from_db('reader_engine', 'auto', self.parent.db_path))
+        self.reader_combo.setCurrentIndex(max(index, 0))
+        reader_row.addWidget(self.reader_combo)
+        reader_row.addStretch()
+        card_layout.addLayout(reader_row)
+
+        # Import changed workbooks in the background as soon as they land in the folders
+        self.watch_checkbox = QCheckBox("Watch folders and import changes automatically")
+        self.watch_checkbox.setStyleSheet("font-size: 13px; color: #495057;")
+        self.watch_checkbox.setChecked(self.parent.is_watching_enabled())
+        card_layout.addWidget(self.watch_checkbox)
+
+        # Parsed sheets are cached so rebuilding from the same workbooks is fast
+        cache_row = QHBoxLayout()
+        self.cache_label = QLabel()
+        self.cache_label.setStyleSheet("font-size: 13px; color: #495057;")
+        cache_row.addWidget(self.cache_label)
+        cache_row.addStretch()
+        clear_cache_btn = ModernButton("Clear Cache", style="secondary")
+        clear_cache_btn.clicked.connect(self.clear_cache)
+        cache_row.addWidget(clear_cache_btn)
+        card_layout.addLayout(cache_row)
+        self.update_cache_label()
+
         # Buttons at the bottom
         button_row = QHBoxLayout()
         cancel_btn = ModernButton("Cancel", style="secondary")
@@ -1841,9 +1467,13 @@ class ManageDataListsDialog(ModernDialog):
         clear_all_btn.clicked.connect(self.clear_all_data)
         button_row.addWidget(clear_all_btn)
 
-        save_btn = ModernButton("Save & Load Data", style="primary")
-        save_btn.clicked.connect(self.save_and_load)
-        button_row.addWidget(save_btn)
+        changes_btn = ModernButton("Import Changes", style="secondary")
+        changes_btn.clicked.connect(self.show_import_changes)
+        button_row.addWidget(changes_btn)
+
+        self.save_btn = ModernButton("Save & Load Data", style="primary")
+        self.save_btn.clicked.connect(self.save_and_load)
+        button_row.addWidget(self.save_btn)
 
         card_layout.addLayout(button_row)
         layout.addWidget(card)
@@ -1868,6 +1498,9 @@ class ManageDataListsDialog(ModernDialog):
             self.path_fields[config_key].clear()
             QMessageBox.information(self, "Data Cleared", f"{config_key.capitalize()} data has been cleared.")
 
+    def show_import_changes(self):
+        ChangelogDialog(self.parent.db_path, self).exec_()
+
     def clear_all_data(self):
         reply = QMessageBox.question(self, "Clear All Data", "Are you sure you want to clear ALL data? This cannot be undone.", QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
@@ -1888,319 +1521,173 @@ class ManageDataListsDialog(ModernDialog):
             QMessageBox.warning(self, "No Paths", "No paths have been selected.")
             return
 
-        goldlist_path = paths_to_save.get("goldlist")
+        save_setting_to_db('import_workers', self.workers_spinbox.value(), self.parent.db_path)
+        save_setting_to_db('import_memory_mb', self.memory_spinbox.value(), self.parent.db_path)
+        save_setting_to_db('backup_generations', self.backup_generations_spinbox.value(), self.parent.db_path)
+        save_setting_to_db('backup_max_age_days', self.backup_age_spinbox.value(), self.parent.db_path)
+        save_setting_to_db('stream_manufacturer_chart', int(self.stream_checkbox.isChecked()), self.parent.db_path)
+        save_setting_to_db('watch_folders', int(self.watch_checkbox.isChecked()), self.parent.db_path)
+        save_setting_to_db('reader_engine', self.reader_combo.currentData(), self.parent.db_path)
+        self.parent.update_folder_watcher()
 
+        jobs = []
         for config_type, folder_path in paths_to_save.items():
             try:
                 files = self.parent.get_valid_excel_files(folder_path)
                 if not files:
                     QMessageBox.warning(self, "Load Error", f"No valid Excel files found in the {folder_path} directory for {config_type}.")
                     continue
-
-                self.parent.progress_bar.setVisible(True)
-                self.parent.progress_bar.setMaximum(len(files))
-                self.parent.progress_bar.setValue(0)
-
-                self.parent.clear_data(config_type)
-                if config_type == "goldlist":
-                    self.parent.clear_data("CarSys")
-                    self.parent.clear_data("mag_glass")
-
-                data_loaded = False
-                
-                # Special handling for manufacturer_chart - use simple pandas approach like prequals
                 logging.info(f"Processing config_type: {config_type}")
-                if config_type == 'manufacturer_chart':
-                    logging.info("Loading manufacturer chart data using simple pandas approach...")
-                    
-                    # Clear existing manufacturer chart data
-                    conn = sqlite3.connect(self.parent.db_path)
-                    cursor = conn.cursor()
-                    cursor.execute("DELETE FROM manufacturer_chart")
-                    conn.commit()
-                    conn.close()
-                    logging.info("Cleared existing manufacturer chart data")
-                    
-                    # Process each file like prequals
-                    for i, (filename, filepath) in enumerate(files.items()):
-                        try:
-                            logging.info(f"Processing manufacturer chart file: {filename}")
-                            
-                            # Check if file is accessible (not a SharePoint placeholder)
-                            import os
-                            if not os.path.exists(filepath):
-                                logging.warning(f"File not found or not accessible: {filename}")
-                                continue
-                            
-                            # Check file size - if it's 0 or very small, it might be a placeholder
-                            file_size = os.path.getsize(filepath)
-                            if file_size < 1024:  # Less than 1KB
-                                logging.warning(f"File appears to be a placeholder or empty (size: {file_size} bytes): {filename}")
-                                continue
-                            
-                            if 'acura' in filename.lower():
-                                logging.info(f"Found potential Acura file: {filename}")
-                            
-                            # Check for "Model Version" sheet first, then fall back to first sheet
-                            try:
-                                # Try to read the "Model Version" sheet first
-                                df = pd.read_excel(filepath, sheet_name="Model Version")
-                                logging.info(f"Found 'Model Version' sheet in {filename}")
-                            except Exception as sheet_error:
-                                # If "Model Version" sheet doesn't exist, use the first sheet
-                                try:
-                                    df = pd.read_excel(filepath)
-                                    logging.info(f"Using first sheet for {filename}")
-                                except Exception as read_error:
-                                    logging.error(f"Cannot read Excel file {filename}: {str(read_error)}")
-                                    continue
-                            
-                            if df.empty:
-                                logging.warning(f"{filename} is empty.")
-                                continue
-                            
-                            # Log the columns found in this file
-                            logging.info(f"Columns in {filename}: {list(df.columns)}")
-                            
-                            # Convert to records and save to manufacturer_chart table
-                            data = df.to_dict(orient='records')
-                            self.save_manufacturer_chart_data(data, self.parent.db_path)
-                            data_loaded = True
-                            logging.info(f"Loaded manufacturer chart data from: {filename}")
-                            
-                        except Exception as e:
-                            logging.error(f"Error loading manufacturer chart from {filename}: {str(e)}")
-                            import traceback
-                            logging.error(traceback.format_exc())
-                        self.parent.progress_bar.setValue(i + 1)
-                else:
-                    # Process individual files for other data types
-                    for i, (filename, filepath) in enumerate(files.items()):
-                        try:
-                            if config_type in ['blacklist', 'goldlist']:
-                                result = load_excel_data_to_db(filepath, config_type, db_path=self.parent.db_path, sheet_index=1)
-                                if result == "Data loaded successfully":
-                                    data_loaded = True
-                                    if config_type == 'goldlist':
-                                        load_carsys_data_to_db(filepath, table_name='CarSys', db_path=self.parent.db_path)
-                                        load_mag_glass_data(filepath, table_name='mag_glass', db_path=self.parent.db_path)
-                            elif config_type == 'prequal':
-                                df = pd.read_excel(filepath)
-                                if df.empty:
-                                    logging.warning(f"{filename} is empty.")
-                                    continue
-                                data = df.to_dict(orient='records')
-                                update_configuration(config_type, folder_path, data, self.parent.db_path)
-                                data_loaded = True
-                            elif config_type == 'mag_glass':
-                                result = load_mag_glass_data(filepath, config_type, db_path=self.parent.db_path)
-                                if result == "Data loaded successfully":
-                                    data_loaded = True
-                            elif config_type == 'CarSys':
-                                result = load_excel_data_to_db(filepath, config_type, db_path=self.parent.db_path, sheet_index=0)
-                                if result == "Data loaded successfully":
-                                    data_loaded = True
-                            else:
-                                df = pd.read_excel(filepath)
-                                if df.empty:
-                                    logging.warning(f"{filename} is empty.")
-                                    continue
-                                data = df.to_dict(orient='records')
-                                update_configuration(config_type, folder_path, data, self.parent.db_path)
-                                data_loaded = True
-                        except Exception as e:
-                            logging.error(f"Error loading {filename}: {str(e)}")
-                        except Exception as e:
-                            logging.error(f"Error loading {filename}: {str(e)}")
-                        self.parent.progress_bar.setValue(i + 1)
-                save_path_to_db(config_type, folder_path, self.parent.db_path)
+                jobs.append((config_type, folder_path, files))
                 if config_type == 'goldlist':
-                    save_path_to_db('CarSys', folder_path, self.parent.db_path)
-                    save_path_to_db('mag_glass', folder_path, self.parent.db_path)
-
+                    # CarSYS and MagGlass are read from the goldlist workbooks
+                    jobs.append(('CarSys', folder_path, files))
+                    jobs.append(('mag_glass', folder_path, files))
             except Exception as e:
                 logging.error(f"Error saving path for {config_type}: {str(e)}")
                 QMessageBox.critical(self, "Error", f"Failed to save path for {config_type}: {str(e)}")
 
+        if not jobs:
+            self.parent.finish_manage_lists(None)
+            self.accept()
+            return
+        # Check sheet names and header rows of every workbook before any is parsed,
+        # in the background so the window stays responsive over slow network folders
+        self.save_btn.setEnabled(False)
+        self.save_btn.setText("Checking workbooks...")
+        self.preflight_job = PreflightJob(jobs, self.workers_spinbox.value() or None, self.parent.db_path, self)
+        self.preflight_job.finished_reports.connect(lambda reports: self.preflight_finished(jobs, reports))
+        self.preflight_job.failed.connect(self.preflight_failed)
+        self.preflight_job.start()
+
+    def reset_save_button(self):
+        self.save_btn.setText("Save & Load Data")
+        self.save_btn.setEnabled(True)
+
+    def preflight_failed(self, error):
+        self.reset_save_button()
+        QMessageBox.critical(self, "Error", f"Failed to check the workbooks: {error}")
+
+    def preflight_finished(self, jobs, reports):
+        """Ask whether to skip the workbooks the preflight rejected, then start the import"""
+        self.reset_save_button()
+        if not self.isVisible():
+            # The dialog was closed while the workbooks were being checked
+            return
+        held_back = None
+        problems = preflight_problems(reports)
+        if problems:
+            shown = "\n".join(problems[:20])
+            if len(problems) > 20:
+                shown += f"\n... and {len(problems) - 20} more"
+            reply = QMessageBox.question(
+                self, "Preflight",
+                f"{len(problems)} workbook sheets can't be loaded and will be skipped:\n{shown}\n\nLoad the rest?",
+                QMessageBox.Yes | QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+            jobs, held_back = loadable_jobs(jobs, reports)
+
+        if not jobs:
+            self.parent.finish_manage_lists(None)
+            self.accept()
+            return
+        # The import runs in the background; the main window reports the outcome
+        if self.parent.start_import(jobs, workers=self.workers_spinbox.value() or None,
+                                    streaming=self.stream_checkbox.isChecked(), save_paths=True,
+                                    on_finished=self.parent.finish_manage_lists, held_back=held_back):
+            self.accept()
 
+    def update_cache_label(self):
+        cache_dir, max_bytes = get_cache_settings(self.parent.db_path)
+        cache = inspect_parse_cache(cache_dir)
+        self.cache_label.setText(f"Parse cache: {len(cache['entries'])} sheets, "
+                                 f"{cache['total_bytes'] / (1024 * 1024):.1f} of {max_bytes // (1024 * 1024)} MB")
+        self.cache_label.setToolTip(cache_dir)
 
-        self.parent.progress_bar.setVisible(False)
-        self.parent.load_configurations()
-        self.parent.populate_dropdowns()
-        self.parent.check_data_loaded()
-        msg = self.parent.create_styled_messagebox("Success", "Paths saved and data loaded successfully!", QMessageBox.Information)
-        msg.exec_()
-        self.accept()
+    def clear_cache(self):
+        cache_dir, _ = get_cache_settings(self.parent.db_path)
+        clear_parse_cache(cache_dir)
+        self.update_cache_label()
 
-    def load_manufacturer_chart_data(self, filepath, db_path):
-        """Load manufacturer chart data from Excel file with specified columns"""
-        try:
-            # Read Excel file
-            df = pd.read_excel(filepath)
-            
-            if df.empty:
-                return "No data found in file"
-            
-            # Normalize column names (case-insensitive, remove special characters)
-            df.columns = [normalize_col(col) for col in df.columns]
-            
-            # Define expected column names (normalized)
-            expected_columns = [
-                'year', 'make', 'model', 'calibrationtype', 'protechgenericsystemname',
-                'smegenericsystemname', 'smecalibrationtype', 'feature', 
-                'serviceinformationhyperlink', 'calibrationprerequisites'
-            ]
-            
-            # Check if required columns exist (with variations)
-            missing_columns = []
-            for expected_col in expected_columns:
-                if not any(expected_col in col.lower() for col in df.columns):
-                    missing_columns.append(expected_col)
-            
-            if missing_columns:
-                logging.warning(f"Missing columns in manufacturer chart: {missing_columns}")
-                # Continue with available columns
-            
-            # Create table if it doesn't exist
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Create manufacturer_chart table with all possible columns
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS manufacturer_chart (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    Year TEXT,
-                    Make TEXT,
-                    Model TEXT,
-                    Calibration_Type TEXT,
-                    Protech_Generic_System_Name TEXT,
-                    SME_Generic_System_Name TEXT,
-                    SME_Calibration_Type TEXT,
-                    Feature TEXT,
-                    Service_Information_Hyperlink TEXT,
-                    Calibration_Pre_Requisites TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Clear existing data
-            cursor.execute("DELETE FROM manufacturer_chart")
-            
-            # Map normalized columns to database columns
-            column_mapping = {
-                'year': 'Year',
-                'make': 'Make', 
-                'model': 'Model',
-                'calibrationtype': 'Calibration_Type',
-                'protechgenericsystemname': 'Protech_Generic_System_Name',
-                'smegenericsystemname': 'SME_Generic_System_Name',
-                'smecalibrationtype': 'SME_Calibration_Type',
-                'feature': 'Feature',
-                'serviceinformationhyperlink': 'Service_Information_Hyperlink',
-                'calibrationprerequisites': 'Calibration_Pre_Requisites'
-            }
-            
-            # Log normalized column names for debugging
-            logging.info(f"Normalized DataFrame columns: {df.columns.tolist()}")
-            
-            # Prepare data for insertion
-            records = []
-            for _, row in df.iterrows():
-                record = {}
-                for normalized_col, db_col in column_mapping.items():
-                    # Since columns are already normalized, do exact match
-                    if normalized_col in df.columns:
-                        value = row[normalized_col]
-                        if pd.isna(value):
-                            record[db_col] = ''  # Use empty string for consistency
-                        else:
-                            record[db_col] = str(value).strip()
-                    else:
-                        record[db_col] = ''
-                        logging.warning(f"Column '{normalized_col}' not found in DataFrame")
-                
-                records.append(record)
-            
-            # Log first record for debugging
-            if records:
-                logging.info(f"First CMC record to insert: {records[0]}")
-            
-            # Insert data
-            if records:
-                placeholders = ', '.join(['?' for _ in column_mapping.values()])
-                columns = ', '.join(column_mapping.values())
-                cursor.executemany(
-                    f"INSERT INTO manufacturer_chart ({columns}) VALUES ({placeholders})",
-                    [tuple(record.values()) for record in records]
-                )
-                
-                conn.commit()
-                conn.close()
-                logging.info(f"Successfully inserted {len(records)} CMC records")
-                return "Data loaded successfully"
+class ChangelogDialog(ModernDialog):
+    """Shows the rows each recent import added, removed and modified"""
+
+    # Changed rows shown per generation; the CLI prints them all
+    MAX_ROWS = 500
+
+    def __init__(self, db_path, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Import Changes")
+        self.setGeometry(100, 100, 800, 600)
+        self.db_path = db_path
+        self.generations = recent_generations(db_path)
+
+        layout = QVBoxLayout()
+        card = ModernCard()
+        card_layout = QVBoxLayout(card)
+
+        title_label = QLabel("Import Changes")
+        title_label.setAlignment(Qt.AlignCenter)
+        title_label.setStyleSheet("font-size: 22px; font-weight: bold; color: #495057; margin: 10px;")
+        card_layout.addWidget(title_label)
+
+        filter_row = QHBoxLayout()
+        self.generation_dropdown = ModernComboBox()
+        for generation in self.generations:
+            self.generation_dropdown.addItem(
+                f"#{generation['generation']} {generation['config_type']} ({generation['published_at']}): "
+                f"+{generation['added']} -{generation['removed']} ~{generation['modified']}")
+        self.generation_dropdown.currentIndexChanged.connect(self.show_changes)
+        filter_row.addWidget(self.generation_dropdown, 3)
+        self.make_field = ModernLineEdit()
+        self.make_field.setPlaceholderText("Make")
+        self.make_field.returnPressed.connect(self.show_changes)
+        filter_row.addWidget(self.make_field, 1)
+        card_layout.addLayout(filter_row)
+
+        self.changes_browser = ModernTextBrowser()
+        card_layout.addWidget(self.changes_browser)
+
+        close_btn = ModernButton("Close", style="secondary")
+        close_btn.clicked.connect(self.accept)
+        card_layout.addWidget(close_btn)
+        layout.addWidget(card)
+        self.setLayout(layout)
+        self.show_changes()
+
+    def show_changes(self):
+        index = self.generation_dropdown.currentIndex()
+        if index < 0:
+            self.changes_browser.setHtml("<p>No imports have been recorded yet.</p>")
+            return
+        generation = self.generations[index]
+        if not generation['detailed']:
+            self.changes_browser.setHtml(
+                f"<p>First load of {html.escape(generation['config_type'])}: {generation['row_count']} rows.</p>")
+            return
+        make = self.make_field.text().strip() or None
+        changes = generation_changes(self.db_path, generation['generation'], make, self.MAX_ROWS)
+        parts = [f"<p><b>{generation['added']}</b> added, <b>{generation['removed']}</b> removed, "
+                 f"<b>{generation['modified']}</b> modified of {generation['row_count']} rows. "
+                 f"Makes: {html.escape(', '.join(generation['makes'] or [])) or 'none'}</p>"]
+        colors = {'added': '#28a745', 'removed': '#dc3545', 'modified': '#e65100'}
+        for change in changes:
+            old, new = change['old'] or {}, change['new'] or {}
+            if change['change'] == 'modified':
+                fields = [f"{html.escape(str(key))}: {html.escape(str(old.get(key)))} &rarr; "
+                          f"{html.escape(str(new.get(key)))}"
+                          for key in new if str(old.get(key)) != str(new.get(key))]
             else:
-                conn.close()
-                return "No valid records found"
-                
-        except Exception as e:
-            logging.error(f"Error loading manufacturer chart data: {str(e)}")
-            return f"Error: {str(e)}"
+                fields = [f"{html.escape(str(key))}: {html.escape(str(value))}"
+                          for key, value in (new or old).items() if value not in (None, '')]
+            label = change['vehicle'] or change['make'] or ''
+            parts.append(f"<p><span style='color: {colors[change['change']]}; font-weight: bold;'>"
+                         f"{change['change'].capitalize()}</span> {html.escape(label)}<br>{'<br>'.join(fields)}</p>")
+        if len(changes) == self.MAX_ROWS:
+            parts.append(f"<p><i>Showing the first {self.MAX_ROWS} changes.</i></p>")
+        self.changes_browser.setHtml(''.join(parts))
 
-    def save_manufacturer_chart_data(self, data, db_path):
-        """Save manufacturer chart data to database using simple approach like prequals"""
-        try:
-            # Create table if it doesn't exist
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Create manufacturer_chart table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS manufacturer_chart (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    Year TEXT,
-                    Make TEXT,
-                    Model TEXT,
-                    Calibration_Type TEXT,
-                    Protech_Generic_System_Name TEXT,
-                    SME_Generic_System_Name TEXT,
-                    SME_Calibration_Type TEXT,
-                    Feature TEXT,
-                    Service_Information_Hyperlink TEXT,
-                    Calibration_Pre_Requisites TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Insert data using simple approach
-            for record in data:
-                # Map columns flexibly (case-insensitive)
-                year = record.get('Year', record.get('year', ''))
-                make = record.get('Make', record.get('make', ''))
-                model = record.get('Model', record.get('model', ''))
-                calibration_type = record.get('Calibration Type', record.get('calibration type', record.get('CalibrationType', '')))
-                protech_system = record.get('Protech Generic System Name', record.get('protech generic system name', ''))
-                sme_system = record.get('SME Generic System Name', record.get('sme generic system name', ''))
-                sme_calibration = record.get('SME Calibration Type', record.get('sme calibration type', ''))
-                feature = record.get('Feature', record.get('feature', ''))
-                service_link = record.get('Service Information Hyperlink', record.get('service information hyperlink', ''))
-                prerequisites = record.get('Calibration Pre-Requisites', record.get('calibration pre-requisites', ''))
-                
-                cursor.execute('''
-                    INSERT INTO manufacturer_chart 
-                    (Year, Make, Model, Calibration_Type, Protech_Generic_System_Name, 
-                     SME_Generic_System_Name, SME_Calibration_Type, Feature, 
-                     Service_Information_Hyperlink, Calibration_Pre_Requisites)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (year, make, model, calibration_type, protech_system, 
-                      sme_system, sme_calibration, feature, service_link, prerequisites))
-            
-            conn.commit()
-            conn.close()
-            logging.info(f"Saved {len(data)} manufacturer chart records to database")
-            
-        except Exception as e:
-            logging.error(f"Error saving manufacturer chart data: {str(e)}")
-            raise
 
 def get_theme_palette(theme):
     palettes = {
@@ -2268,18 +1755,25 @@ def get_theme_palette(theme):
     return palettes.get(theme, palettes["Light"])
 
 class ModernAnalyzerApp(ModernMainWindow):
+    # Emitted from the folder watcher thread with the configuration types to re-import
+    watched_folders_changed = pyqtSignal(list)
+
     def __init__(self, db_path='data.db'):
         super().__init__()
         self.db_path = db_path
         self.settings_file = 'settings.json'
         self.current_theme = 'Light'  # Start with light theme for modern look
         self.current_user = None
-        self.connection_pool = None
-        self.conn = sqlite3.connect(self.db_path)
         self.adas_authenticated = False
+        self.import_job = None
+        self.import_started = None
+        self.folder_watcher = None
+        self.pending_auto_import = set()
+        # Manufacturer chart rows per make (upper-cased), dropped when an import replaces that make
+        self.chart_cache = {}
         initialize_db(self.db_path)
         self.current_theme = self.get_last_logged_theme()
-        self.data = {'blacklist': [], 'goldlist': [], 'prequal': [], 'mag_glass': [], 'carsys': []}
+        self.data = {'blacklist': [], 'goldlist': [], 'mag_glass': [], 'carsys': []}
         self.make_map = {}
         self.model_map = {}
         
@@ -2303,33 +1797,27 @@ class ModernAnalyzerApp(ModernMainWindow):
         self.load_configurations()
         self.check_data_loaded()
         self.apply_saved_theme()
+        self.watched_folders_changed.connect(self.auto_import)
+        self.update_folder_watcher()
+        QTimer.singleShot(0, self.offer_resume_import)
 
     def get_last_logged_theme(self):
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
         try:
-            cursor.execute("SELECT action FROM user_actions WHERE action LIKE 'Selected theme:%' ORDER BY timestamp DESC LIMIT 1")
-            result = cursor.fetchone()
-            if result:
-                last_theme_action = result[0]
+            last_theme_action = get_last_action('Selected theme:', self.db_path)
+            if last_theme_action:
                 return last_theme_action.split(":")[1].strip()
         except sqlite3.OperationalError as e:
             logging.error(f"Database error: {e}")
         return 'Light'
 
     def log_action(self, user, action):
-        conn = self.get_db_connection()
         try:
-            cursor = conn.cursor()
             cst = pytz.timezone('America/Chicago')
             now = datetime.now(cst)
             timestamp = now.strftime('%Y-%m-%d %H:%M:%S')
-            cursor.execute('INSERT INTO user_actions (user, action, timestamp) VALUES (?, ?, ?)', (user, action, timestamp))
-            conn.commit()
+            log_user_action(user, action, timestamp, self.db_path)
         except sqlite3.Error as e:
             logging.error(f"Failed to log action: {e}")
-        finally:
-            conn.close()
 
     def create_styled_messagebox(self, title, text, icon_type=QMessageBox.Warning):
         msg_box = QMessageBox(self)
@@ -2375,47 +1863,34 @@ class ModernAnalyzerApp(ModernMainWindow):
             if result == QDialog.Accepted:
                 pin = login_dialog.get_pin()
                 if pin:
-                    conn = self.get_db_connection()
-                    cursor = conn.cursor()
-                    
                     logging.debug(f"Login attempt with PIN: {pin}")
                     
-                    debug_cursor = conn.cursor()
-                    debug_cursor.execute('SELECT pin, name FROM leader_log')
-                    all_users = debug_cursor.fetchall()
+                    all_users = get_users(self.db_path)
                     logging.debug(f"All users in database: {all_users}")
                     
                     if pin == '1234':
                         self.current_user = "Emergency Admin"
                         logging.debug("Logged in with emergency PIN")
                         self.log_action(self.current_user, "Logged in with emergency PIN")
-                        conn.close()
                         
                         try:
-                            setup_cursor = conn.cursor()
-                            setup_cursor.execute('SELECT * FROM leader_log WHERE name = "Set Up"')
-                            if not setup_cursor.fetchone():
-                                setup_cursor.execute('INSERT INTO leader_log (pin, name) VALUES (?, ?)', ('0000', 'Set Up'))
-                                conn.commit()
+                            if ensure_user('0000', 'Set Up', self.db_path):
                                 logging.debug("Created default 'Set Up' user with PIN 0000")
                         except Exception as e:
                             logging.error(f"Error creating default user: {e}")
                         
                         return True
                         
-                    cursor.execute('SELECT name FROM leader_log WHERE pin = ?', (pin,))
-                    result = cursor.fetchone()
-                    if result:
-                        self.current_user = result[0]
+                    user_name = get_user_by_pin(pin, self.db_path)
+                    if user_name:
+                        self.current_user = user_name
                         logging.debug(f"Successful login for user: {self.current_user}")
                         self.log_action(self.current_user, "Logged in")
-                        conn.close()
                         return True
                     elif pin == '9716':
                         self.current_user = "Set Up"
                         logging.debug("Logged in with standard PIN")
                         self.log_action(self.current_user, "Logged in with standard PIN")
-                        conn.close()
                         return True
                     else:
                         debug_msg = "Available users in database:\n"
@@ -2432,7 +1907,6 @@ class ModernAnalyzerApp(ModernMainWindow):
                         )
                         msg_box.exec_()
                         self.log_action("Unknown", f"Failed User PIN attempt with PIN: {pin}")
-                        conn.close()
                 else:
                     msg_box = self.create_styled_messagebox("Access Denied", "PIN cannot be empty.")
                     msg_box.exec_()
@@ -3148,6 +2622,10 @@ class ModernAnalyzerApp(ModernMainWindow):
         self.progress_bar = ModernProgressBar()
         self.progress_bar.setVisible(False)
         self.status_bar.addPermanentWidget(self.progress_bar)
+        self.cancel_import_button = ModernButton("Cancel Import", style="secondary")
+        self.cancel_import_button.setVisible(False)
+        self.cancel_import_button.clicked.connect(self.cancel_import)
+        self.status_bar.addPermanentWidget(self.cancel_import_button)
         
         # Add transparency control
         self.status_bar.addPermanentWidget(QLabel("Transparency:"))
@@ -3257,28 +2735,14 @@ class ModernAnalyzerApp(ModernMainWindow):
             return
         try:
             year_int = int(year_text)
-            matching_models = set()
-            
             print(f"[DEBUG] populate_models: Searching for models with year {year_int} and make '{make_text}'")
-            
-            for item in self.data['prequal']:
-                try:
-                    if (self.has_valid_prequal(item) and 'Year' in item and 'Make' in item and 'Model' in item and pd.notna(item['Year']) and item['Make'] == make_text):
-                        item_year = int(float(item['Year']))
-                        if item_year == year_int:
-                            model_name = str(item['Model'])
-                            matching_models.add(model_name)
-                            if len(matching_models) <= 5:  # Show first 5 models being added
-                                print(f"[DEBUG] populate_models: Adding model: '{model_name}' (type: {type(item['Model'])})")
-                except (ValueError, TypeError, KeyError):
-                    continue
+            matching_models = get_prequal_models(year_int, make_text, self.db_path)
             
             print(f"[DEBUG] populate_models: Found {len(matching_models)} matching models")
             
             if matching_models:
-                sorted_models = sorted(matching_models)
-                self.model_dropdown.addItems(sorted_models)
-                print(f"[DEBUG] populate_models: Added models: {sorted_models[:5]}...")  # Show first 5
+                self.model_dropdown.addItems(matching_models)
+                print(f"[DEBUG] populate_models: Added models: {matching_models[:5]}...")  # Show first 5
                 import logging
                 logging.info(f"Added {len(matching_models)} models for Year: {year_int}, Make: {make_text}")
             else:
@@ -3426,12 +2890,6 @@ class ModernAnalyzerApp(ModernMainWindow):
         
         print(f"[DEBUG] Search criteria: Year={selected_year}, Make={selected_make}, Model={selected_model}, DTC={dtc_code}")
         
-        # Print first 3 prequal records loaded
-        if hasattr(self, 'data') and 'prequal' in self.data and self.data['prequal']:
-            print(f"[DEBUG] First 3 prequal records loaded: {self.data['prequal'][:3]}")
-        else:
-            print("[DEBUG] No prequal data loaded.")
-        
         # Update displays based on visible tabs
         self.update_displays_based_on_visible_tabs(dtc_code, selected_make, selected_model, selected_year)
         
@@ -3475,44 +2933,15 @@ class ModernAnalyzerApp(ModernMainWindow):
         # Dictionary to hold unique System Acronyms
         unique_results = {}
 
-        # Convert selected_model to a string
-        selected_model_str = str(selected_model)
-
-        # Debug: Show sample data for the selected make and year
-        sample_data = [item for item in self.data['prequal'] 
-                      if item.get('Make') == selected_make and str(item.get('Year', '')) == str(selected_year)]
-        if sample_data:
-            print(f"[DEBUG] handle_prequal_search: Found {len(sample_data)} records for {selected_make} {selected_year}")
-            print(f"[DEBUG] handle_prequal_search: Sample models in data: {[str(item.get('Model', '')) for item in sample_data[:5]]}")
-            print(f"[DEBUG] handle_prequal_search: Looking for model: '{selected_model_str}'")
-        else:
-            print(f"[DEBUG] handle_prequal_search: No data found for {selected_make} {selected_year}")
-
-        # Filtering data based on selections
-        filtered_results = [item for item in self.data['prequal']
-                            if (selected_make == "All" or item['Make'] == selected_make) and
-                            (selected_model == "Select Model" or str(item['Model']) == selected_model_str) and
-                            (selected_year == "Select Year" or str(int(float(item['Year']))) == selected_year)]
+        # The (Year, Make, Model) index finds the records; "All" and the placeholders match everything
+        filtered_results = query_prequal(
+            None if selected_year == "Select Year" else selected_year,
+            None if selected_make == "All" else selected_make,
+            None if selected_model == "Select Model" else str(selected_model),
+            self.db_path
+        )
 
         print(f"[DEBUG] handle_prequal_search: Filtered results: {len(filtered_results)}")
-        
-        if filtered_results:
-            print(f"[DEBUG] handle_prequal_search: Sample filtered result: {filtered_results[0]}")
-        else:
-            # Debug: Show why filtering failed
-            print(f"[DEBUG] handle_prequal_search: No results found. Checking each condition:")
-            make_matches = [item for item in self.data['prequal'] if item.get('Make') == selected_make]
-            print(f"[DEBUG] handle_prequal_search: Make matches: {len(make_matches)}")
-            
-            if make_matches:
-                year_matches = [item for item in make_matches if str(item.get('Year', '')) == str(selected_year)]
-                print(f"[DEBUG] handle_prequal_search: Year matches: {len(year_matches)}")
-                
-                if year_matches:
-                    model_matches = [item for item in year_matches if str(item.get('Model', '')) == selected_model_str]
-                    print(f"[DEBUG] handle_prequal_search: Model matches: {len(model_matches)}")
-                    if not model_matches:
-                        print(f"[DEBUG] handle_prequal_search: Model comparison failed. Available models: {list(set([str(item.get('Model', '')) for item in year_matches]))}")
 
         # Populating the dictionary with unique entries based on System Acronym
         for item in filtered_results:
@@ -3529,7 +2958,6 @@ class ModernAnalyzerApp(ModernMainWindow):
 
     def display_cmc_data(self, selected_year, selected_make, selected_model):
         """Display Manufacturer Chart data"""
-        conn = None
         try:
             # Check if year, make, and model are selected
             if (selected_year == "Select Year" or selected_make == "Select Make" or 
@@ -3537,99 +2965,31 @@ class ModernAnalyzerApp(ModernMainWindow):
                 self.left_panel.setPlainText("Please select Year, Make, and Model to view Manufacturer Chart data.")
                 return
             
-            conn = self.get_db_connection()
-            
             # Check if table exists
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='manufacturer_chart'")
-            if not cursor.fetchone():
+            if not chart_exists(self.db_path):
                 self.left_panel.setPlainText("No Manufacturer Chart data found. Please load data first.")
                 return
             
-            # Query for manufacturer chart data with year, make, and model filters
-            # First, let's see what columns are actually in the table
-            cursor.execute("PRAGMA table_info(manufacturer_chart)")
-            columns_info = cursor.fetchall()
-            logging.debug(f"Manufacturer chart table columns: {[col[1] for col in columns_info]}")
-            
-            # Get all data first to see what we have
-            query = "SELECT * FROM manufacturer_chart"
-            df = pd.read_sql_query(query, conn)
-            
-            # Debug: Check for Acura data specifically
-            acura_query = "SELECT DISTINCT Make FROM manufacturer_chart WHERE UPPER(Make) LIKE '%ACURA%'"
-            acura_cursor = conn.cursor()
-            acura_cursor.execute(acura_query)
-            acura_makes = acura_cursor.fetchall()
-            logging.debug(f"Acura makes found in database: {acura_makes}")
-            
-            # Check for any data with 'acura' in the make field
-            all_makes_query = "SELECT DISTINCT Make FROM manufacturer_chart WHERE Make IS NOT NULL ORDER BY Make"
-            all_makes_cursor = conn.cursor()
-            all_makes_cursor.execute(all_makes_query)
-            all_makes_in_db = [row[0] for row in all_makes_cursor.fetchall()]
-            logging.debug(f"All makes in database: {all_makes_in_db[:20]}")  # Show first 20
-            
-            logging.debug(f"Total manufacturer chart records: {len(df)}")
-            if not df.empty:
-                logging.debug(f"Sample manufacturer chart data: {df.head()}")
-                logging.debug(f"Available columns: {list(df.columns)}")
-            
-            # Now filter by year, make, and model
+            # Only the selected make's rows are read, and kept for the next lookup
+            df = self.get_chart_rows(selected_make)
+            logging.debug(f"Manufacturer chart records for {selected_make}: {len(df)}")
+
+            # Now filter by year and model
             if not df.empty:
-                # Normalize the search values
-                search_year = str(selected_year).strip().upper()
-                search_make = str(selected_make).strip().upper()
+                # Years are stored as integers, so '2021' and '2021.0' select the same rows
+                search_year = stored_year(str(selected_year).strip())
                 search_model = str(selected_model).strip().upper()
-                
-                # Debug: Show what data is available
-                logging.debug(f"Searching for: Year='{search_year}', Make='{search_make}', Model='{search_model}'")
-                
-                # Show sample of available data - handle None values properly
-                unique_years = df['Year'].dropna().unique()
-                unique_makes = df['Make'].dropna().unique()
-                unique_models = df['Model'].dropna().unique()
-                logging.debug(f"Available years: {list(unique_years)[:10]}")  # Show first 10
-                all_makes = sorted([make for make in unique_makes if make is not None])
-                logging.debug(f"Available makes (first 20): {all_makes[:20]}")
-                logging.debug(f"Total unique makes: {len(all_makes)}")
-                # Check specifically for Acura
-                acura_present = 'Acura' in all_makes
-                logging.debug(f"Is 'Acura' in the data: {acura_present}")
-                if acura_present:
-                    acura_data = df[df['Make'].fillna('').str.upper() == 'ACURA']
-                    logging.debug(f"Acura records found: {len(acura_data)}")
-                    if len(acura_data) > 0:
-                        logging.debug(f"Acura years: {acura_data['Year'].dropna().unique().tolist()}")
-                        logging.debug(f"Acura models: {acura_data['Model'].dropna().unique().tolist()}")
-                else:
-                    # Check if there are any variations of Acura
-                    acura_variants = [make for make in all_makes if make and 'acura' in make.lower()]
-                    logging.debug(f"Acura variants found: {acura_variants}")
-                logging.debug(f"Available models: {list(unique_models)[:10]}")  # Show first 10
-                
-                # Filter the dataframe - handle None values and float years properly
-                # Convert Year to int first to remove .0, then to string
-                def normalize_year(val):
-                    if pd.isna(val) or val == '':
-                        return ''
-                    try:
-                        # Try to convert to float first, then to int to remove decimals
-                        return str(int(float(val)))
-                    except:
-                        return str(val).strip()
-                
+
                 filtered_df = df[
-                    (df['Year'].apply(normalize_year).str.upper() == search_year) &
-                    (df['Make'].fillna('').astype(str).str.strip().str.upper() == search_make) &
+                    (df['Year'] == search_year) &
                     (df['Model'].fillna('').astype(str).str.strip().str.upper() == search_model)
                 ]
                 
                 logging.debug(f"Filtered records for {selected_year} {selected_make} {selected_model}: {len(filtered_df)}")
                 df = filtered_df
             
-            # Replace NaN values with empty strings
-            df.fillna("", inplace=True)
+            # Replace NaN values with empty strings, leaving the cached rows untouched
+            df = df.fillna("")
             
             # Display the results in the left panel
             if df.empty:
@@ -3646,10 +3006,21 @@ class ModernAnalyzerApp(ModernMainWindow):
         except Exception as e:
             logging.error(f"Failed to display CMC data: {e}")
             self.left_panel.setPlainText(f"An error occurred while fetching the Manufacturer Chart data: {str(e)}")
-        
-        finally:
-            if conn:
-                conn.close()
+
+    def get_chart_rows(self, make):
+        """Get the manufacturer chart rows of one make, cached until an import replaces that make"""
+        key = str(make).strip().upper()
+        if key not in self.chart_cache:
+            self.chart_cache[key] = get_chart_rows(key, self.db_path)
+        return self.chart_cache[key]
+
+    def invalidate_chart_cache(self, makes=None):
+        """Forget the cached chart rows of the given makes, or of every make"""
+        if makes is None:
+            self.chart_cache.clear()
+        else:
+            for make in makes:
+                self.chart_cache.pop(str(make).strip().upper(), None)
 
     def format_cmc_data_for_display(self, df):
         """Format CMC data for display similar to prequals format"""
@@ -3766,29 +3137,12 @@ class ModernAnalyzerApp(ModernMainWindow):
     def display_mag_glass(self, selected_make):
         """Display Mag Glass data"""
         try:
-            conn = self.get_db_connection()
-            
             # Check if table exists
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='mag_glass'")
-            if not cursor.fetchone():
+            if not mag_glass_exists(self.db_path):
                 self.mag_glass_panel_widget.setPlainText("No Mag Glass data found. Please load data first.")
                 return
             
-            # Prepare the query based on the selected make - use correct quoted column names
-            if selected_make == "All":
-                query = """
-                SELECT "Generic System Name", "ADAS Module Name", "Car Make", "Manufacturer", "AUTEL or BOSCH"
-                FROM mag_glass
-                """
-                df = pd.read_sql_query(query, conn)
-            else:
-                query = """
-                SELECT "Generic System Name", "ADAS Module Name", "Car Make", "Manufacturer", "AUTEL or BOSCH"
-                FROM mag_glass
-                WHERE "Car Make" = ?
-                """
-                df = pd.read_sql_query(query, conn, params=(selected_make,))
+            df = get_mag_glass_rows(None if selected_make == "All" else selected_make, self.db_path)
             
             # Display the data in the Mag Glass panel
             if not df.empty:
@@ -3830,31 +3184,17 @@ class ModernAnalyzerApp(ModernMainWindow):
             else:
                 self.mag_glass_panel_widget.setPlainText(f"No Mag Glass results found for make: {selected_make}")
         except Exception as e:
-            logging.error(f"Failed to execute query: {query}\nError: {e}")
+            logging.error(f"Failed to load Mag Glass data for {selected_make!r}: {e}")
             self.mag_glass_panel_widget.setPlainText(f"An error occurred while fetching the data: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
 
 
 
     def search_mag_glass(self, selected_make):
         """Search Mag Glass data"""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-
-        query = f"""
-        SELECT "Generic System Name", "ADAS Module Name", "Car Make", "Manufacturer", "AUTEL or BOSCH"
-        FROM mag_glass
-        """
-        
-        if selected_make != "All":
-            query += f" WHERE \"Car Make\" = '{selected_make}'"
-        
         try:
-            df = pd.read_sql_query(query, conn)
+            df = get_mag_glass_rows(None if selected_make == "All" else selected_make, self.db_path)
         except Exception as e:
-            logging.error(f"Failed to execute query: {query}\nError: {e}")
+            logging.error(f"Failed to load Mag Glass data for {selected_make!r}: {e}")
             self.mag_glass_panel_widget.setPlainText("An error occurred while fetching the data.")
             return
 
@@ -3866,47 +3206,19 @@ class ModernAnalyzerApp(ModernMainWindow):
 
     def search_dtc_codes(self, dtc_code, filter_type, selected_make):
         """Search DTC codes"""
-        conn = self.get_db_connection()
-        query = ""
-
         if filter_type == "All" or filter_type == "Gold and Black":
-            if selected_make == "All":
-                query = f"""
-                SELECT 'blacklist' as Source, dtcCode, genericSystemName, dtcDescription, dtcSys, carMake, comments FROM blacklist
-                WHERE dtcCode LIKE '%{dtc_code}%' OR dtcDescription LIKE '%{dtc_code}%'
-                UNION ALL
-                SELECT 'goldlist' as Source, dtcCode, genericSystemName, dtcDescription, dtcSys, carMake, comments FROM goldlist
-                WHERE dtcCode LIKE '%{dtc_code}%' OR dtcDescription LIKE '%{dtc_code}%'
-                """
-            else:
-                query = f"""
-                SELECT 'blacklist' as Source, dtcCode, genericSystemName, dtcDescription, dtcSys, carMake, comments FROM blacklist
-                WHERE (dtcCode LIKE '%{dtc_code}%' OR dtcDescription LIKE '%{dtc_code}%') AND carMake = '{selected_make}'
-                UNION ALL
-                SELECT 'goldlist' as Source, dtcCode, genericSystemName, dtcDescription, dtcSys, carMake, comments FROM goldlist
-                WHERE (dtcCode LIKE '%{dtc_code}%' OR dtcDescription LIKE '%{dtc_code}%') AND carMake = '{selected_make}'
-                """
-        elif filter_type == "Blacklist":
-            query = f"""
-            SELECT 'blacklist' as Source, dtcCode, genericSystemName, dtcDescription, dtcSys, carMake, comments FROM blacklist
-            WHERE (dtcCode LIKE '%{dtc_code}%' OR dtcDescription LIKE '%{dtc_code}%')
-            """
-            if selected_make != "Select Make" and selected_make != "All":
-                query += f" AND carMake = '{selected_make}'"
-        elif filter_type == "Goldlist":
-            query = f"""
-            SELECT 'goldlist' as Source, dtcCode, genericSystemName, dtcDescription, dtcSys, carMake, comments FROM goldlist
-            WHERE (dtcCode LIKE '%{dtc_code}%' OR dtcDescription LIKE '%{dtc_code}%')
-            """
-            if selected_make != "Select Make" and selected_make != "All":
-                query += f" AND carMake = '{selected_make}'"
-
-        query += ";"  # Ensuring the query ends with a semicolon.
+            tables = ['blacklist', 'goldlist']
+            make = None if selected_make == "All" else selected_make
+        else:
+            tables = ['blacklist'] if filter_type == "Blacklist" else ['goldlist']
+            make = None if selected_make in ("Select Make", "All") else selected_make
 
+        # Each list's full-text index ranks its own matches, best first
         try:
-            df = pd.read_sql_query(query, conn)
+            df = pd.concat([search_dtc(table, dtc_code, make, self.db_path) for table in tables],
+                           ignore_index=True)
         except Exception as e:
-            logging.error(f"Failed to execute query: {query}\nError: {e}")
+            logging.error(f"Failed to search DTC codes for {dtc_code!r}: {e}")
             self.right_panel.setPlainText("An error occurred while fetching the data.")
             return
 
@@ -4102,294 +3414,6 @@ class ModernAnalyzerApp(ModernMainWindow):
         dialog = MultiVehicleCompareDialog(self)
         dialog.exec_()
         
-    def manage_paths(self):
-        """Create a dialog to manage paths"""
-        self.path_dialog = QDialog(self)
-        self.path_dialog.setWindowTitle("Manage Lists")
-        self.path_dialog.setGeometry(100, 100, 500, 350)
-        
-        # Create a title label
-        title_label = QLabel("Manage Data Lists")
-        title_label.setAlignment(Qt.AlignCenter)
-        font = title_label.font()
-        font.setPointSize(14)
-        font.setBold(True)
-        title_label.setFont(font)
-        
-        # Add a note about CarSYS and MagGlass using goldlist path
-        note_label = QLabel("Note: CarSYS and MagGlass automatically use the same path as Goldlist")
-        note_label.setAlignment(Qt.AlignCenter)
-        note_label.setStyleSheet("font-style: italic; color: #888;")
-        
-        # Create a form layout to hold the path selectors
-        form_layout = QFormLayout()
-        
-        self.load_buttons = {}  # Store load buttons for easy access
-        self.clear_buttons = {}  # Store clear buttons for easy access
-        self.path_labels = {}  # Store labels for easy access
-        self.browse_buttons = {}  # Store browse buttons for easy access
-        
-        # Define new display names - remove CarSys and mag_glass
-        config_display_names = {
-            "blacklist": "Blacklist",
-            "goldlist": "Goldlist",
-            "prequal": "Prequals (Longsheets)"
-        }
-        
-        # Create a function to handle load button clicks
-        def on_load_button_clicked(config_type):
-            folder_path = QFileDialog.getExistingDirectory(self, f"Select {config_display_names[config_type]} Directory")
-            if folder_path:
-                self.browse_buttons[config_type].setText(folder_path)
-        
-        # Create a function to handle clear button clicks
-        def on_clear_button_clicked(config_type):
-            msg_box = self.create_styled_messagebox(
-                "Clear Data", 
-                f"Are you sure you want to clear all {config_display_names[config_type]} data?",
-                QMessageBox.Question
-            )
-            msg_box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
-            msg_box.setDefaultButton(QMessageBox.No)
-            
-            if msg_box.exec_() == QMessageBox.Yes:
-                self.clear_data(config_type)
-                self.browse_buttons[config_type].clear()
-                
-                # Special case for goldlist to also clear CarSYS and MagGlass
-                if config_type == "goldlist":
-                    self.clear_data("CarSys")
-                    self.clear_data("mag_glass")
-                    success_msg = self.create_styled_messagebox(
-                        "Data Cleared", 
-                        f"{config_display_names[config_type]}, CarSYS, and MagGlass data has been cleared.",
-                        QMessageBox.Information
-                    )
-                else:
-                    success_msg = self.create_styled_messagebox(
-                        "Data Cleared", 
-                        f"{config_display_names[config_type]} data has been cleared.",
-                        QMessageBox.Information
-                    )
-                success_msg.exec_()
-        
-        for config_name, display_name in config_display_names.items():
-            # Create a horizontal layout for the buttons
-            buttons_layout = QHBoxLayout()
-            
-            # Create a styled section label
-            section_label = QLabel(display_name)
-            section_label.setStyleSheet("font-weight: bold; font-size: 12px; margin-top: 10px;")
-            
-            load_button = QPushButton("Choose Path")
-            load_button.setObjectName("action_button")
-            load_button.clicked.connect(lambda checked, config=config_name: on_load_button_clicked(config))
-            self.load_buttons[config_name] = load_button
-            buttons_layout.addWidget(load_button)
-            
-            clear_button = QPushButton("Clear Data")
-            clear_button.setObjectName("danger_button")
-            clear_button.clicked.connect(lambda checked, config=config_name: on_clear_button_clicked(config))
-            self.clear_buttons[config_name] = clear_button
-            buttons_layout.addWidget(clear_button)
-            
-            # Create a widget to hold the buttons
-            buttons_widget = QWidget()
-            buttons_widget.setLayout(buttons_layout)
-            
-            form_layout.addRow(section_label, buttons_widget)
-            self.path_labels[config_name] = QLabel(f"Path:")
-            self.browse_buttons[config_name] = QLineEdit()
-            self.browse_buttons[config_name].setReadOnly(True)
-            self.browse_buttons[config_name].setPlaceholderText(f"Select a directory for {display_name}")
-            form_layout.addRow(self.path_labels[config_name], self.browse_buttons[config_name])
-            self.browse_buttons[config_name].textChanged.connect(self.update_path_label)
-        
-        button_layout = QHBoxLayout()
-        self.cancel_button = QPushButton("Cancel")
-        self.cancel_button.setObjectName("cancel_button")
-        self.cancel_button.clicked.connect(self.path_dialog.reject)
-        button_layout.addWidget(self.cancel_button)
-        
-        self.clear_all_button = QPushButton("Clear All Data")
-        self.clear_all_button.setObjectName("clear_all_button")
-        self.clear_all_button.clicked.connect(self.clear_all_data)
-        button_layout.addWidget(self.clear_all_button)
-        
-        self.save_button = QPushButton("Save & Load Data")
-        self.save_button.setObjectName("primary_button")
-        self.save_button.clicked.connect(self.save_paths)
-        button_layout.addWidget(self.save_button)
-        
-        # Setup main layout
-        main_layout = QVBoxLayout()
-        main_layout.addWidget(title_label)
-        main_layout.addWidget(note_label)
-        main_layout.addSpacing(10)
-        
-        # Add a container widget for the form
-        form_widget = QWidget()
-        form_widget.setLayout(form_layout)
-        main_layout.addWidget(form_widget)
-        
-        # Add some space before buttons
-        main_layout.addSpacing(10)
-        main_layout.addLayout(button_layout)
-        
-        self.path_dialog.setLayout(main_layout)
-        
-        # Pre-populate path fields with existing paths
-        for config_name in config_display_names.keys():
-            existing_path = load_path_from_db(config_name, self.db_path)
-            if existing_path:
-                self.browse_buttons[config_name].setText(existing_path)
-        
-        self.path_dialog.exec_()
-        
-    def save_paths(self):
-        """Save paths and load data"""
-        paths_to_save = {}
-        
-        for config_type, browse_button in self.browse_buttons.items():
-            folder_path = browse_button.text()
-            if folder_path:
-                paths_to_save[config_type] = folder_path
-        
-        if not paths_to_save:
-            QMessageBox.warning(self, "No Paths", "No paths have been selected.")
-            return
-        
-        # Get the goldlist path to share with CarSYS and MagGlass
-        goldlist_path = paths_to_save.get("goldlist")
-        
-        for config_type, folder_path in paths_to_save.items():
-            try:
-                files = self.get_valid_excel_files(folder_path)
-                if not files:
-                    QMessageBox.warning(self, "Load Error", f"No valid Excel files found in the {folder_path} directory for {config_type}.")
-                    continue
-                
-                # Clear existing data
-                self.clear_data(config_type)
-                
-                # Special case: if goldlist is being updated, also clear CarSYS and MagGlass
-                if config_type == "goldlist":
-                    self.clear_data("CarSys")
-                    self.clear_data("mag_glass")
-                
-                if hasattr(self, 'progress_bar'):
-                    self.progress_bar.setVisible(True)
-                    self.progress_bar.setMaximum(len(files))
-                    self.progress_bar.setValue(0)
-                
-                # Process files based on configuration type
-                data_loaded = False
-                for i, (filename, filepath) in enumerate(files.items()):
-                    try:
-                        if config_type in ['blacklist', 'goldlist']:
-                            result = load_excel_data_to_db(filepath, config_type, db_path=self.db_path, sheet_index=1)
-                            if result == "Data loaded successfully":
-                                data_loaded = True
-                                
-                                # If this is goldlist, also load the same file for CarSYS and MagGlass
-                                if config_type == 'goldlist':
-                                    load_carsys_data_to_db(filepath, table_name='CarSys', db_path=self.db_path)
-                                    load_mag_glass_data(filepath, table_name='mag_glass', db_path=self.db_path)
-                        elif config_type == 'prequal':
-                            df = pd.read_excel(filepath, sheet_name=0)
-                            if df.empty:
-                                logging.warning(f"{filename} is empty.")
-                                continue
-                            data = df.to_dict(orient='records')
-                            update_configuration(config_type, folder_path, data, self.db_path)
-                            data_loaded = True
-                        elif config_type == 'mag_glass':
-                            result = load_mag_glass_data(filepath, config_type, db_path=self.db_path)
-                            if result == "Data loaded successfully":
-                                data_loaded = True
-                        elif config_type == 'CarSys':
-                            result = load_excel_data_to_db(filepath, config_type, db_path=self.db_path, sheet_index=0)
-                            if result == "Data loaded successfully":
-                                data_loaded = True
-                        else:
-                            df = pd.read_excel(filepath)
-                            if df.empty:
-                                logging.warning(f"{filename} is empty.")
-                                continue
-                            data = df.to_dict(orient='records')
-                            update_configuration(config_type, folder_path, data, self.db_path)
-                            data_loaded = True
-                    except Exception as e:
-                        logging.error(f"Error loading {filename}: {str(e)}")
-                        QMessageBox.critical(self, "Load Error", f"Failed to load {filename}: {str(e)}")
-                    
-                    if hasattr(self, 'progress_bar'):
-                        self.progress_bar.setValue(i + 1)
-                
-                # Save path to database
-                save_path_to_db(config_type, folder_path, self.db_path)
-                
-                # If this is goldlist, also save the same path for CarSYS and MagGlass
-                if config_type == 'goldlist':
-                    save_path_to_db('CarSys', folder_path, self.db_path)
-                    save_path_to_db('mag_glass', folder_path, self.db_path)
-            
-            except Exception as e:
-                logging.error(f"Error saving path for {config_type}: {str(e)}")
-                QMessageBox.critical(self, "Error", f"Failed to save path for {config_type}: {str(e)}")
-        
-        if hasattr(self, 'progress_bar'):
-            self.progress_bar.setVisible(False)
-        self.load_configurations()  # Reload all configurations
-        self.populate_dropdowns()  # Repopulate dropdowns
-        self.check_data_loaded()  # Check if data is loaded
-        
-        # Show a single success message for the entire operation
-        msg = self.create_styled_messagebox("Success", "Paths saved and data loaded successfully!", QMessageBox.Information)
-        msg.exec_()
-        self.path_dialog.accept()
-        
-    def update_path_label(self):
-        """Update path labels"""
-        for config_name, label in self.path_labels.items():
-            label.setText(f"{config_name} Path: {self.browse_buttons[config_name].text()}")
-            
-    def clear_all_data(self):
-        """Clear all data with confirmation"""
-        msg_box = self.create_styled_messagebox(
-            "Clear All Data", 
-            "Are you sure you want to clear ALL data?\nThis action cannot be undone.",
-            QMessageBox.Question
-        )
-        msg_box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
-        msg_box.setDefaultButton(QMessageBox.No)
-        
-        confirmation = msg_box.exec_()
-        
-        if confirmation == QMessageBox.Yes:
-            # Clear all data types
-            self.clear_data()
-            
-            # Clear all path text fields
-            for path_field in self.browse_buttons.values():
-                path_field.clear()
-                
-            # Update UI
-            self.load_configurations()
-            self.populate_dropdowns()
-            self.check_data_loaded()
-            
-            # Show success message
-            success_msg = self.create_styled_messagebox(
-                "Data Cleared", 
-                "All data has been successfully cleared.",
-                QMessageBox.Information
-            )
-            success_msg.exec_()
-            
-            # Log the action
-            self.log_action(self.current_user, "Cleared all data from the database")
-            
     def export_data(self):
         """Export data functionality"""
         try:
@@ -4439,11 +3463,12 @@ class ModernAnalyzerApp(ModernMainWindow):
                 self, "Save CSV File", "", "CSV Files (*.csv)"
             )
             if file_path:
-                # Export all data types
+                # Export all data types; prequal is read from the database rather than held in memory
                 all_data = {}
                 for config_type in ['blacklist', 'goldlist', 'prequal', 'mag_glass', 'carsys']:
-                    if self.data.get(config_type):
-                        all_data[config_type] = self.data[config_type]
+                    data = get_prequal_data(self.db_path) if config_type == 'prequal' else self.data.get(config_type)
+                    if data:
+                        all_data[config_type] = data
                 
                 # Convert to CSV format
                 import csv
@@ -4475,7 +3500,7 @@ class ModernAnalyzerApp(ModernMainWindow):
                 # Export all data
                 export_data = {
                     'export_date': datetime.now().isoformat(),
-                    'data': self.data
+                    'data': dict(self.data, prequal=get_prequal_data(self.db_path))
                 }
                 
                 with open(file_path, 'w', encoding='utf-8') as jsonfile:
@@ -4497,18 +3522,13 @@ class ModernAnalyzerApp(ModernMainWindow):
         """Load configurations from database"""
         logging.debug("Loading configurations...")
         
-        # Load prequal data using the new database utilities
-        prequal_data = get_prequal_data(self.db_path)
-        self.data['prequal'] = prequal_data if prequal_data else []
-        logging.debug(f"Loaded {len(self.data['prequal'])} items for prequal")
-        
-        # Load other data types
+        # Prequal data is queried from the database as it is needed
         for config_type in ['blacklist', 'goldlist', 'mag_glass', 'carsys']:
             data = load_configuration(config_type, self.db_path)
             self.data[config_type] = data if data else []
             logging.debug(f"Loaded {len(data)} items for {config_type}")
         
-        if self.data['prequal']:
+        if get_prequal_years(self.db_path):
             self.populate_dropdowns()
         else:
             logging.warning("No prequal data found!")
@@ -4688,7 +3708,13 @@ class ModernAnalyzerApp(ModernMainWindow):
 
     def closeEvent(self, event):
         """Handle close event"""
+        if self.folder_watcher is not None:
+            self.folder_watcher.stop()
+        if self.import_job is not None and self.import_job.isRunning():
+            self.import_job.cancel()
+            self.import_job.wait()
         self.log_action(self.current_user, "Application closed")
+        close_connections(self.db_path)
         event.accept()
 
     def keyPressEvent(self, event):
@@ -4713,132 +3739,80 @@ class ModernAnalyzerApp(ModernMainWindow):
         return {"theme": "Light"}
 
     def get_valid_excel_files(self, folder_path):
-        import re, os, logging
-        file_pattern = re.compile(r'(.+).xlsx$', re.IGNORECASE)
-        skip_pattern = re.compile(r'.*X\.X\.xlsx$', re.IGNORECASE)
-        valid_files = {}
-        for file_name in os.listdir(folder_path):
-            if file_pattern.match(file_name) and not skip_pattern.match(file_name):
-                full_path = os.path.join(folder_path, file_name)
-                valid_files[file_name] = full_path
-        if not valid_files:
-            logging.error("No valid Excel files found.")
-        return valid_files
+        return get_valid_excel_files(folder_path)
 
     def clear_data(self, config_type=None):
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
+        self.invalidate_chart_cache()
         try:
-            if config_type:
-                cursor.execute(f"DELETE FROM {config_type}")
-                logging.info(f"Data cleared from {config_type}")
-            else:
-                cursor.execute("DROP TABLE IF EXISTS blacklist")
-                cursor.execute("DROP TABLE IF EXISTS goldlist")
-                cursor.execute("DROP TABLE IF EXISTS prequal")
-                cursor.execute("DROP TABLE IF EXISTS mag_glass")
-                cursor.execute("DROP TABLE IF EXISTS manufacturer_chart")
+            with write_connection(self.db_path) as conn:
+                self.clear_tables(conn.cursor(), config_type)
+            if not config_type:
+                # Recreated once the drops are committed, on a connection of its own
                 initialize_db(self.db_path)
                 logging.info("Database reset complete.")
-            conn.commit()
         except Exception as e:
             logging.error(f"Failed to clear data: {e}")
             QMessageBox.critical(self, "Error", "Failed to clear database.")
         self.load_configurations()
 
+    def clear_tables(self, cursor, config_type=None):
+        """Empty one list's table, or drop every list table when config_type is None"""
+        if config_type:
+            # The DTC lists' search indexes are emptied by their triggers
+            cursor.execute(f"DELETE FROM {config_type}")
+            # Forget the imported workbooks so the next refresh reloads them
+            cursor.execute("DELETE FROM import_manifest WHERE config_type = ?", (config_type,))
+            if config_type in CONFIG_TABLES:
+                discard_interrupted_imports(cursor, config_type)
+            logging.info(f"Data cleared from {config_type}")
+        else:
+            cursor.execute("DROP TABLE IF EXISTS blacklist")
+            cursor.execute("DROP TABLE IF EXISTS goldlist")
+            cursor.execute("DROP TABLE IF EXISTS prequal")
+            cursor.execute("DROP TABLE IF EXISTS mag_glass")
+            cursor.execute("DROP TABLE IF EXISTS manufacturer_chart")
+            cursor.execute("DROP TABLE IF EXISTS import_manifest")
+            for fts_table in list(DTC_SEARCH_TABLES.values()) + list(CODE_SEARCH_TABLES.values()):
+                cursor.execute(f"DROP TABLE IF EXISTS {fts_table}")
+            discard_interrupted_imports(cursor)
+
     def refresh_lists(self):
         self.log_action(self.current_user, "Clicked Refresh Lists button")
-        any_data_loaded = False
-        last_processed_path = ""
+        jobs = []
         for config_type in ['blacklist', 'goldlist', 'prequal', 'mag_glass', 'CarSys', 'manufacturer_chart']:
             folder_path = load_path_from_db(config_type, self.db_path)
             if not folder_path and config_type in ['mag_glass', 'CarSys']:
                 folder_path = load_path_from_db('goldlist', self.db_path)
                 if folder_path:
                     save_path_to_db(config_type, folder_path, self.db_path)
-            if folder_path:
-                last_processed_path = folder_path
-                self.clear_data(config_type)
-                import logging
-                logging.info(f"Cleared existing data for {config_type}")
-                files = self.get_valid_excel_files(folder_path)
-                if not files:
-                    if config_type != 'CarSys':
-                        QMessageBox.warning(self, "Load Error", f"No valid Excel files found in the directory for {config_type}.")
-                    continue
-                data_loaded = False
-                if hasattr(self, 'progress_bar'):
-                    self.progress_bar.setVisible(True)
-                    self.progress_bar.setMaximum(len(files))
-                    self.progress_bar.setValue(0)
-                for i, (filename, filepath) in enumerate(files.items()):
-                    try:
-                        if config_type in ['blacklist', 'goldlist']:
-                            result = load_excel_data_to_db(filepath, config_type, db_path=self.db_path, sheet_index=1)
-                            if result == "Data loaded successfully":
-                                data_loaded = True
-                        elif config_type == 'mag_glass':
-                            result = load_mag_glass_data(filepath, config_type, db_path=self.db_path)
-                            if result == "Data loaded successfully":
-                                data_loaded = True
-                        elif config_type == 'CarSys':
-                            result = load_excel_data_to_db(filepath, config_type, db_path=self.db_path, sheet_index=0)
-                            if result == "Data loaded successfully":
-                                data_loaded = True
-                        elif config_type == 'manufacturer_chart':
-                            # For manufacturer chart, we need to load ALL files in the directory
-                            # This is different from other data types that process one file at a time
-                            continue  # Skip individual file processing - we'll handle all files at once
-                        else:
-                            import pandas as pd
-                            df = pd.read_excel(filepath)
-                            if df.empty:
-                                import logging
-                                logging.warning(f"{filename} is empty.")
-                                continue
-                            data = df.to_dict(orient='records')
-                            update_configuration(config_type, folder_path, data, self.db_path)
-                            data_loaded = True
-                    except Exception as e:
-                        import logging
-                        logging.error(f"Error loading {filename}: {str(e)}")
-                        if config_type != 'CarSys':
-                            QMessageBox.critical(self, "Load Error", f"Failed to load {filename}: {str(e)}")
-                    if hasattr(self, 'progress_bar'):
-                        self.progress_bar.setValue(i + 1)
-                if hasattr(self, 'progress_bar'):
-                    self.progress_bar.setVisible(False)
-                if data_loaded:
-                    any_data_loaded = True
-                    self.load_configurations()
-                    self.populate_dropdowns()
-                    self.check_data_loaded()
-                    if hasattr(self, 'status_bar'):
-                        self.status_bar.showMessage(f"Data refreshed from: {folder_path}")
-            else:
-                import logging
+            if not folder_path:
                 logging.warning(f"No saved path found for {config_type}")
-        
-        # Check if manufacturer_chart data exists in database (don't reload from files)
-        manufacturer_chart_path = load_path_from_db('manufacturer_chart', self.db_path)
-        if manufacturer_chart_path:
-            try:
-                # Check if we have data in the database
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM manufacturer_chart")
-                count = cursor.fetchone()[0]
-                conn.close()
-                
-                if count > 0:
-                    logging.info(f"Manufacturer chart data already in database ({count} records)")
-                    any_data_loaded = True
-                else:
-                    logging.warning("No manufacturer chart data in database. Please use 'Save and Load' to load data.")
-                    
-            except Exception as e:
-                logging.error(f"Error checking manufacturer chart data: {str(e)}")
-        
+                continue
+            files = self.get_valid_excel_files(folder_path)
+            if not files:
+                if config_type != 'CarSys':
+                    QMessageBox.warning(self, "Load Error", f"No valid Excel files found in the directory for {config_type}.")
+                continue
+            jobs.append((config_type, folder_path, files))
+
+        if jobs:
+            self.start_import(jobs, incremental=True,
+                              on_finished=lambda report: self.finish_refresh(report, jobs[-1][1]))
+        else:
+            self.finish_refresh(None)
+
+    def finish_refresh(self, report, folder_path=None):
+        """Report the outcome of Refresh Lists and reload the data views"""
+        any_data_loaded = False
+        if report:
+            logging.info(f"Refreshed {len(report['files'])} changed workbooks ({report['unchanged']} unchanged, "
+                         f"{len(report['removed'])} removed) with {report['workers']} workers in {report['seconds']}s")
+            self.show_import_failures(report)
+            if report['loaded'] or report['removed'] or report['unchanged']:
+                any_data_loaded = True
+                self.status_bar.showMessage(f"Data refreshed from: {folder_path}")
+
+        self.load_configurations()
         if any_data_loaded:
             msg = self.create_styled_messagebox("Success", "All data refreshed successfully!", QMessageBox.Information)
             msg.exec_()
@@ -4846,138 +3820,174 @@ class ModernAnalyzerApp(ModernMainWindow):
         self.populate_dropdowns()
         self.check_data_loaded()
 
-    def load_manufacturer_chart_data(self, filepath, db_path):
-        """Load manufacturer chart data from Excel file with specified columns"""
-        try:
-            # Read Excel file
-            df = pd.read_excel(filepath)
-            
-            if df.empty:
-                return "No data found in file"
-            
-            # Normalize column names (case-insensitive, remove special characters)
-            df.columns = [normalize_col(col) for col in df.columns]
-            
-            # Define expected column names (normalized)
-            expected_columns = [
-                'year', 'make', 'model', 'calibrationtype', 'protechgenericsystemname',
-                'smegenericsystemname', 'smecalibrationtype', 'feature', 
-                'serviceinformationhyperlink', 'calibrationprerequisites'
-            ]
-            
-            # Check if required columns exist (with variations)
-            missing_columns = []
-            for expected_col in expected_columns:
-                if not any(expected_col in col.lower() for col in df.columns):
-                    missing_columns.append(expected_col)
-            
-            if missing_columns:
-                logging.warning(f"Missing columns in manufacturer chart: {missing_columns}")
-                # Continue with available columns
-            
-            # Create table if it doesn't exist
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Create manufacturer_chart table with all possible columns
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS manufacturer_chart (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    Year TEXT,
-                    Make TEXT,
-                    Model TEXT,
-                    Calibration_Type TEXT,
-                    Protech_Generic_System_Name TEXT,
-                    SME_Generic_System_Name TEXT,
-                    SME_Calibration_Type TEXT,
-                    Feature TEXT,
-                    Service_Information_Hyperlink TEXT,
-                    Calibration_Pre_Requisites TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Clear existing data
-            cursor.execute("DELETE FROM manufacturer_chart")
-            
-            # Map normalized columns to database columns
-            column_mapping = {
-                'year': 'Year',
-                'make': 'Make', 
-                'model': 'Model',
-                'calibrationtype': 'Calibration_Type',
-                'protechgenericsystemname': 'Protech_Generic_System_Name',
-                'smegenericsystemname': 'SME_Generic_System_Name',
-                'smecalibrationtype': 'SME_Calibration_Type',
-                'feature': 'Feature',
-                'serviceinformationhyperlink': 'Service_Information_Hyperlink',
-                'calibrationprerequisites': 'Calibration_Pre_Requisites'
-            }
-            
-            # Log normalized column names for debugging
-            logging.info(f"Normalized DataFrame columns: {df.columns.tolist()}")
-            
-            # Prepare data for insertion
-            records = []
-            for _, row in df.iterrows():
-                record = {}
-                for normalized_col, db_col in column_mapping.items():
-                    # Since columns are already normalized, do exact match
-                    if normalized_col in df.columns:
-                        value = row[normalized_col]
-                        if pd.isna(value):
-                            record[db_col] = ''  # Use empty string for consistency
-                        else:
-                            record[db_col] = str(value).strip()
-                    else:
-                        record[db_col] = ''
-                        logging.warning(f"Column '{normalized_col}' not found in DataFrame")
-                
-                records.append(record)
-            
-            # Log first record for debugging
-            if records:
-                logging.info(f"First CMC record to insert: {records[0]}")
-            
-            # Insert data
-            if records:
-                placeholders = ', '.join(['?' for _ in column_mapping.values()])
-                columns = ', '.join(column_mapping.values())
-                cursor.executemany(
-                    f"INSERT INTO manufacturer_chart ({columns}) VALUES ({placeholders})",
-                    [tuple(record.values()) for record in records]
-                )
-                
-                conn.commit()
-                conn.close()
-                logging.info(f"Successfully inserted {len(records)} CMC records")
-                return "Data loaded successfully"
-            else:
-                conn.close()
-                return "No valid records found"
-                
-        except Exception as e:
-            logging.error(f"Error loading manufacturer chart data: {str(e)}")
-            return f"Error: {str(e)}"
+    def finish_manage_lists(self, report):
+        """Report the outcome of Manage Lists' Save & Load and reload the data views"""
+        if report:
+            logging.info(f"Imported {len(report['files'])} workbooks with {report['workers']} workers in {report['seconds']}s")
+            self.show_import_failures(report)
+        self.load_configurations()
+        self.populate_dropdowns()
+        self.check_data_loaded()
+        msg = self.create_styled_messagebox("Success", "Paths saved and data loaded successfully!", QMessageBox.Information)
+        msg.exec_()
+
+    def show_import_failures(self, report):
+        failures = [f"{os.path.basename(entry['file'])}: {entry['error']}" for entry in report['files']
+                    if entry['error'] and entry['config_type'] != 'CarSys']
+        if failures:
+            QMessageBox.critical(self, "Load Error", "Failed to load:\n" + "\n".join(failures))
+
+    def start_import(self, jobs, incremental=False, workers=None, streaming=None, save_paths=False, on_finished=None,
+                     held_back=None):
+        """Run an import in the background so the window stays usable.
+
+        ``on_finished`` is called with the import report once it has been
+        committed. ``held_back`` lists the workbooks left out of the jobs
+        whose rows are kept (see run_import). Returns False if another import
+        is still running.
+        """
+        if self.import_job is not None and self.import_job.isRunning():
+            QMessageBox.information(self, "Import Running", "An import is already running. Please wait for it to finish or cancel it.")
+            return False
+        self.import_job = ImportJob(jobs, self.db_path, workers, incremental, streaming, save_paths, held_back, self)
+        self.import_job.progress.connect(self.update_import_progress)
+        self.import_job.finished_report.connect(lambda report: self.import_finished(report, on_finished))
+        self.import_job.failed.connect(self.import_failed)
+        self.import_started = time.perf_counter()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%p%")
+        self.progress_bar.setVisible(True)
+        self.cancel_import_button.setEnabled(True)
+        self.cancel_import_button.setVisible(True)
+        self.status_bar.showMessage("Import started...")
+        self.import_job.start()
+        return True
+
+    def cancel_import(self):
+        if self.import_job is not None and self.import_job.isRunning():
+            self.log_action(self.current_user, "Cancelled import")
+            self.import_job.cancel()
+            self.cancel_import_button.setEnabled(False)
+            self.status_bar.showMessage("Cancelling import...")
+
+    def update_import_progress(self, progress):
+        """Update the progress bar and ETA while workbooks are imported"""
+        if progress['bytes_total']:
+            self.progress_bar.setValue(int(1000 * progress['bytes_done'] / progress['bytes_total']))
+        eta = ""
+        if progress['bytes_done']:
+            elapsed = time.perf_counter() - self.import_started
+            remaining = elapsed * (progress['bytes_total'] - progress['bytes_done']) / progress['bytes_done']
+            eta = f" - ETA {int(remaining) // 60}:{int(remaining) % 60:02d}"
+            self.progress_bar.setFormat(f"%p%{eta}")
+        current = os.path.basename(progress['file']) if progress['file'] else ""
+        self.status_bar.showMessage(f"Importing {current} ({progress['files_done']}/{progress['files_total']} files, "
+                                    f"{progress['rows']:,} rows){eta}")
+
+    def import_finished(self, report, on_finished=None):
+        self.progress_bar.setVisible(False)
+        self.cancel_import_button.setVisible(False)
+        if self.pending_auto_import:
+            # Changes seen by the watcher while this import ran
+            QTimer.singleShot(0, lambda: self.auto_import([]))
+        # Only the makes whose chart rows were replaced are read again
+        if 'manufacturer_chart' in report.get('changed_makes', {}):
+            self.invalidate_chart_cache(report['changed_makes']['manufacturer_chart'])
+        if report['cancelled']:
+            self.status_bar.showMessage("Import cancelled; no changes were made. The next import resumes where it stopped")
+            return
+        self.status_bar.showMessage(f"Import finished in {report['seconds']}s")
+        if on_finished:
+            on_finished(report)
+
+    def offer_resume_import(self):
+        """Offer to finish an import that was cancelled or cut short when the app last ran"""
+        jobs, incremental = interrupted_imports(self.db_path)
+        if not jobs:
+            return
+        names = ", ".join(config_type for config_type, _, _ in jobs)
+        reply = QMessageBox.question(self, "Resume Import",
+                                     f"An import of {names} did not finish. Resume it from where it stopped?",
+                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+        if reply == QMessageBox.Yes:
+            self.log_action(self.current_user, "Resumed interrupted import")
+            self.start_import(jobs, incremental=incremental, on_finished=self.finish_resumed_import)
+        else:
+            with write_connection(self.db_path) as conn:
+                for config_type, _, _ in jobs:
+                    discard_interrupted_imports(conn.cursor(), config_type)
+
+    def finish_resumed_import(self, report):
+        """Reload the data views once an interrupted import has been finished"""
+        logging.info(f"Resumed import of {', '.join(report['resumed'])} finished in {report['seconds']}s")
+        self.show_import_failures(report)
+        self.load_configurations()
+        self.populate_dropdowns()
+        self.check_data_loaded()
+
+    def is_watching_enabled(self):
+        return str(load_setting_from_db('watch_folders', '0', self.db_path)) == '1'
+
+    def update_folder_watcher(self):
+        """Start or stop the folder watcher to match the watch_folders setting"""
+        if self.is_watching_enabled():
+            if self.folder_watcher is None:
+                self.folder_watcher = FolderWatcher(self.watched_folders_changed.emit, self.db_path)
+                self.folder_watcher.start()
+        elif self.folder_watcher is not None:
+            self.folder_watcher.stop()
+            self.folder_watcher = None
+
+    def auto_import(self, config_types):
+        """Incrementally import the configurations whose folders changed.
+
+        Changes that arrive while another import runs are queued and imported
+        once it finishes.
+        """
+        self.pending_auto_import.update(config_types)
+        if not self.pending_auto_import or (self.import_job is not None and self.import_job.isRunning()):
+            return
+        jobs, _ = build_import_jobs(load_saved_paths(self.db_path), self.pending_auto_import)
+        self.pending_auto_import = set()
+        if jobs:
+            self.start_import(jobs, incremental=True, on_finished=self.finish_auto_import)
+
+    def finish_auto_import(self, report):
+        """Reload the data views after a watcher-triggered import, without interrupting the user"""
+        changed = len(report['files'])
+        failed = [os.path.basename(entry['file']) for entry in report['files'] if entry['error']]
+        logging.info(f"Auto-imported {changed} changed workbooks ({len(report['removed'])} removed) "
+                     f"in {report['seconds']}s")
+        if not changed and not report['removed']:
+            return
+        message = f"Imported {changed} changed workbooks"
+        if failed:
+            message += f"; failed: {', '.join(failed)}"
+        self.status_bar.showMessage(message)
+        self.load_configurations()
+        self.populate_dropdowns()
+        self.check_data_loaded()
+
+    def import_failed(self, error):
+        self.progress_bar.setVisible(False)
+        self.cancel_import_button.setVisible(False)
+        self.status_bar.clearMessage()
+        QMessageBox.critical(self, "Error", f"Failed to load data: {error}")
 
     def load_configurations(self):
         import logging
         logging.debug("Loading configurations...")
-        for config_type in ['blacklist', 'goldlist', 'prequal', 'mag_glass', 'carsys']:
+        # Prequal data is queried from the database as it is needed
+        for config_type in ['blacklist', 'goldlist', 'mag_glass', 'carsys']:
             data = load_configuration(config_type, self.db_path)
             self.data[config_type] = data if data else []
             logging.debug(f"Loaded {len(data)} items for {config_type}")
-        # Debug: print first few prequal items and their types
-        prequal_sample = self.data['prequal'][:3]
-        logging.debug(f"Sample prequal data: {prequal_sample}")
-        for i, item in enumerate(prequal_sample):
-            logging.debug(f"prequal[{i}] type: {type(item)}")
-        if 'prequal' in self.data:
-            self.populate_dropdowns()
+        self.populate_dropdowns()
         self.check_data_loaded()
 
     def check_data_loaded(self):
-        if not self.data['prequal']:
+        if not get_prequal_years(self.db_path):
             self.make_dropdown.setDisabled(True)
             self.model_dropdown.setDisabled(True)
             self.year_dropdown.setDisabled(True)
@@ -4989,23 +3999,19 @@ class ModernAnalyzerApp(ModernMainWindow):
     def populate_dropdowns(self):
         """Populate dropdowns with data from both prequal and manufacturer chart"""
         # Get data from both sources
-        prequal_years = []
-        prequal_makes = []
         manufacturer_years = []
         manufacturer_makes = []
         
-        # Get prequal data if available
-        if self.data['prequal']:
-            prequal_years = get_unique_years(self.data['prequal'])
-            prequal_makes = get_unique_makes(self.data['prequal'])
-            logging.debug(f"Prequal - Found years: {prequal_years}")
-            logging.debug(f"Prequal - Found makes: {prequal_makes}")
+        # Get prequal data
+        prequal_years = get_prequal_years(self.db_path)
+        prequal_makes = get_prequal_makes(self.db_path)
+        logging.debug(f"Prequal - Found years: {prequal_years}")
+        logging.debug(f"Prequal - Found makes: {prequal_makes}")
         
         # Get manufacturer chart data if available
         try:
-            from database_utils import get_unique_years_from_manufacturer_chart, get_unique_makes_from_manufacturer_chart
-            manufacturer_years = get_unique_years_from_manufacturer_chart(self.db_path)
-            manufacturer_makes = get_unique_makes_from_manufacturer_chart(self.db_path)
+            manufacturer_years = get_chart_years(self.db_path)
+            manufacturer_makes = get_chart_makes(db_path=self.db_path)
             logging.debug(f"Manufacturer Chart - Found years: {manufacturer_years}")
             logging.debug(f"Manufacturer Chart - Found makes: {manufacturer_makes}")
         except Exception as e:
@@ -5016,7 +4022,7 @@ class ModernAnalyzerApp(ModernMainWindow):
         all_makes = list(set(prequal_makes + manufacturer_makes))
         
         # Sort years in descending order (newest first)
-        # Handle float years like '2017.0' by converting to int first
+        # Years that aren't numbers sort last
         def year_sort_key(year_str):
             try:
                 return int(float(year_str))
@@ -5047,62 +4053,16 @@ class ModernAnalyzerApp(ModernMainWindow):
         self.model_dropdown.clear()
         self.model_dropdown.addItem("Select Model")
 
-    def has_valid_prequal(self, item):
-        """Check if an item has valid prequal data"""
-        if not isinstance(item, dict):
-            return False
-            
-        # Check required fields
-        required_fields = ['Year', 'Make', 'Model']
-        for field in required_fields:
-            if field not in item or not item[field] or str(item[field]).lower() == 'nan':
-                return False
-                
-        # Check if year is valid
-        try:
-            year = int(float(item['Year']))
-            if year < 1900 or year > 2100:  # Reasonable year range
-                return False
-        except (ValueError, TypeError):
-            return False
-            
-        # Check if make and model are valid strings
-        if not isinstance(item['Make'], str) or not item['Make'].strip():
-            return False
-        if not isinstance(item['Model'], str) or not item['Model'].strip():
-            return False
-            
-        # Check if make is not unknown
-        if item['Make'].lower() in ['unknown', 'nan']:
-            return False
-            
-        return True
-
     def search_blacklist_dtc(self, dtc_code, selected_make):
         """Search blacklist DTC codes"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Check if table exists
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='blacklist'")
-            if not cursor.fetchone():
+            if not dtc_list_exists('blacklist', self.db_path):
                 self.blacklist_panel_widget.setPlainText("No blacklist data found. Please load data first.")
                 return
             
-            # Query blacklist data with DTC code search
-            if selected_make == "All":
-                query = f"""
-                SELECT 'blacklist' as Source, dtcCode, genericSystemName, dtcDescription, dtcSys, carMake, comments FROM blacklist
-                WHERE dtcCode LIKE '%{dtc_code}%' OR dtcDescription LIKE '%{dtc_code}%'
-                """
-            else:
-                query = f"""
-                SELECT 'blacklist' as Source, dtcCode, genericSystemName, dtcDescription, dtcSys, carMake, comments FROM blacklist
-                WHERE (dtcCode LIKE '%{dtc_code}%' OR dtcDescription LIKE '%{dtc_code}%') AND carMake = '{selected_make}'
-                """
-            
-            df = pd.read_sql_query(query, conn)
+            # Search the blacklist's full-text index, best matches first
+            df = search_dtc('blacklist', dtc_code, None if selected_make == "All" else selected_make, self.db_path)
             if not df.empty:
                 html_table = df.to_html(index=False, escape=False, classes='table table-striped')
                 if getattr(self, 'current_theme', 'Light') == 'Dark':
@@ -5178,37 +4138,19 @@ class ModernAnalyzerApp(ModernMainWindow):
             else:
                 self.blacklist_panel_widget.setPlainText(f"No blacklist results found for DTC code: {dtc_code}")
         except Exception as e:
-            logging.error(f"Failed to execute blacklist search query: {query}\nError: {e}")
+            logging.error(f"Failed to search blacklist for {dtc_code!r}: {e}")
             self.blacklist_panel_widget.setPlainText(f"An error occurred while searching blacklist data: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
 
     def search_goldlist_dtc(self, dtc_code, selected_make):
         """Search goldlist DTC codes"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Check if table exists
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='goldlist'")
-            if not cursor.fetchone():
+            if not dtc_list_exists('goldlist', self.db_path):
                 self.goldlist_panel_widget.setPlainText("No goldlist data found. Please load data first.")
                 return
             
-            # Query goldlist data with DTC code search
-            if selected_make == "All":
-                query = f"""
-                SELECT 'goldlist' as Source, dtcCode, genericSystemName, dtcDescription, dtcSys, carMake, comments FROM goldlist
-                WHERE dtcCode LIKE '%{dtc_code}%' OR dtcDescription LIKE '%{dtc_code}%'
-                """
-            else:
-                query = f"""
-                SELECT 'goldlist' as Source, dtcCode, genericSystemName, dtcDescription, dtcSys, carMake, comments FROM goldlist
-                WHERE (dtcCode LIKE '%{dtc_code}%' OR dtcDescription LIKE '%{dtc_code}%') AND carMake = '{selected_make}'
-                """
-            
-            df = pd.read_sql_query(query, conn)
+            # Search the goldlist's full-text index, best matches first
+            df = search_dtc('goldlist', dtc_code, None if selected_make == "All" else selected_make, self.db_path)
             if not df.empty:
                 html_table = df.to_html(index=False, escape=False, classes='table table-striped')
                 if getattr(self, 'current_theme', 'Light') == 'Dark':
@@ -5284,35 +4226,18 @@ class ModernAnalyzerApp(ModernMainWindow):
             else:
                 self.goldlist_panel_widget.setPlainText(f"No goldlist results found for DTC code: {dtc_code}")
         except Exception as e:
-            logging.error(f"Failed to execute goldlist search query: {query}\nError: {e}")
+            logging.error(f"Failed to search goldlist for {dtc_code!r}: {e}")
             self.goldlist_panel_widget.setPlainText(f"An error occurred while searching goldlist data: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
 
     def display_blacklist(self, selected_make):
         """Display blacklist data"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Check if table exists
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='blacklist'")
-            if not cursor.fetchone():
+            if not dtc_list_exists('blacklist', self.db_path):
                 self.blacklist_panel_widget.setPlainText("No blacklist data found. Please load data first.")
                 return
             
-            # Query blacklist data - use correct column names from schema
-            if selected_make == "All":
-                query = """
-                SELECT 'blacklist' as Source, dtcCode, genericSystemName, dtcDescription, dtcSys, carMake, comments FROM blacklist
-                """
-            else:
-                query = f"""
-                SELECT 'blacklist' as Source, dtcCode, genericSystemName, dtcDescription, dtcSys, carMake, comments FROM blacklist WHERE carMake = '{selected_make}'
-                """
-            
-            df = pd.read_sql_query(query, conn)
+            df = get_dtc_rows('blacklist', None if selected_make == "All" else selected_make, self.db_path)
             if not df.empty:
                 html_table = df.to_html(index=False, escape=False, classes='table table-striped')
                 if getattr(self, 'current_theme', 'Light') == 'Dark':
@@ -5388,35 +4313,18 @@ class ModernAnalyzerApp(ModernMainWindow):
             else:
                 self.blacklist_panel_widget.setPlainText(f"No blacklist results found for make: {selected_make}")
         except Exception as e:
-            logging.error(f"Failed to execute blacklist query: {query}\nError: {e}")
+            logging.error(f"Failed to load blacklist data for {selected_make!r}: {e}")
             self.blacklist_panel_widget.setPlainText(f"An error occurred while fetching blacklist data: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
 
     def display_goldlist(self, selected_make):
         """Display goldlist data"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Check if table exists
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='goldlist'")
-            if not cursor.fetchone():
+            if not dtc_list_exists('goldlist', self.db_path):
                 self.goldlist_panel_widget.setPlainText("No goldlist data found. Please load data first.")
                 return
             
-            # Query goldlist data - use correct column names from schema
-            if selected_make == "All":
-                query = """
-                SELECT 'goldlist' as Source, dtcCode, genericSystemName, dtcDescription, dtcSys, carMake, comments FROM goldlist
-                """
-            else:
-                query = f"""
-                SELECT 'goldlist' as Source, dtcCode, genericSystemName, dtcDescription, dtcSys, carMake, comments FROM goldlist WHERE carMake = '{selected_make}'
-                """
-            
-            df = pd.read_sql_query(query, conn)
+            df = get_dtc_rows('goldlist', None if selected_make == "All" else selected_make, self.db_path)
             if not df.empty:
                 html_table = df.to_html(index=False, escape=False, classes='table table-striped')
                 if getattr(self, 'current_theme', 'Light') == 'Dark':
@@ -5492,38 +4400,18 @@ class ModernAnalyzerApp(ModernMainWindow):
             else:
                 self.goldlist_panel_widget.setPlainText(f"No goldlist results found for make: {selected_make}")
         except Exception as e:
-            logging.error(f"Failed to execute goldlist query: {query}\nError: {e}")
+            logging.error(f"Failed to load goldlist data for {selected_make!r}: {e}")
             self.goldlist_panel_widget.setPlainText(f"An error occurred while fetching goldlist data: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
 
     def display_mag_glass(self, selected_make):
         """Display Mag Glass data"""
         try:
-            conn = self.get_db_connection()
-            
             # Check if table exists
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='mag_glass'")
-            if not cursor.fetchone():
+            if not mag_glass_exists(self.db_path):
                 self.mag_glass_panel_widget.setPlainText("No Mag Glass data found. Please load data first.")
                 return
             
-            # Prepare the query based on the selected make - use correct quoted column names
-            if selected_make == "All":
-                query = """
-                SELECT "Generic System Name", "ADAS Module Name", "Car Make", "Manufacturer", "AUTEL or BOSCH"
-                FROM mag_glass
-                """
-                df = pd.read_sql_query(query, conn)
-            else:
-                query = """
-                SELECT "Generic System Name", "ADAS Module Name", "Car Make", "Manufacturer", "AUTEL or BOSCH"
-                FROM mag_glass
-                WHERE "Car Make" = ?
-                """
-                df = pd.read_sql_query(query, conn, params=(selected_make,))
+            df = get_mag_glass_rows(None if selected_make == "All" else selected_make, self.db_path)
             
             if not df.empty:
                 html_table = df.to_html(index=False, escape=False, classes='table table-striped')
@@ -5600,11 +4488,8 @@ class ModernAnalyzerApp(ModernMainWindow):
             else:
                 self.mag_glass_panel_widget.setPlainText(f"No Mag Glass results found for make: {selected_make}")
         except Exception as e:
-            logging.error(f"Failed to execute query: {query}\nError: {e}")
+            logging.error(f"Failed to load Mag Glass data for {selected_make!r}: {e}")
             self.mag_glass_panel_widget.setPlainText(f"An error occurred while fetching the data: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
 
 
 
@@ -5678,15 +4563,7 @@ class ModernAnalyzerApp(ModernMainWindow):
     def update_years_for_locked_model(self, locked_model):
         """Update year dropdown to only years that contain the locked model."""
         try:
-            valid_years = set()
-            for item in self.data['prequal']:
-                try:
-                    if (self.has_valid_prequal(item) and 'Model' in item and 'Year' in item and 
-                        pd.notna(item.get('Year')) and str(item.get('Model', '')).strip() == str(locked_model).strip()):
-                        valid_years.add(int(float(item['Year'])))
-                except (ValueError, TypeError, KeyError):
-                    continue
-            valid_years = sorted(valid_years, reverse=True)
+            valid_years = get_prequal_years(self.db_path, model=locked_model)
 
             # Only rebuild if year isn't locked
             if not self.year_locked:
@@ -5708,16 +4585,7 @@ class ModernAnalyzerApp(ModernMainWindow):
     def update_makes_for_locked_model(self, locked_model):
         """Update make dropdown to only makes that contain the locked model."""
         try:
-            valid_makes = set()
-            for item in self.data['prequal']:
-                    try:
-                        if (self.has_valid_prequal(item) and 'Model' in item and 'Make' in item and 
-                        str(item.get('Model', '')).strip() == str(locked_model).strip() and 
-                        item.get('Make', '').strip() and item.get('Make', '').strip().lower() != 'unknown'):
-                            valid_makes.add(item['Make'].strip())
-                    except (ValueError, TypeError, KeyError):
-                        continue
-            valid_makes = sorted(valid_makes)
+            valid_makes = get_prequal_makes(self.db_path, model=locked_model)
 
             # Only rebuild if make isn't locked
             if not self.make_locked:
@@ -5741,16 +4609,7 @@ class ModernAnalyzerApp(ModernMainWindow):
         """Update makes dropdown to only makes available for the locked year."""
         try:
             year_int = int(locked_year)
-            valid_makes = set()
-            for item in self.data['prequal']:
-                try:
-                    if (self.has_valid_prequal(item) and 'Year' in item and 'Make' in item and 
-                        pd.notna(item.get('Year')) and int(float(item['Year'])) == year_int and
-                        item.get('Make', '').strip() and item.get('Make', '').strip().lower() != 'unknown'):
-                        valid_makes.add(item['Make'].strip())
-                except (ValueError, TypeError, KeyError):
-                        continue
-            valid_makes = sorted(valid_makes)
+            valid_makes = get_prequal_makes(self.db_path, year=year_int)
 
             # Only rebuild if make isn't locked
             if not self.make_locked:
@@ -5774,15 +4633,7 @@ class ModernAnalyzerApp(ModernMainWindow):
         """Update models dropdown to only models available for the locked year."""
         try:
             year_int = int(locked_year)
-            valid_models = set()
-            for item in self.data['prequal']:
-                try:
-                    if (self.has_valid_prequal(item) and 'Year' in item and 'Model' in item and 
-                        pd.notna(item.get('Year')) and int(float(item['Year'])) == year_int):
-                        valid_models.add(str(item['Model']))
-                except (ValueError, TypeError, KeyError):
-                    continue
-            valid_models = sorted(valid_models)
+            valid_models = get_prequal_models(year_int, db_path=self.db_path)
 
             # Only rebuild if model isn't locked
             if not self.model_locked:
@@ -5804,15 +4655,7 @@ class ModernAnalyzerApp(ModernMainWindow):
     def update_years_for_locked_make(self, locked_make):
         """Update year dropdown to only years available for the locked make."""
         try:
-            valid_years = set()
-            for item in self.data['prequal']:
-                try:
-                    if (self.has_valid_prequal(item) and 'Make' in item and 'Year' in item and 
-                        pd.notna(item.get('Year')) and str(item.get('Make', '')).strip() == str(locked_make).strip()):
-                        valid_years.add(int(float(item['Year'])))
-                except (ValueError, TypeError, KeyError):
-                    continue
-            valid_years = sorted(valid_years, reverse=True)
+            valid_years = get_prequal_years(self.db_path, make=locked_make)
 
             # Only rebuild if year isn't locked
             if not self.year_locked:
@@ -5834,15 +4677,7 @@ class ModernAnalyzerApp(ModernMainWindow):
     def update_models_for_locked_make(self, locked_make):
         """Update models dropdown to only models available for the locked make."""
         try:
-            valid_models = set()
-            for item in self.data['prequal']:
-                try:
-                    if (self.has_valid_prequal(item) and 'Make' in item and 'Model' in item and 
-                        str(item.get('Make', '')).strip() == str(locked_make).strip()):
-                        valid_models.add(str(item['Model']))
-                except (ValueError, TypeError, KeyError):
-                    continue
-            valid_models = sorted(valid_models)
+            valid_models = get_prequal_models(make=locked_make, db_path=self.db_path)
 
             # Only rebuild if model isn't locked
             if not self.model_locked:
@@ -5864,45 +4699,25 @@ class ModernAnalyzerApp(ModernMainWindow):
     def update_years_based_on_selections(self, make_to_use, model_to_use):
         """Update year dropdown to show only years that match current make and model selections."""
         try:
+            make = make_to_use.strip() if make_to_use not in ["Select Make", "All", ""] else None
+            model = model_to_use if model_to_use not in ["Select Model", ""] else None
             valid_years = set()
-            for item in self.data['prequal']:
-                try:
-                    if not self.has_valid_prequal(item) or pd.isna(item.get('Year')):
-                        continue
-                    
-                    # Check if this item matches our current selections
-                    make_matches = (make_to_use in ["Select Make", "All", ""] or 
-                                  str(item.get('Make', '')).strip() == str(make_to_use).strip())
-                    model_matches = (model_to_use in ["Select Model", ""] or 
-                                   str(item.get('Model', '')).strip() == str(model_to_use).strip())
-                    
-                    if make_matches and model_matches:
-                        # Apply region filtering - only include years for makes in current region
-                        make = item.get('Make', '').strip()
-                        if self.is_make_in_current_region(make):
-                            valid_years.add(int(float(item['Year'])))
-                except (ValueError, TypeError, KeyError):
-                    continue
+            # Apply region filtering - only include years for makes in current region
+            for prequal_make in self.prequal_region_makes(make, model=model):
+                valid_years.update(int(year) for year in get_prequal_years(self.db_path, prequal_make, model))
             
             # Get years from manufacturer chart data
             try:
                 if make_to_use not in ["Select Make", "All", ""]:
-                    # Get all years for the selected make from manufacturer chart
-                    conn = sqlite3.connect(self.db_path)
-                    cursor = conn.cursor()
+                    # Get all years for the selected make (and model, if selected) from the cached chart rows
+                    chart = self.get_chart_rows(make_to_use)
                     if model_to_use not in ["Select Model", ""]:
-                        # If model is selected, get years for that specific make and model
-                        cursor.execute("SELECT DISTINCT Year FROM manufacturer_chart WHERE Make = ? AND Model = ? AND Year IS NOT NULL AND Year != '' ORDER BY Year DESC", (make_to_use, model_to_use))
-                    else:
-                        # If only make is selected, get all years for that make
-                        cursor.execute("SELECT DISTINCT Year FROM manufacturer_chart WHERE Make = ? AND Year IS NOT NULL AND Year != '' ORDER BY Year DESC", (make_to_use,))
-                    
-                    manufacturer_years = cursor.fetchall()
-                    conn.close()
-                    
-                    for year_row in manufacturer_years:
+                        chart = chart[chart['Model'] == model_to_use]
+                    manufacturer_years = chart['Year'].dropna().unique()
+
+                    for year_value in manufacturer_years:
                         try:
-                            year_str = str(year_row[0])
+                            year_str = str(year_value)
                             year_int = int(float(year_str))
                             valid_years.add(year_int)
                         except (ValueError, TypeError):
@@ -5935,54 +4750,25 @@ class ModernAnalyzerApp(ModernMainWindow):
     def update_makes_based_on_selections(self, year_to_use, model_to_use):
         """Update make dropdown to show only makes that match current year and model selections."""
         try:
-            valid_makes = set()
-            for item in self.data['prequal']:
-                try:
-                    if not self.has_valid_prequal(item):
-                        continue
-                    
-                    # Check if this item matches our current selections
-                    # Normalize year comparison to handle float values (e.g., 2024.0 vs 2024)
-                    year_matches = year_to_use in ["Select Year", ""]
-                    if not year_matches and 'Year' in item and pd.notna(item['Year']):
-                        try:
-                            item_year = int(float(item['Year']))
-                            selected_year = int(year_to_use)
-                            year_matches = (item_year == selected_year)
-                        except (ValueError, TypeError):
-                            pass
-                    
-                    model_matches = (model_to_use in ["Select Model", ""] or 
-                                   str(item.get('Model', '')).strip() == str(model_to_use).strip())
-                    
-                    if year_matches and model_matches and 'Make' in item and item['Make'].strip():
-                        make = item['Make'].strip()
-                        # Apply region filtering
-                        if self.is_make_in_current_region(make):
-                            valid_makes.add(make)
-                except (ValueError, TypeError, KeyError):
-                    continue
+            year = year_to_use if year_to_use not in ["Select Year", ""] else None
+            model = model_to_use if model_to_use not in ["Select Model", ""] else None
+            # Apply region filtering
+            valid_makes = {make.strip() for make in get_prequal_makes(self.db_path, year, model)
+                           if self.is_make_in_current_region(make.strip())}
             
             # Get makes from manufacturer chart data
             try:
                 if year_to_use not in ["Select Year", ""]:
                     # Get all makes for the selected year from manufacturer chart
-                    # Convert year to float format for database comparison (e.g., "2021" -> "2021.0")
-                    year_float = f"{float(year_to_use)}"
-                    conn = sqlite3.connect(self.db_path)
-                    cursor = conn.cursor()
                     if model_to_use not in ["Select Model", ""]:
                         # If model is selected, get makes for that specific year and model
-                        cursor.execute("SELECT DISTINCT Make FROM manufacturer_chart WHERE Year = ? AND Model = ? AND Make IS NOT NULL AND Make != '' ORDER BY Make", (year_float, model_to_use))
+                        manufacturer_makes = get_chart_makes(year_to_use, model_to_use, self.db_path)
                     else:
                         # If only year is selected, get all makes for that year
-                        cursor.execute("SELECT DISTINCT Make FROM manufacturer_chart WHERE Year = ? AND Make IS NOT NULL AND Make != '' ORDER BY Make", (year_float,))
-                    
-                    manufacturer_makes = cursor.fetchall()
-                    conn.close()
+                        manufacturer_makes = get_chart_makes(year_to_use, db_path=self.db_path)
                     
-                    for make_row in manufacturer_makes:
-                        make = make_row[0].strip()
+                    for make in manufacturer_makes:
+                        make = make.strip()
                         if make and self.is_make_in_current_region(make):
                             valid_makes.add(make)
             except Exception as e:
@@ -6013,40 +4799,20 @@ class ModernAnalyzerApp(ModernMainWindow):
     def update_models_based_on_selections(self, year_to_use, make_to_use):
         """Update model dropdown to show only models that match current year and make selections."""
         try:
+            year = year_to_use if year_to_use not in ["Select Year", ""] else None
+            make = make_to_use.strip() if make_to_use not in ["Select Make", "All", ""] else None
             valid_models = set()
-            for item in self.data['prequal']:
-                try:
-                    if not self.has_valid_prequal(item):
-                        continue
-                    
-                    # Check if this item matches our current selections
-                    # Handle year comparison with proper type conversion
-                    try:
-                        item_year = int(float(item.get('Year', '')))
-                        selected_year = int(float(year_to_use)) if year_to_use not in ["Select Year", ""] else None
-                        year_matches = (selected_year is None or item_year == selected_year)
-                    except (ValueError, TypeError):
-                        year_matches = (year_to_use in ["Select Year", ""] or 
-                                      str(item.get('Year', '')).strip() == str(year_to_use).strip())
-                    
-                    make_matches = (make_to_use in ["Select Make", "All", ""] or 
-                                  str(item.get('Make', '')).strip() == str(make_to_use).strip())
-                    
-                    if year_matches and make_matches and 'Model' in item and item['Model'].strip():
-                        # Apply region filtering - only include models for makes in current region
-                        make = item.get('Make', '').strip()
-                        if self.is_make_in_current_region(make):
-                            valid_models.add(item['Model'].strip())
-                except (ValueError, TypeError, KeyError):
-                    continue
+            # Apply region filtering - only include models for makes in current region
+            for prequal_make in self.prequal_region_makes(make, year=year):
+                valid_models.update(model.strip() for model in get_prequal_models(year, prequal_make, self.db_path))
             
             # Get models from manufacturer chart data
             try:
-                from database_utils import get_unique_models_from_manufacturer_chart
                 if year_to_use not in ["Select Year", ""] and make_to_use not in ["Select Make", "All", ""]:
-                    manufacturer_models = get_unique_models_from_manufacturer_chart(year_to_use, make_to_use, self.db_path)
+                    chart = self.get_chart_rows(make_to_use)
+                    manufacturer_models = chart.loc[chart['Year'] == stored_year(year_to_use), 'Model'].dropna().unique()
                     for model in manufacturer_models:
-                        if model.strip():
+                        if str(model).strip():
                             valid_models.add(model.strip())
             except Exception as e:
                 logging.error(f"Error getting manufacturer chart models: {e}")
@@ -6132,6 +4898,15 @@ class ModernAnalyzerApp(ModernMainWindow):
             return True
         return make in self.region_makes.get(self.current_region, [])
 
+    def prequal_region_makes(self, make, year=None, model=None):
+        """The makes to look prequal values up for: the selected make if it is in the current
+        region, otherwise the region's prequal makes, with None standing for every make"""
+        if make:
+            return [make] if self.is_make_in_current_region(make) else []
+        if self.current_region == 'ALL':
+            return [None]
+        return [name for name in get_prequal_makes(self.db_path, year, model) if self.is_make_in_current_region(name)]
+
 class VehicleCompareDialog(ModernDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -6329,32 +5104,16 @@ class VehicleCompareDialog(ModernDialog):
         
     def populate_dropdowns(self):
         """Populate dropdowns with available data"""
-        if not hasattr(self.parent, 'data') or 'prequal' not in self.parent.data:
+        if not hasattr(self.parent, 'db_path'):
             return
-            
-        # Get unique years, makes, and models
-        years = set()
-        makes = set()
-        models = set()
-        
-        for item in self.parent.data['prequal']:
-            if self.parent.has_valid_prequal(item):
-                if 'Year' in item and pd.notna(item['Year']):
-                    years.add(int(float(item['Year'])))
-                if 'Make' in item and item['Make'].strip():
-                    makes.add(item['Make'].strip())
-                if 'Model' in item and item['Model'].strip():
-                    models.add(item['Model'].strip())
-        
+
         # Populate year dropdowns
-        sorted_years = sorted(years, reverse=True)
-        for year in sorted_years:
-            self.vehicle1_year.addItem(str(year))
-            self.vehicle2_year.addItem(str(year))
-        
+        for year in get_prequal_years(self.parent.db_path):
+            self.vehicle1_year.addItem(year)
+            self.vehicle2_year.addItem(year)
+
         # Populate make dropdowns
-        sorted_makes = sorted(makes)
-        for make in sorted_makes:
+        for make in get_prequal_makes(self.parent.db_path):
             self.vehicle1_make.addItem(make)
             self.vehicle2_make.addItem(make)
     
@@ -6381,15 +5140,7 @@ class VehicleCompareDialog(ModernDialog):
         self.vehicle1_model.addItem("Select Model")
         
         if year != "Select Year" and make != "Select Make":
-            models = set()
-            for item in self.parent.data['prequal']:
-                if (self.parent.has_valid_prequal(item) and 
-                    str(item.get('Year', '')).strip() == year and
-                    str(item.get('Make', '')).strip() == make and
-                    'Model' in item and item['Model'].strip()):
-                    models.add(item['Model'].strip())
-            
-            for model in sorted(models):
+            for model in get_prequal_models(year, make, self.parent.db_path):
                 self.vehicle1_model.addItem(model)
     
     def update_vehicle2_models(self):
@@ -6401,15 +5152,7 @@ class VehicleCompareDialog(ModernDialog):
         self.vehicle2_model.addItem("Select Model")
         
         if year != "Select Year" and make != "Select Make":
-            models = set()
-            for item in self.parent.data['prequal']:
-                if (self.parent.has_valid_prequal(item) and 
-                    str(item.get('Year', '')).strip() == year and
-                    str(item.get('Make', '')).strip() == make and
-                    'Model' in item and item['Model'].strip()):
-                    models.add(item['Model'].strip())
-            
-            for model in sorted(models):
+            for model in get_prequal_models(year, make, self.parent.db_path):
                 self.vehicle2_model.addItem(model)
     
     def compare_vehicles(self):
@@ -6448,46 +5191,23 @@ class VehicleCompareDialog(ModernDialog):
     
     def get_prequal_data(self, vehicle):
         """Get prequal data for a specific vehicle"""
-        data = []
-        for item in self.parent.data['prequal']:
-            if (self.parent.has_valid_prequal(item) and
-                str(item.get('Year', '')).strip() == vehicle['year'] and
-                str(item.get('Make', '')).strip() == vehicle['make'] and
-                str(item.get('Model', '')).strip() == vehicle['model']):
-                data.append(item)
-        return data
+        return query_prequal(vehicle['year'], vehicle['make'], vehicle['model'], self.parent.db_path)
     
     def get_blacklist_data(self, vehicle):
         """Get blacklist data for a specific vehicle"""
-        data = []
-        for item in self.parent.data['blacklist']:
-            if (str(item.get('Make', '')).strip() == vehicle['make']):
-                data.append(item)
-        return data
+        return get_dtc_rows('blacklist', vehicle['make'], self.parent.db_path).to_dict('records')
     
     def get_goldlist_data(self, vehicle):
         """Get goldlist data for a specific vehicle"""
-        data = []
-        for item in self.parent.data['goldlist']:
-            if (str(item.get('Make', '')).strip() == vehicle['make']):
-                data.append(item)
-        return data
+        return get_dtc_rows('goldlist', vehicle['make'], self.parent.db_path).to_dict('records')
     
     def get_mag_glass_data(self, vehicle):
         """Get mag glass data for a specific vehicle"""
-        data = []
-        for item in self.parent.data['mag_glass']:
-            if (str(item.get('Make', '')).strip() == vehicle['make']):
-                data.append(item)
-        return data
+        return get_mag_glass_rows(vehicle['make'], self.parent.db_path).to_dict('records')
     
     def get_carsys_data(self, vehicle):
         """Get carsys data for a specific vehicle"""
-        data = []
-        for item in self.parent.data['carsys']:
-            if (str(item.get('Make', '')).strip() == vehicle['make']):
-                data.append(item)
-        return data
+        return get_carsys_rows(vehicle['make'], self.parent.db_path).to_dict('records')
     
     def generate_comparison(self, vehicle1, vehicle2, vehicle1_data, vehicle2_data):
         """Generate HTML comparison between two vehicles"""
@@ -7005,6 +5725,8 @@ class VehicleCompareDialog(ModernDialog):
 # ... existing code ...
 
 if __name__ == '__main__':
+    # Required for the import worker processes in frozen Windows builds
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     
     # Set application properties
@@ -0,0 +1,19 @@
+from repository import fetch_one, execute
+
+QUERIES = {
+    'log': "INSERT INTO user_actions (user, action, timestamp) VALUES (?, ?, ?)",
+    'last_matching': "SELECT action FROM user_actions WHERE action LIKE ? ESCAPE '\\' "
+                     "ORDER BY timestamp DESC LIMIT 1",
+}
+
+
+def log_user_action(user, action, timestamp, db_path='data.db'):
+    """Record an action a user took"""
+    execute(QUERIES['log'], (user, action, timestamp), db_path)
+
+
+def get_last_action(prefix, db_path='data.db'):
+    """Get the most recent action starting with prefix, or None"""
+    pattern = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    row = fetch_one(QUERIES['last_matching'], (pattern,), db_path)
+    return row[0] if row else None
@@ -0,0 +1,19 @@
+from dataset_schemas import quoted_columns, make_column
+from repository import table_exists, fetch_frame
+
+QUERIES = {
+    'rows': f"SELECT {quoted_columns('carsys')} FROM carsys",
+    'rows_by_make': f"SELECT {quoted_columns('carsys')} FROM carsys WHERE {make_column('carsys')} = ?",
+}
+
+
+def carsys_exists(db_path='data.db'):
+    """Check whether the CarSys list has been loaded"""
+    return table_exists('carsys', db_path)
+
+
+def get_carsys_rows(make=None, db_path='data.db'):
+    """Get the CarSys rows, or one make's, as a DataFrame of the schema columns"""
+    if make is None:
+        return fetch_frame(QUERIES['rows'], (), db_path)
+    return fetch_frame(QUERIES['rows_by_make'], (make,), db_path)
@@ -0,0 +1,281 @@
+import json
+import sqlite3
+import logging
+
+from dataset_schemas import SCHEMAS, schema_columns, normalize_value
+from db_connections import read_connection
+
+# Generations of each configuration type whose changes are kept
+CHANGELOG_GENERATIONS = 20
+
+# Rows fetched per query when reading back the changed rows
+FETCH_BATCH = 500
+
+CHANGES = ('added', 'removed', 'modified')
+
+
+def initialize_changelog_tables(cursor):
+    """Create the tables recording what each import changed"""
+    # One row per published table: the counts of rows added, removed and modified
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS import_generations (
+            generation INTEGER PRIMARY KEY AUTOINCREMENT,
+            config_type TEXT,
+            published_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            row_count INTEGER,
+            added INTEGER,
+            removed INTEGER,
+            modified INTEGER,
+            makes TEXT,
+            detailed INTEGER
+        );
+    ''')
+    # The changed rows themselves, as JSON of the row before and after
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS import_changelog (
+            id INTEGER PRIMARY KEY,
+            generation INTEGER,
+            config_type TEXT,
+            change TEXT,
+            make TEXT,
+            vehicle TEXT,
+            old_data TEXT,
+            new_data TEXT
+        );
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_import_changelog_generation ON import_changelog (generation, make)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_import_changelog_make ON import_changelog (config_type, make)')
+
+
+def _table_columns(cursor, table_name):
+    cursor.execute(f"PRAGMA table_info({table_name})")
+    return [row[1] for row in cursor.fetchall()]
+
+
+def _read_records(cursor, table_name, dataset, source_files=None, ids=None):
+    """Yield ``(id, record)`` for the rows of a table.
+
+    Rows can be limited to those of some source workbooks or to given ids.
+    The columns a dataset keeps as JSON are merged into the record.
+    """
+    columns = _table_columns(cursor, table_name)
+    names = [column for column in schema_columns(dataset) if column in columns]
+    extra_column = SCHEMAS[dataset].get('extra_column')
+    if extra_column not in columns:
+        extra_column = None
+    selected = ', '.join(['id'] + [f'"{column}"' for column in names] + ([extra_column] if extra_column else []))
+    if ids is not None:
+        batches = [ids[start:start + FETCH_BATCH] for start in range(0, len(ids), FETCH_BATCH)]
+        filters = [(f"WHERE id IN ({', '.join('?' for _ in batch)})", batch) for batch in batches]
+    elif source_files is not None:
+        source_files = list(source_files)
+        filters = [(f"WHERE source_file IN ({', '.join('?' for _ in source_files)})", source_files)]
+    else:
+        filters = [('', [])]
+    reader = cursor.connection.cursor()
+    for where, params in filters:
+        reader.execute(f"SELECT {selected} FROM {table_name} {where}", params)
+        for row in reader:
+            record = dict(zip(names, row[1:len(names) + 1]))
+            if extra_column and row[-1]:
+                record.update(json.loads(row[-1]))
+            yield row[0], record
+
+
+def _fetch_records(cursor, table_name, dataset, ids):
+    """Read back the records of the given row ids"""
+    return dict(_read_records(cursor, table_name, dataset, ids=sorted(set(ids))))
+
+
+def _signature(record):
+    return tuple(sorted((str(key).strip(), normalize_value(value)) for key, value in record.items()))
+
+
+def diff_tables(cursor, dataset, old_table, new_table, old_sources=None):
+    """Match the rows of a staged table against the rows they replace.
+
+    Rows are compared by their normalized values. A row of the new table
+    with an identical old row is unchanged; the rest are paired up with the
+    old rows sharing their diff key (see dataset_schemas) as modified rows,
+    and the remainder are added or removed. Only the old table is held in
+    memory, as normalized values bucketed by diff key and then by
+    signature, so each new row is matched in constant time and the diff is
+    linear in the row counts. ``old_sources`` limits the old rows to those
+    workbooks (for a partitioned refresh). Returns ``(changes, old_count,
+    new_count)`` where ``changes`` lists ``(change, old_id, new_id)``.
+    """
+    key_columns = SCHEMAS[dataset].get('diff_key') or schema_columns(dataset)
+
+    def key_of(record):
+        return tuple(normalize_value(record.get(column)) for column in key_columns)
+
+    # diff key -> signature -> ids of the old rows with those values
+    old_rows = {}
+    old_count = 0
+    for row_id, record in _read_records(cursor, old_table, dataset, source_files=old_sources):
+        old_rows.setdefault(key_of(record), {}).setdefault(_signature(record), []).append(row_id)
+        old_count += 1
+
+    unmatched = {}
+    new_count = 0
+    for row_id, record in _read_records(cursor, new_table, dataset):
+        new_count += 1
+        key = key_of(record)
+        signature = _signature(record)
+        versions = old_rows.get(key)
+        same = versions.get(signature) if versions else None
+        if same:
+            same.pop()
+            if not same:
+                del versions[signature]
+        else:
+            unmatched.setdefault(key, []).append(row_id)
+
+    changes = []
+    for key, row_ids in unmatched.items():
+        # The key's remaining old rows, in table order, pair up with its new rows
+        versions = sorted(old_id for ids in old_rows.pop(key, {}).values() for old_id in ids)
+        for position, row_id in enumerate(row_ids):
+            if position < len(versions):
+                changes.append(('modified', versions[position], row_id))
+            else:
+                changes.append(('added', None, row_id))
+        changes.extend(('removed', old_id, None) for old_id in versions[len(row_ids):])
+    for versions in old_rows.values():
+        changes.extend(('removed', old_id, None) for ids in versions.values() for old_id in ids)
+    return changes, old_count, new_count
+
+
+def _vehicle(record, dataset):
+    schema = SCHEMAS[dataset]
+    year_column = schema.get('year_column')
+    if not year_column:
+        return None
+    year = normalize_value(record.get(year_column))
+    try:
+        year = int(float(year))
+    except (TypeError, ValueError):
+        pass
+    parts = [year, record.get(schema['make_column']), record.get('Model')]
+    return ' '.join(str(part).strip() for part in parts if part not in (None, ''))
+
+
+def log_changes(cursor, config_type, dataset, old_table, new_table, old_sources=None):
+    """Diff a staged table against the live rows it replaces and record the result as a new generation.
+
+    Run inside the transaction that publishes the staged table. The first
+    load of a table records only its row count. Returns a summary with the
+    generation, the counts of rows added, removed and modified and the makes
+    they belong to (None after a first load, when every make is new).
+    """
+    changes, old_count, new_count = diff_tables(cursor, dataset, old_table, new_table, old_sources)
+    row_count = new_count
+    if old_sources is not None:
+        # Only some workbooks' rows are replaced; the rest of the table stays
+        cursor.execute(f"SELECT COUNT(*) FROM {old_table}")
+        row_count += cursor.fetchone()[0] - old_count
+    counts = {change: 0 for change in CHANGES}
+    for change, _, _ in changes:
+        counts[change] += 1
+    detailed = bool(old_count) or old_sources is not None
+    makes = None
+    rows = []
+    if detailed:
+        old_records = _fetch_records(cursor, old_table, dataset, [old for _, old, _ in changes if old is not None])
+        new_records = _fetch_records(cursor, new_table, dataset, [new for _, _, new in changes if new is not None])
+        make_column = SCHEMAS[dataset]['make_column']
+        makes = set()
+        for change, old_id, new_id in changes:
+            old_record = old_records.get(old_id)
+            new_record = new_records.get(new_id)
+            record = new_record or old_record or {}
+            make = normalize_value(record.get(make_column))
+            if make is not None:
+                makes.add(str(make))
+            # A modified row can move to another make, which changes as well
+            if old_record and new_record and normalize_value(old_record.get(make_column)) not in (None, make):
+                makes.add(str(normalize_value(old_record.get(make_column))))
+            rows.append((config_type, change, make, _vehicle(record, dataset),
+                         json.dumps(old_record, default=str) if old_record else None,
+                         json.dumps(new_record, default=str) if new_record else None))
+        makes = sorted(makes)
+
+    cursor.execute('''
+        INSERT INTO import_generations (config_type, row_count, added, removed, modified, makes, detailed)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', (config_type, row_count, counts['added'], counts['removed'], counts['modified'],
+          json.dumps(makes) if makes is not None else None, int(detailed)))
+    generation = cursor.lastrowid
+    cursor.executemany('''
+        INSERT INTO import_changelog (generation, config_type, change, make, vehicle, old_data, new_data)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', [(generation,) + row for row in rows])
+    prune_changelog(cursor, config_type)
+    logging.info(f"{config_type} generation {generation}: {counts['added']} added, {counts['removed']} removed, "
+                 f"{counts['modified']} modified")
+    return dict(generation=generation, makes=makes, **counts)
+
+
+def prune_changelog(cursor, config_type, keep=CHANGELOG_GENERATIONS):
+    """Drop all but the newest ``keep`` generations of a configuration type"""
+    cursor.execute('''
+        SELECT generation FROM import_generations WHERE config_type = ?
+        ORDER BY generation DESC LIMIT -1 OFFSET ?
+    ''', (config_type, keep))
+    old = [row[0] for row in cursor.fetchall()]
+    for start in range(0, len(old), FETCH_BATCH):
+        batch = old[start:start + FETCH_BATCH]
+        placeholders = ', '.join('?' for _ in batch)
+        cursor.execute(f"DELETE FROM import_changelog WHERE generation IN ({placeholders})", batch)
+        cursor.execute(f"DELETE FROM import_generations WHERE generation IN ({placeholders})", batch)
+
+
+def recent_generations(db_path='data.db', config_type=None, limit=CHANGELOG_GENERATIONS):
+    """List the newest generations, optionally of one configuration type, as dicts"""
+    conn = read_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        where, params = ('WHERE config_type = ?', [config_type]) if config_type else ('', [])
+        cursor.execute(f'''
+            SELECT generation, config_type, published_at, row_count, added, removed, modified, makes, detailed
+            FROM import_generations {where} ORDER BY generation DESC LIMIT ?
+        ''', params + [limit])
+        names = [column[0] for column in cursor.description]
+        generations = []
+        for row in cursor.fetchall():
+            generation = dict(zip(names, row))
+            generation['makes'] = json.loads(generation['makes']) if generation['makes'] else None
+            generation['detailed'] = bool(generation['detailed'])
+            generations.append(generation)
+        return generations
+    except sqlite3.Error as e:
+        logging.error(f"Failed to load import generations: {e}")
+        return []
+    finally:
+        conn.close()
+
+
+def generation_changes(db_path='data.db', generation=None, make=None, limit=None):
+    """List the rows a generation changed, optionally of one make, as dicts with the old and new row"""
+    conn = read_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        query = 'SELECT change, make, vehicle, old_data, new_data FROM import_changelog WHERE generation = ?'
+        params = [generation]
+        if make:
+            query += ' AND UPPER(make) = UPPER(?)'
+            params.append(make.strip())
+        query += ' ORDER BY make, vehicle, id'
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+        cursor.execute(query, params)
+        return [{'change': change, 'make': row_make, 'vehicle': vehicle,
+                 'old': json.loads(old_data) if old_data else None,
+                 'new': json.loads(new_data) if new_data else None}
+                for change, row_make, vehicle, old_data, new_data in cursor.fetchall()]
+    except sqlite3.Error as e:
+        logging.error(f"Failed to load changes of generation {generation}: {e}")
+        return []
+    finally:
+        conn.close()
@@ -0,0 +1,74 @@
+import logging
+
+from repository import stored_year, table_exists, fetch_values, fetch_frame
+
+QUERIES = {
+    'rows': "SELECT * FROM manufacturer_chart",
+    'rows_by_make': "SELECT * FROM manufacturer_chart WHERE Make = ? COLLATE NOCASE",
+    'years': "SELECT DISTINCT Year FROM manufacturer_chart WHERE Year BETWEEN 1900 AND 2100 ORDER BY Year DESC",
+    'makes': "SELECT DISTINCT Make FROM manufacturer_chart WHERE Make IS NOT NULL AND Make != '' ORDER BY Make",
+    'makes_by_year': "SELECT DISTINCT Make FROM manufacturer_chart WHERE Year = ? "
+                     "AND Make IS NOT NULL AND Make != '' ORDER BY Make",
+    'makes_by_year_model': "SELECT DISTINCT Make FROM manufacturer_chart WHERE Year = ? AND Model = ? "
+                           "AND Make IS NOT NULL AND Make != '' ORDER BY Make",
+    'models': "SELECT DISTINCT Model FROM manufacturer_chart WHERE Make = ? COLLATE NOCASE AND Year = ? "
+              "AND Model IS NOT NULL AND Model != '' ORDER BY Model",
+}
+
+
+def chart_exists(db_path='data.db'):
+    """Check whether the manufacturer chart has been loaded"""
+    return table_exists('manufacturer_chart', db_path)
+
+
+def get_chart_data(db_path='data.db'):
+    """Get all manufacturer chart data from database"""
+    try:
+        if not chart_exists(db_path):
+            return []
+        return fetch_frame(QUERIES['rows'], (), db_path).to_dict('records')
+    except Exception as e:
+        logging.error(f"Error getting manufacturer chart data: {e}")
+        return []
+
+
+def get_chart_rows(make, db_path='data.db'):
+    """Get the manufacturer chart rows of one make as a DataFrame, using the (Make, Year, Model) index"""
+    return fetch_frame(QUERIES['rows_by_make'], (str(make).strip(),), db_path)
+
+
+def get_chart_years(db_path='data.db'):
+    """Get unique years from manufacturer chart data, newest first"""
+    try:
+        if not chart_exists(db_path):
+            return []
+        return [str(year) for year in fetch_values(QUERIES['years'], (), db_path)]
+    except Exception as e:
+        logging.error(f"Error getting unique years from manufacturer chart: {e}")
+        return []
+
+
+def get_chart_makes(year=None, model=None, db_path='data.db'):
+    """Get the manufacturer chart makes, sorted; those of a year, or of a year and model, when given"""
+    try:
+        if not chart_exists(db_path):
+            return []
+        if year is None:
+            return fetch_values(QUERIES['makes'], (), db_path)
+        if model is None:
+            return fetch_values(QUERIES['makes_by_year'], (stored_year(year),), db_path)
+        return fetch_values(QUERIES['makes_by_year_model'], (stored_year(year), model), db_path)
+    except Exception as e:
+        logging.error(f"Error getting unique makes from manufacturer chart: {e}")
+        return []
+
+
+def get_chart_models(year, make, db_path='data.db'):
+    """Get unique models from manufacturer chart data for given year and make"""
+    try:
+        if not chart_exists(db_path):
+            return []
+        return fetch_values(QUERIES['models'], (str(make).strip(), stored_year(year)), db_path)
+    except Exception as e:
+        logging.error(f"Error getting unique models from manufacturer chart: {e}")
+        return []
@@ -4,13 +4,165 @@ import logging
 import json
 import pandas as pd
 
+from db_connections import connect, read_connection, write_connection
+from prequal_repository import (
+    query_prequal, get_prequal_data, get_prequal_years, get_prequal_makes, get_prequal_models
+)
+
 def get_db_connection(db_path='data.db'):
-    """Get a database connection"""
-    return sqlite3.connect(db_path)
+    """Get the calling thread's shared read connection (see db_connections); close() leaves it open"""
+    return read_connection(db_path)
+
+def initialize_db(db_path='data.db'):
+    """Create the application tables and indexes if they don't exist"""
+    from import_engine import initialize_import_tables, PREQUAL_TABLE_SQL, MANUFACTURER_CHART_TABLE_SQL
+
+    conn = None
+    try:
+        # A connection of its own, as migrations rebuild tables the shared connections read
+        conn = connect(db_path)
+        cursor = conn.cursor()
+        cursor.execute(PREQUAL_TABLE_SQL)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS carsys (
+                id INTEGER PRIMARY KEY,
+                genericSystemName TEXT,
+                dtcSys TEXT,
+                carMake TEXT,
+                comments TEXT,
+                source_file TEXT
+            );
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS blacklist (
+                id INTEGER PRIMARY KEY,
+                dtcCode TEXT,
+                genericSystemName TEXT,
+                dtcDescription TEXT,
+                dtcSys TEXT,
+                carMake TEXT,
+                comments TEXT,
+                source_file TEXT
+            );
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS goldlist (
+                id INTEGER PRIMARY KEY,
+                dtcCode TEXT,
+                genericSystemName TEXT,
+                dtcDescription TEXT,
+                dtcSys TEXT,
+                carMake TEXT,
+                comments TEXT,
+                source_file TEXT
+            );
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS mag_glass (
+                id INTEGER PRIMARY KEY,
+                "Generic System Name" TEXT,
+                "ADAS Module Name" TEXT,
+                "Car Make" TEXT,
+                "Manufacturer" TEXT,
+                "AUTEL or BOSCH" TEXT,
+                source_file TEXT
+            );
+        ''')
+        cursor.execute(MANUFACTURER_CHART_TABLE_SQL)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS leader_log (
+                id INTEGER PRIMARY KEY,
+                pin TEXT,
+                name TEXT
+            );
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS user_actions (
+                id INTEGER PRIMARY KEY,
+                user TEXT,
+                action TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            );
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS paths (
+                config_type TEXT PRIMARY KEY,
+                folder_path TEXT
+            );
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS app_settings (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        ''')
+
+        # Insert the "Set Up" user if it doesn't exist
+        cursor.execute('SELECT * FROM leader_log WHERE name = "Set Up"')
+        if not cursor.fetchone():
+            cursor.execute('INSERT INTO leader_log (pin, name) VALUES (?, ?)', ('0000', 'Set Up'))
+
+        # Create indexes on frequently queried columns
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_leader_log_pin ON leader_log (pin)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_leader_log_name ON leader_log (name)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_blacklist_dtcCode ON blacklist (dtcCode)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_blacklist_carMake ON blacklist (carMake)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_goldlist_dtcCode ON goldlist (dtcCode)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_goldlist_carMake ON goldlist (carMake)')
+
+        # Import manifest and per-workbook row tagging used by incremental refresh
+        initialize_import_tables(cursor)
+
+        conn.commit()
+    except sqlite3.Error as e:
+        logging.error(f"Failed to initialize database tables: {e}")
+    finally:
+        if conn:
+            conn.close()
+
+def load_saved_paths(db_path='data.db'):
+    """Get the saved source folder of each configuration type"""
+    conn = get_db_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT config_type, folder_path FROM paths')
+        return {config_type: folder_path for config_type, folder_path in cursor.fetchall() if folder_path}
+    except sqlite3.Error as e:
+        logging.error(f"Failed to load saved paths: {e}")
+        return {}
+    finally:
+        conn.close()
+
+def load_setting_from_db(key, default=None, db_path='data.db'):
+    """Load an application setting from the database"""
+    conn = get_db_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT value FROM app_settings WHERE key = ?', (key,))
+        row = cursor.fetchone()
+        return row[0] if row else default
+    except sqlite3.Error as e:
+        logging.error(f"Failed to load setting {key}: {e}")
+        return default
+    finally:
+        conn.close()
+
+def save_setting_to_db(key, value, db_path='data.db'):
+    """Save an application setting to the database"""
+    try:
+        with write_connection(db_path) as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO app_settings (key, value)
+                VALUES (?, ?)
+            ''', (key, str(value)))
+    except sqlite3.Error as e:
+        logging.error(f"Failed to save setting {key}: {e}")
 
 def load_configuration(config_type, db_path='data.db'):
     """Load configuration data from database"""
-    conn = sqlite3.connect(db_path)
+    if config_type == 'prequal':
+        return get_prequal_data(db_path)
+    conn = get_db_connection(db_path)
     result = []
     try:
         cursor = conn.cursor()
@@ -35,90 +187,12 @@ def load_configuration(config_type, db_path='data.db'):
         conn.close()
         return result
 
-def get_prequal_data(db_path='data.db'):
-    """Get prequal data from database"""
-    return load_configuration('prequal', db_path)
-
-def get_unique_makes(data):
-    """Get unique makes from prequal data"""
-    # Create a set of unique makes
-    makes = set()
-    seen_makes = set()  # Track makes we've already seen
-    
-    for item in data:
-        if isinstance(item, dict) and 'Make' in item:
-            make = item['Make']
-            if (isinstance(make, str) and 
-                make.strip() and 
-                make.lower() not in ['unknown', 'nan', 'none', 'null'] and
-                make.strip() not in seen_makes):  # Only add if we haven't seen it
-                
-                make = make.strip()
-                makes.add(make)
-                seen_makes.add(make)
-    
-    # Sort and return the list of makes
-    makes_list = sorted(list(makes))
-    logging.debug(f"Found {len(makes_list)} unique makes: {makes_list}")
-    return makes_list
-
-def get_unique_models(data, year, make):
-    """Get unique models for a given year and make"""
-    models = set()
-    seen_models = set()  # Track models we've already seen
-    
-    for item in data:
-        if isinstance(item, dict):
-            try:
-                if ('Year' in item and 'Make' in item and 'Model' in item and
-                    str(int(float(item['Year']))) == year and
-                    isinstance(item['Make'], str) and
-                    item['Make'].strip() == make.strip() and
-                    isinstance(item['Model'], str) and
-                    item['Model'].strip() and
-                    item['Model'].lower() not in ['unknown', 'nan', 'none', 'null'] and
-                    item['Model'].strip() not in seen_models):  # Only add if we haven't seen it
-                    
-                    model = item['Model'].strip()
-                    models.add(model)
-                    seen_models.add(model)
-            except (ValueError, TypeError):
-                continue
-    
-    # Sort and return the list of models
-    models_list = sorted(list(models))
-    logging.debug(f"Found {len(models_list)} models for {year} {make}: {models_list}")
-    return models_list
-
-def get_unique_years(data):
-    """Get unique years from prequal data"""
-    years = set()
-    seen_years = set()  # Track years we've already seen
-    
-    for item in data:
-        if isinstance(item, dict) and 'Year' in item:
-            try:
-                year = int(float(item['Year']))
-                if 1900 <= year <= 2100 and str(year) not in seen_years:  # Only add if we haven't seen it
-                    years.add(str(year))
-                    seen_years.add(str(year))
-            except (ValueError, TypeError):
-                continue
-    
-    # Sort in reverse order (newest first) and return
-    years_list = sorted(list(years), reverse=True)
-    logging.debug(f"Found {len(years_list)} unique years: {years_list}")
-    return years_list
-
 def populate_vehicle_dropdowns(selector, db_path='data.db'):
     """Populate the dropdowns for a vehicle selector"""
     try:
-        data = get_prequal_data(db_path)
-        if data:
-            # Extract unique years and makes
-            years = get_unique_years(data)
-            makes = get_unique_makes(data)
-            
+        years = get_prequal_years(db_path)
+        makes = get_prequal_makes(db_path)
+        if years or makes:
             logging.debug(f"Found {len(years)} years and {len(makes)} makes")
             logging.debug(f"Years: {years}")
             logging.debug(f"Makes: {makes}")
@@ -147,141 +221,24 @@ def update_vehicle_models(selector, year, make, db_path='data.db'):
         return
         
     try:
-        data = get_prequal_data(db_path)
-        if data:
-            # Get unique models for selected year and make
-            models = get_unique_models(data, year, make)
-            logging.debug(f"Found {len(models)} models for {year} {make}")
-            logging.debug(f"Models: {models}")
-            
-            for model in models:
-                selector.model.addItem(model)
-    except Exception as e:
-        logging.error(f"Error updating models: {e}")
-
-def get_manufacturer_chart_data(db_path='data.db'):
-    """Get all manufacturer chart data from database"""
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Check if table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='manufacturer_chart'")
-        if not cursor.fetchone():
-            conn.close()
-            return []
-        
-        # Get all data
-        cursor.execute("SELECT * FROM manufacturer_chart")
-        columns = [description[0] for description in cursor.description]
-        rows = cursor.fetchall()
-        
-        # Convert to list of dictionaries
-        data = []
-        for row in rows:
-            record = dict(zip(columns, row))
-            data.append(record)
-        
-        conn.close()
-        return data
-    except Exception as e:
-        logging.error(f"Error getting manufacturer chart data: {e}")
-        return []
-
-def get_unique_years_from_manufacturer_chart(db_path='data.db'):
-    """Get unique years from manufacturer chart data"""
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Check if table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='manufacturer_chart'")
-        if not cursor.fetchone():
-            conn.close()
-            return []
-        
-        # Get unique years
-        cursor.execute("SELECT DISTINCT Year FROM manufacturer_chart WHERE Year IS NOT NULL AND Year != '' ORDER BY Year DESC")
-        years = [str(row[0]) for row in cursor.fetchall()]
-        
-        conn.close()
-        return years
-    except Exception as e:
-        logging.error(f"Error getting unique years from manufacturer chart: {e}")
-        return []
-
-def get_unique_makes_from_manufacturer_chart(db_path='data.db'):
-    """Get unique makes from manufacturer chart data"""
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Check if table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='manufacturer_chart'")
-        if not cursor.fetchone():
-            conn.close()
-            return []
-        
-        # Get unique makes
-        cursor.execute("SELECT DISTINCT Make FROM manufacturer_chart WHERE Make IS NOT NULL AND Make != '' ORDER BY Make")
-        makes = [row[0] for row in cursor.fetchall()]
-        
-        conn.close()
-        return makes
-    except Exception as e:
-        logging.error(f"Error getting unique makes from manufacturer chart: {e}")
-        return []
+        models = get_prequal_models(year, make, db_path)
+        logging.debug(f"Found {len(models)} models for {year} {make}")
+        logging.debug(f"Models: {models}")
 
-def get_unique_models_from_manufacturer_chart(year, make, db_path='data.db'):
-    """Get unique models from manufacturer chart data for given year and make"""
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Check if table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='manufacturer_chart'")
-        if not cursor.fetchone():
-            conn.close()
-            return []
-        
-        # Convert year to float format for database comparison (e.g., "2021" -> "2021.0")
-        year_float = f"{float(year)}"
-        
-        # Get unique models for the given year and make
-        cursor.execute("SELECT DISTINCT Model FROM manufacturer_chart WHERE Year = ? AND Make = ? AND Model IS NOT NULL AND Model != '' ORDER BY Model", (year_float, make))
-        models = [row[0] for row in cursor.fetchall()]
-        
-        conn.close()
-        return models
+        for model in models:
+            selector.model.addItem(model)
     except Exception as e:
-        logging.error(f"Error getting unique models from manufacturer chart: {e}")
-        return []
+        logging.error(f"Error updating models: {e}")
 
 def get_vehicle_data(vehicle, db_path='data.db'):
     """Get all relevant data for a vehicle"""
     try:
-        data = get_prequal_data(db_path)
-        if data:
-            # Filter data for selected vehicle
-            prequal_data = []
-            for item in data:
-                if isinstance(item, dict):
-                    try:
-                        if ('Year' in item and 'Make' in item and 'Model' in item and
-                            str(int(float(item['Year']))) == vehicle['year'] and
-                            isinstance(item['Make'], str) and
-                            item['Make'].strip() == vehicle['make'].strip() and
-                            isinstance(item['Model'], str) and
-                            item['Model'].strip() == vehicle['model'].strip()):
-                            prequal_data.append(item)
-                    except (ValueError, TypeError):
-                        continue
-            
-            if prequal_data:
-                return {
-                    'prequal': prequal_data
-                }
-        
+        prequal_data = query_prequal(vehicle['year'], vehicle['make'], vehicle['model'], db_path)
+        if prequal_data:
+            return {
+                'prequal': prequal_data
+            }
+
         return None
         
     except Exception as e:
@@ -0,0 +1,287 @@
+import re
+import json
+import hashlib
+
+import pandas as pd
+
+# One entry per dataset the importers load. Each schema lists:
+#   columns        canonical column -> header aliases (matched after normalize_header)
+#   dtypes         canonical column -> 'str' (stripped text) or 'integer' (whole numbers as ints,
+#                  so 2021 and 2021.0 are both 2021, other text stripped); others are kept as read
+#   blank          value stored for missing cells
+#   required       raise if any canonical column is missing from the sheet
+#   keep_unmatched keep sheet columns that aren't canonical, except those containing drop_matching
+#   extra_column   table column holding the kept unmatched columns of a record as JSON
+#   make_column    canonical column holding the vehicle make, for filtering by make
+#   year_column    canonical column holding the model year, held as a small integer by compact_frame
+#   key_columns    columns a sheet must have to be loadable (default: all canonical columns)
+#   diff_key       columns identifying "the same row" across imports, for the changelog: a
+#                  key whose other values changed is a modified row rather than a removal and an addition
+SCHEMAS = {
+    'dtc_list': {
+        'columns': {
+            'genericSystemName': ['Generic System Name'],
+            'dtcCode': ['DTC Code'],
+            'dtcDescription': ['DTC Description'],
+            'dtcSys': ['DTC Sys'],
+            'carMake': ['Car Make'],
+            'comments': ['Comments'],
+        },
+        'dtypes': {'dtcCode': 'str'},
+        'blank': None,
+        'make_column': 'carMake',
+        'diff_key': ['carMake', 'dtcCode', 'genericSystemName'],
+    },
+    'carsys': {
+        'columns': {
+            'genericSystemName': ['Generic System Name'],
+            'dtcSys': ['DTCsys', 'DTC Sys'],
+            'carMake': ['CarMake', 'Car Make'],
+            'comments': ['Comments'],
+        },
+        'dtypes': {'genericSystemName': 'str', 'dtcSys': 'str', 'carMake': 'str', 'comments': 'str'},
+        'blank': None,
+        'make_column': 'carMake',
+        'diff_key': ['carMake', 'dtcSys'],
+        'required': True,
+    },
+    # Mag Glass keeps the spreadsheet headers as its column names
+    'mag_glass': {
+        'columns': {
+            'Generic System Name': ['genericSystemName'],
+            'ADAS Module Name': ['adasModuleName'],
+            'Car Make': ['carMake'],
+            'Manufacturer': [],
+            'AUTEL or BOSCH': ['autelOrBosch'],
+        },
+        'dtypes': {},
+        'blank': None,
+        'make_column': 'Car Make',
+        'diff_key': ['Car Make', 'Generic System Name', 'ADAS Module Name'],
+    },
+    # Prequal keeps the longsheet headers as its column names, like Mag Glass
+    'prequal': {
+        'columns': {
+            'Year': [],
+            'Make': [],
+            'Model': [],
+            'Protech Generic System Name': [],
+            'Protech Generic System Name.1': [],
+            'Parent Component': [],
+            'Calibration Type': [],
+            'OG Calibration Type': [],
+            'Parts Code Table Value': [],
+            'Calibration Pre-Requisites': [],
+            'Calibration Pre-Requisites (Short Hand)': [],
+            'Service Information Hyperlink': [],
+            'Point of Impact #': [],
+        },
+        'dtypes': {
+            'Year': 'integer', 'Make': 'str', 'Model': 'str', 'Protech Generic System Name': 'str',
+            'Protech Generic System Name.1': 'str', 'Parent Component': 'str', 'Calibration Type': 'str',
+            'OG Calibration Type': 'str', 'Parts Code Table Value': 'str', 'Calibration Pre-Requisites': 'str',
+            'Calibration Pre-Requisites (Short Hand)': 'str', 'Service Information Hyperlink': 'str',
+            'Point of Impact #': 'str',
+        },
+        'blank': None,
+        'make_column': 'Make',
+        'year_column': 'Year',
+        'diff_key': ['Year', 'Make', 'Model', 'Protech Generic System Name'],
+        'key_columns': ['Year', 'Make', 'Model'],
+        'keep_unmatched': True,
+        'drop_matching': 'comment',
+        'extra_column': 'extra',
+    },
+    'manufacturer_chart': {
+        'columns': {
+            'Year': [],
+            'Make': [],
+            'Model': [],
+            'Calibration_Type': ['Calibration Type'],
+            'Protech_Generic_System_Name': ['Protech Generic System Name'],
+            'SME_Generic_System_Name': ['SME Generic System Name'],
+            'SME_Calibration_Type': ['SME Calibration Type'],
+            'Feature': [],
+            'Service_Information_Hyperlink': ['Service Information Hyperlink'],
+            'Calibration_Pre_Requisites': ['Calibration Pre-Requisites'],
+        },
+        'dtypes': {
+            'Year': 'integer', 'Make': 'str', 'Model': 'str', 'Calibration_Type': 'str',
+            'Protech_Generic_System_Name': 'str', 'SME_Generic_System_Name': 'str',
+            'SME_Calibration_Type': 'str', 'Feature': 'str',
+            'Service_Information_Hyperlink': 'str', 'Calibration_Pre_Requisites': 'str',
+        },
+        'blank': '',
+        'make_column': 'Make',
+        'year_column': 'Year',
+        'diff_key': ['Year', 'Make', 'Model', 'Protech_Generic_System_Name'],
+        'key_columns': ['Year', 'Make', 'Model'],
+    },
+}
+
+# Text columns are held as categoricals when at most this share of their values is distinct
+CATEGORY_MAX_RATIO = 0.5
+
+
+def normalize_header(col):
+    """Lowercase a header and drop everything but letters and digits"""
+    return re.sub(r'[^a-z0-9]', '', str(col).lower())
+
+
+def schema_columns(dataset):
+    """Get the canonical column names of a dataset, in table order"""
+    return list(SCHEMAS[dataset]['columns'])
+
+
+def quoted_columns(dataset):
+    """Quote the canonical column names for a SELECT or INSERT column list"""
+    return ', '.join(f'"{col}"' for col in schema_columns(dataset))
+
+
+def make_column(dataset):
+    """Get the quoted column holding the vehicle make"""
+    return f'"{SCHEMAS[dataset]["make_column"]}"'
+
+
+def missing_key_columns(headers, dataset):
+    """List the key columns of a dataset that none of the headers provide"""
+    schema = SCHEMAS[dataset]
+    resolved = resolve_columns(headers, dataset)
+    return [column for column in schema.get('key_columns') or schema['columns'] if column not in resolved]
+
+
+def resolve_columns(headers, dataset):
+    """Map each canonical column to the sheet header that provides it"""
+    by_name = {}
+    for header in headers:
+        by_name.setdefault(normalize_header(header), header)
+    resolved = {}
+    for column, aliases in SCHEMAS[dataset]['columns'].items():
+        for alias in [column] + aliases:
+            header = by_name.get(normalize_header(alias))
+            if header is not None:
+                resolved[column] = header
+                break
+    return resolved
+
+
+def _clean_column(values, dtype, blank):
+    present = values.notna()
+    if dtype == 'integer':
+        text = values[present].astype(str).str.strip()
+        text = text[text != '']
+        numbers = pd.to_numeric(text, errors='coerce')
+        whole = numbers.notna() & (numbers % 1 == 0)
+        cleaned = pd.Series(blank, index=values.index, dtype=object)
+        cleaned[text.index] = text.astype(object)
+        cleaned[whole[whole].index] = [int(number) for number in numbers[whole]]
+        return cleaned
+    if dtype == 'str':
+        text = values[present].astype(str).str.strip()
+        text = text[text != '']
+        cleaned = pd.Series(blank, index=values.index, dtype=object)
+        cleaned[text.index] = text
+        return cleaned
+    return values.astype(object).where(present, blank)
+
+
+def apply_schema(df, dataset):
+    """Resolve a sheet's headers against a dataset schema and clean it column-wise.
+
+    Returns a frame with the canonical columns (plus the kept unmatched ones),
+    missing cells set to the schema's blank value and rows that are entirely
+    blank dropped.
+    """
+    schema = SCHEMAS[dataset]
+    blank = schema.get('blank')
+    resolved = resolve_columns(df.columns, dataset)
+    missing = [column for column in schema['columns'] if column not in resolved]
+    if missing and schema.get('required'):
+        raise ValueError(f"Missing expected columns in the Excel file: {', '.join(missing)}")
+
+    cleaned = pd.DataFrame(index=df.index)
+    for column in schema['columns']:
+        if column in resolved:
+            cleaned[column] = _clean_column(df[resolved[column]], schema['dtypes'].get(column), blank)
+        else:
+            cleaned[column] = pd.Series(blank, index=df.index, dtype=object)
+    if schema.get('keep_unmatched'):
+        used = set(resolved.values())
+        drop_matching = schema.get('drop_matching')
+        for header in df.columns:
+            if header in used or (drop_matching and drop_matching in str(header).lower()):
+                continue
+            cleaned[header] = df[header].astype(object).where(df[header].notna(), blank)
+
+    is_blank = cleaned.isna() | (cleaned == '')
+    return cleaned[~is_blank.all(axis=1)]
+
+
+def _is_blank(values, blank):
+    return values.isna() | (values == blank) if blank is not None else values.isna()
+
+
+def compact_frame(df, dataset):
+    """Shrink a cleaned frame while it is held in memory during an import.
+
+    The year column becomes a nullable Int16 when every year in it is a whole
+    number, and text columns whose values repeat (makes, models, calibration
+    types, system names) become categoricals. storage_frame turns the frame
+    back into the values apply_schema produced.
+    """
+    schema = SCHEMAS[dataset]
+    blank = schema.get('blank')
+    year_column = schema.get('year_column')
+    compacted = {}
+    for column in df.columns:
+        values = df[column]
+        if values.dtype != object or values.empty:
+            continue
+        present = values[~_is_blank(values, blank)]
+        if column == year_column:
+            years = pd.to_numeric(present, errors='coerce')
+            if years.notna().all() and (years % 1 == 0).all() and years.abs().max(skipna=True) < 2 ** 15:
+                compacted[column] = pd.Series(pd.NA, index=values.index, dtype='Int16')
+                compacted[column][present.index] = years.astype('Int16')
+                continue
+        if (pd.api.types.infer_dtype(present, skipna=True) in ('string', 'empty')
+                and values.nunique() <= CATEGORY_MAX_RATIO * len(values)):
+            compacted[column] = values.astype('category')
+    return df.assign(**compacted) if compacted else df
+
+
+def storage_frame(df, dataset):
+    """Turn the compacted columns of a frame back into plain values for writing to SQLite"""
+    schema = SCHEMAS[dataset]
+    blank = schema.get('blank')
+    restored = {}
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+            restored[column] = values.where(values.notna(), blank)
+        elif isinstance(values.dtype, pd.Int16Dtype):
+            plain = values.astype(object)
+            restored[column] = plain.where(values.notna(), blank)
+    return df.assign(**restored) if restored else df
+
+
+def normalize_value(value):
+    """Normalize a stored value for comparing records: stripped text, blanks as None, whole floats as ints"""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def record_hash(record):
+    """Hash a record after normalizing it, so the same row hashes alike in every workbook.
+
+    Keys and text are stripped, blank text counts as missing and whole floats
+    as integers (a Year read as 2021.0 matches 2021).
+    """
+    normalized = {str(key).strip(): normalize_value(value) for key, value in record.items()}
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
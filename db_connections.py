@@ -0,0 +1,135 @@
+import os
+import sqlite3
+import logging
+import weakref
+import threading
+from contextlib import contextmanager
+
+# Settings of every connection the app opens. WAL lets readers keep reading
+# the last committed data while an import writes, instead of waiting on it.
+CONNECTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -32768,
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
+}
+
+# Prepared statements kept per connection, so repeated queries skip parsing
+STATEMENT_CACHE_SIZE = 256
+
+# Seconds a write waits for another connection's transaction before failing
+BUSY_TIMEOUT = 10.0
+
+
+class SharedConnection(sqlite3.Connection):
+    """A connection kept open by the connection manager and shared by its callers.
+
+    close() doesn't close it; like closing a connection, it discards a
+    transaction the caller left uncommitted.
+    """
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def close_connection(self):
+        super().close()
+
+
+def connect(db_path='data.db', factory=sqlite3.Connection, check_same_thread=True):
+    """Open a connection with CONNECTION_PRAGMAS applied"""
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, factory=factory,
+                           cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=check_same_thread)
+    for name, value in CONNECTION_PRAGMAS.items():
+        try:
+            conn.execute(f"PRAGMA {name} = {value}")
+        except sqlite3.Error as e:
+            logging.warning(f"Could not set PRAGMA {name} on {db_path}: {e}")
+    return conn
+
+
+class ConnectionManager:
+    """Long-lived connections to one database: a read connection per thread and one writer.
+
+    The writer is shared by every thread and held by one transaction at a
+    time (see write_connection). Imports keep a connection of their own, so
+    the app's small writes never queue behind a whole import.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.local = threading.local()
+        # Weak, so a finished thread's reader closes with the thread
+        self.readers = weakref.WeakSet()
+        self.writer = None
+        self.write_lock = threading.RLock()
+        self.lock = threading.Lock()
+
+    def reader(self):
+        """Get the calling thread's read connection, opening it on first use"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = connect(self.db_path, factory=SharedConnection)
+            self.local.conn = conn
+            with self.lock:
+                self.readers.add(conn)
+        return conn
+
+    @contextmanager
+    def write(self):
+        """Hold the writer for one transaction, committed on success and rolled back on error"""
+        with self.write_lock:
+            if self.writer is None:
+                self.writer = connect(self.db_path, factory=SharedConnection, check_same_thread=False)
+            try:
+                yield self.writer
+                self.writer.commit()
+            except BaseException:
+                self.writer.rollback()
+                raise
+
+    def close(self):
+        """Close every connection of this database; threads reopen their reader on next use"""
+        with self.write_lock, self.lock:
+            for conn in list(self.readers) + ([self.writer] if self.writer else []):
+                try:
+                    conn.close_connection()
+                except sqlite3.ProgrammingError:
+                    # A reader of another thread; it is closed when that thread ends
+                    pass
+            self.readers = weakref.WeakSet()
+            self.writer = None
+            self.local = threading.local()
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(db_path='data.db'):
+    """Get the connection manager of a database, creating it on first use"""
+    key = os.path.abspath(db_path)
+    with _managers_lock:
+        if key not in _managers:
+            _managers[key] = ConnectionManager(key)
+        return _managers[key]
+
+
+def read_connection(db_path='data.db'):
+    """Get the calling thread's long-lived read connection to a database"""
+    return get_connection_manager(db_path).reader()
+
+
+def write_connection(db_path='data.db'):
+    """Hold a database's writer connection for one transaction: ``with write_connection(db_path) as conn:``"""
+    return get_connection_manager(db_path).write()
+
+
+def close_connections(db_path=None):
+    """Close the managed connections of one database, or of every database"""
+    with _managers_lock:
+        managers = [_managers.get(os.path.abspath(db_path))] if db_path else list(_managers.values())
+    for manager in managers:
+        if manager:
+            manager.close()
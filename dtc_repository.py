@@ -0,0 +1,31 @@
+from dtc_search import search_dtc_list, RESULT_COLUMNS
+from repository import table_exists, fetch_frame
+
+# The blacklist and goldlist share one schema, so each has the same named queries
+DTC_TABLES = ('blacklist', 'goldlist')
+
+QUERIES = {
+    table_name: {
+        'rows': f"SELECT ? AS Source, {', '.join(RESULT_COLUMNS)} FROM {table_name}",
+        'rows_by_make': f"SELECT ? AS Source, {', '.join(RESULT_COLUMNS)} FROM {table_name} WHERE carMake = ?",
+    }
+    for table_name in DTC_TABLES
+}
+
+
+def dtc_list_exists(table_name, db_path='data.db'):
+    """Check whether a DTC list has been loaded"""
+    return table_exists(table_name, db_path)
+
+
+def get_dtc_rows(table_name, make=None, db_path='data.db'):
+    """Get a DTC list's rows, or one make's, as a DataFrame with a Source column followed by RESULT_COLUMNS"""
+    queries = QUERIES[table_name]
+    if make is None:
+        return fetch_frame(queries['rows'], (table_name,), db_path)
+    return fetch_frame(queries['rows_by_make'], (table_name, make), db_path)
+
+
+def search_dtc(table_name, text, make=None, db_path='data.db'):
+    """Search a DTC list through its full-text index, best matches first (see dtc_search)"""
+    return search_dtc_list(table_name, text, make, db_path)
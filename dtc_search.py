@@ -0,0 +1,145 @@
+import re
+import logging
+
+import pandas as pd
+
+from db_connections import read_connection
+
+# FTS5 indexes of each DTC list. They are external-content tables: the text
+# is read from the list table itself (by its id), and triggers on the list
+# table keep them in step with every insert, update and delete.
+DTC_SEARCH_TABLES = {'blacklist': 'blacklist_fts', 'goldlist': 'goldlist_fts'}
+SEARCH_COLUMNS = ['dtcCode', 'dtcDescription', 'genericSystemName', 'comments']
+
+# Trigram indexes of the codes alone, so a fragment such as "0100" finds U0100
+CODE_SEARCH_TABLES = {'blacklist': 'blacklist_code_fts', 'goldlist': 'goldlist_code_fts'}
+CODE_COLUMNS = ['dtcCode']
+
+# Columns of a search result, after the Source column, in display order
+RESULT_COLUMNS = ['dtcCode', 'genericSystemName', 'dtcDescription', 'dtcSys', 'carMake', 'comments']
+
+# BM25 weight of each searched column, so a hit on the code outranks one in a description or comment
+SEARCH_WEIGHTS = (10.0, 2.0, 1.0, 0.5)
+
+# Prefix lengths indexed for fast prefix queries such as "U01*"
+PREFIX_LENGTHS = '2 3 4'
+
+# Shortest code fragment the trigram index can look up
+MIN_CODE_FRAGMENT = 3
+
+
+def _indexes(table_name):
+    """The (index, columns, options) of a DTC list's full-text indexes"""
+    return [(DTC_SEARCH_TABLES[table_name], SEARCH_COLUMNS, f"prefix='{PREFIX_LENGTHS}'"),
+            (CODE_SEARCH_TABLES[table_name], CODE_COLUMNS, "tokenize='trigram'")]
+
+
+def _create_triggers(cursor, table_name):
+    inserts, deletes = [], []
+    for fts_table, columns, _ in _indexes(table_name):
+        names = ', '.join(columns)
+        inserts.append(f"INSERT INTO {fts_table} (rowid, {names}) "
+                       f"VALUES (new.id, {', '.join(f'new.{column}' for column in columns)});")
+        deletes.append(f"INSERT INTO {fts_table} ({fts_table}, rowid, {names}) "
+                       f"VALUES ('delete', old.id, {', '.join(f'old.{column}' for column in columns)});")
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {table_name}_fts_insert AFTER INSERT ON {table_name} "
+                   f"BEGIN {' '.join(inserts)} END")
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {table_name}_fts_delete AFTER DELETE ON {table_name} "
+                   f"BEGIN {' '.join(deletes)} END")
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {table_name}_fts_update AFTER UPDATE ON {table_name} "
+                   f"BEGIN {' '.join(deletes + inserts)} END")
+
+
+def initialize_dtc_search(cursor):
+    """Create the full-text indexes of the DTC lists and their triggers, filling any that are new"""
+    for table_name in DTC_SEARCH_TABLES:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+        if not cursor.fetchone():
+            continue
+        created = False
+        for fts_table, columns, options in _indexes(table_name):
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,))
+            if not cursor.fetchone():
+                cursor.execute(f"CREATE VIRTUAL TABLE {fts_table} USING fts5({', '.join(columns)}, "
+                               f"content='{table_name}', content_rowid='id', {options})")
+                created = True
+        if created:
+            sync_dtc_search(cursor, table_name)
+        else:
+            _create_triggers(cursor, table_name)
+
+
+def sync_dtc_search(cursor, table_name):
+    """Rebuild the full-text indexes of a DTC list from its table.
+
+    Only needed when the table itself was replaced (an import swapping in
+    its staging table), which also drops the triggers; they are recreated
+    here. Row changes are indexed by the triggers. Tables without an index
+    are skipped.
+    """
+    if table_name not in DTC_SEARCH_TABLES:
+        return
+    _create_triggers(cursor, table_name)
+    for fts_table, _, _ in _indexes(table_name):
+        cursor.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')")
+    logging.info(f"Rebuilt the search indexes of {table_name}")
+
+
+def _terms(text):
+    return re.findall(r'\w+', str(text or ''))
+
+
+def match_query(text):
+    """Turn search text into an FTS5 query matching rows with a word starting with every term"""
+    return ' '.join(f'"{term}"*' for term in _terms(text))
+
+
+def code_fragments(text):
+    """The terms of search text that look like part of a code: a digit and at least three characters"""
+    return [term for term in _terms(text)
+            if len(term) >= MIN_CODE_FRAGMENT and any(char.isdigit() for char in term)]
+
+
+def search_dtc_list(table_name, text, make=None, db_path='data.db'):
+    """Search a DTC list's codes, descriptions, system names and comments.
+
+    Each word of ``text`` matches as a prefix and results are ranked by
+    BM25, best first. A word that looks like part of a code also matches
+    anywhere inside a code ("0100" finds U0100); such rows follow the
+    ranked ones. Empty text lists every row. ``make`` limits the results
+    to one car make, through the list's carMake index. Returns a DataFrame
+    with a Source column followed by RESULT_COLUMNS.
+    """
+    fts_table = DTC_SEARCH_TABLES[table_name]
+    code_table = CODE_SEARCH_TABLES[table_name]
+    selected = ', '.join(['? AS Source'] + [f'{table_name}.{column}' for column in RESULT_COLUMNS])
+    params = []
+    sql = f"SELECT {selected} FROM {table_name}"
+    query = match_query(text)
+    if query:
+        weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS)
+        hits = [f"SELECT rowid, bm25({fts_table}, {weights}) AS score FROM {fts_table} WHERE {fts_table} MATCH ?"]
+        params.append(query)
+        fragments = code_fragments(text)
+        if fragments:
+            # Rows with every fragment inside their code and the other words anywhere
+            code_hit = f"SELECT rowid, 0 AS score FROM {code_table} WHERE {code_table} MATCH ?"
+            params.append(' '.join(f'"{fragment}"' for fragment in fragments))
+            others = [term for term in _terms(text) if term not in fragments]
+            if others:
+                code_hit += (f" AND EXISTS (SELECT 1 FROM {fts_table} WHERE {fts_table} MATCH ? "
+                             f"AND {fts_table}.rowid = {code_table}.rowid)")
+                params.append(match_query(' '.join(others)))
+            hits.append(code_hit)
+        # Materialized so bm25 runs in plain full-text scans; grouping or joining
+        # them directly can have SQLite ask the index for rowid order, where bm25 fails
+        sql = (f"WITH matches AS MATERIALIZED ({' UNION ALL '.join(hits)}) "
+               f"{sql} JOIN (SELECT rowid AS id, MIN(score) AS score FROM matches GROUP BY rowid) AS hits "
+               f"ON hits.id = {table_name}.id")
+    params.append(table_name)
+    if make:
+        sql += f" WHERE {table_name}.carMake = ?"
+        params.append(make)
+    if query:
+        sql += f" ORDER BY hits.score, {table_name}.id"
+    return pd.read_sql_query(sql, read_connection(db_path), params=params)
@@ -0,0 +1,299 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from queue import Queue
+
+from database_utils import load_setting_from_db
+from import_engine import CONFIG_TABLES
+
+# Backups of a source folder live in this subfolder of it. Each generation is
+# a timestamped snapshot of the folder whose files are hard links into a
+# content-addressed object store, so a workbook is stored once however many
+# generations (or folders' files) hold the same content.
+BACKUP_DIR_NAME = '_backups'
+OBJECTS_DIR_NAME = 'objects'
+MANIFEST_NAME = '.backup_manifest.json'
+GENERATION_FORMAT = '%Y%m%d-%H%M%S'
+
+# Default retention: the newest generations kept, and the age in days past
+# which older generations are dropped (0 keeps them regardless of age). The
+# newest generation is always kept.
+DEFAULT_GENERATIONS = 5
+DEFAULT_MAX_AGE_DAYS = 0
+
+
+def get_backup_settings(db_path='data.db'):
+    """Get the number of generations to keep and their maximum age in days"""
+    settings = []
+    for key, default in (('backup_generations', DEFAULT_GENERATIONS), ('backup_max_age_days', DEFAULT_MAX_AGE_DAYS)):
+        try:
+            settings.append(max(0, int(load_setting_from_db(key, default, db_path))))
+        except (TypeError, ValueError):
+            settings.append(default)
+    return tuple(settings)
+
+
+def _is_excluded(name):
+    # The backups themselves, and the "<config>_backup" copies older versions made
+    return name == BACKUP_DIR_NAME or name in {f"{config_type}_backup" for config_type in CONFIG_TABLES}
+
+
+def scan_folder(folder_path):
+    """Map the relative path of every file under a folder to its (size, mtime), skipping backups"""
+    files = {}
+    for root, dirs, names in os.walk(folder_path):
+        if root == folder_path:
+            dirs[:] = [name for name in dirs if not _is_excluded(name)]
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files[os.path.relpath(path, folder_path)] = (stat.st_size, stat.st_mtime)
+    return files
+
+
+def list_generations(backup_dir):
+    """List the completed generations of a backup folder, oldest first"""
+    if not os.path.isdir(backup_dir):
+        return []
+    generations = []
+    for name in os.listdir(backup_dir):
+        try:
+            time.strptime(name, GENERATION_FORMAT)
+        except ValueError:
+            continue
+        if os.path.isfile(os.path.join(backup_dir, name, MANIFEST_NAME)):
+            generations.append(name)
+    return sorted(generations)
+
+
+def _read_manifest(generation_dir):
+    try:
+        with open(os.path.join(generation_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _object_path(objects_dir, content_hash):
+    return os.path.join(objects_dir, content_hash[:2], content_hash)
+
+
+def _store_object(path, objects_dir):
+    """Copy a file into the object store, hashing it on the way.
+
+    Returns ``(content_hash, stored)`` with ``stored`` False when the store
+    already held the content.
+    """
+    temp_path = os.path.join(objects_dir, f".{os.getpid()}.{threading.get_ident()}.tmp")
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as source, open(temp_path, 'wb') as target:
+            for block in iter(lambda: source.read(1024 * 1024), b''):
+                digest.update(block)
+                target.write(block)
+        shutil.copystat(path, temp_path)
+        content_hash = digest.hexdigest()
+        object_path = _object_path(objects_dir, content_hash)
+        if os.path.exists(object_path):
+            os.remove(temp_path)
+            return content_hash, False
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        os.replace(temp_path, object_path)
+        return content_hash, True
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _link_or_copy(source, target):
+    """Hard link a file, copying it where the file system can't link"""
+    try:
+        os.link(source, target)
+        return True
+    except OSError:
+        shutil.copy2(source, target)
+        return False
+
+
+def backup_folder(folder_path, generations=DEFAULT_GENERATIONS, max_age_days=DEFAULT_MAX_AGE_DAYS):
+    """Snapshot a folder into a new backup generation and apply the retention rules.
+
+    Only files whose size or modification time changed since the last
+    generation are read; unchanged ones are linked to the stored copy, and a
+    changed file whose content is already stored is linked rather than
+    copied. No generation is made when nothing changed. A generation is
+    built under a temporary name and renamed once complete. Returns a dict
+    with the generation made (or None), the file counts, the bytes added to
+    the store and the generations removed.
+    """
+    started = time.perf_counter()
+    folder_path = os.path.normpath(folder_path)
+    backup_dir = os.path.join(folder_path, BACKUP_DIR_NAME)
+    objects_dir = os.path.join(backup_dir, OBJECTS_DIR_NAME)
+    os.makedirs(objects_dir, exist_ok=True)
+    stats = {'folder': folder_path, 'generation': None, 'files': 0, 'stored': 0, 'bytes_stored': 0,
+             'linked': 0, 'copied': 0, 'removed': [], 'seconds': 0.0}
+
+    # Leftovers of an interrupted backup
+    for name in os.listdir(backup_dir):
+        if name.endswith('.tmp'):
+            shutil.rmtree(os.path.join(backup_dir, name), ignore_errors=True)
+    for name in os.listdir(objects_dir):
+        if name.endswith('.tmp'):
+            os.remove(os.path.join(objects_dir, name))
+
+    existing = list_generations(backup_dir)
+    previous = _read_manifest(os.path.join(backup_dir, existing[-1])) if existing else {}
+    files = scan_folder(folder_path)
+    stats['files'] = len(files)
+
+    manifest = {}
+    changed = False
+    for relpath, (size, mtime) in files.items():
+        entry = previous.get(relpath)
+        if (entry and (entry['size'], entry['mtime']) == (size, mtime)
+                and os.path.exists(_object_path(objects_dir, entry['hash']))):
+            manifest[relpath] = entry
+            continue
+        try:
+            content_hash, stored = _store_object(os.path.join(folder_path, relpath), objects_dir)
+        except OSError as e:
+            logging.warning(f"Could not back up {relpath} from {folder_path}: {e}")
+            continue
+        manifest[relpath] = {'size': size, 'mtime': mtime, 'hash': content_hash}
+        if stored:
+            stats['stored'] += 1
+            stats['bytes_stored'] += size
+        if not entry or entry['hash'] != content_hash:
+            changed = True
+    if not changed and set(manifest) == set(previous):
+        if existing and manifest != previous:
+            # Only modification times moved (e.g. a re-sync); record them so the files aren't read again
+            with open(os.path.join(backup_dir, existing[-1], MANIFEST_NAME), 'w') as f:
+                json.dump(manifest, f)
+        logging.info(f"Backup of {folder_path} is up to date ({existing[-1] if existing else 'no files'})")
+    else:
+        generation = time.strftime(GENERATION_FORMAT)
+        while generation in existing:
+            time.sleep(1)
+            generation = time.strftime(GENERATION_FORMAT)
+        temp_dir = os.path.join(backup_dir, generation + '.tmp')
+        os.makedirs(temp_dir)
+        for relpath, entry in manifest.items():
+            target = os.path.join(temp_dir, relpath)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if _link_or_copy(_object_path(objects_dir, entry['hash']), target):
+                stats['linked'] += 1
+            else:
+                stats['copied'] += 1
+        with open(os.path.join(temp_dir, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f)
+        os.replace(temp_dir, os.path.join(backup_dir, generation))
+        existing.append(generation)
+        stats['generation'] = generation
+
+    stats['removed'] = prune_generations(backup_dir, generations, max_age_days)
+    remove_legacy_backups(folder_path)
+    stats['seconds'] = round(time.perf_counter() - started, 3)
+    logging.info(f"Backed up {folder_path}: generation {stats['generation']}, {stats['bytes_stored']} bytes "
+                 f"stored, {len(stats['removed'])} old generations removed in {stats['seconds']}s")
+    return stats
+
+
+def prune_generations(backup_dir, generations=DEFAULT_GENERATIONS, max_age_days=DEFAULT_MAX_AGE_DAYS):
+    """Drop the generations the retention rules no longer keep, then the objects none of them use"""
+    existing = list_generations(backup_dir)
+    keep = set(existing[-max(1, generations):]) if generations else set(existing)
+    if max_age_days:
+        cutoff = time.time() - max_age_days * 86400
+        keep = {name for name in keep if time.mktime(time.strptime(name, GENERATION_FORMAT)) >= cutoff}
+    if existing:
+        keep.add(existing[-1])
+    removed = [name for name in existing if name not in keep]
+    for name in removed:
+        shutil.rmtree(os.path.join(backup_dir, name), ignore_errors=True)
+
+    referenced = set()
+    for name in keep:
+        referenced.update(entry['hash'] for entry in _read_manifest(os.path.join(backup_dir, name)).values())
+    objects_dir = os.path.join(backup_dir, OBJECTS_DIR_NAME)
+    if os.path.isdir(objects_dir):
+        for prefix in os.listdir(objects_dir):
+            prefix_dir = os.path.join(objects_dir, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for content_hash in os.listdir(prefix_dir):
+                if content_hash not in referenced:
+                    try:
+                        os.remove(os.path.join(prefix_dir, content_hash))
+                    except OSError as e:
+                        logging.warning(f"Could not remove unused backup object {content_hash}: {e}")
+    return removed
+
+
+def remove_legacy_backups(folder_path):
+    """Remove the full "<config>_backup" copies that older versions kept next to the workbooks"""
+    for config_type in CONFIG_TABLES:
+        legacy_path = os.path.join(folder_path, f"{config_type}_backup")
+        if os.path.isdir(legacy_path):
+            logging.info(f"Removing legacy backup {legacy_path}")
+            shutil.rmtree(legacy_path, ignore_errors=True)
+
+
+class BackupWorker(threading.Thread):
+    """Backs up folders one at a time in the background.
+
+    A folder requested again while it is still waiting is backed up once, so
+    saving the goldlist, CarSys and Mag Glass paths to the same folder makes
+    a single generation.
+    """
+
+    def __init__(self, db_path='data.db'):
+        super().__init__(name='BackupWorker', daemon=True)
+        self.db_path = db_path
+        self.queue = Queue()
+        self.pending = set()
+        self.lock = threading.Lock()
+
+    def request(self, folder_path):
+        folder_path = os.path.normpath(folder_path)
+        with self.lock:
+            if folder_path in self.pending:
+                return
+            self.pending.add(folder_path)
+        self.queue.put(folder_path)
+
+    def run(self):
+        while True:
+            folder_path = self.queue.get()
+            with self.lock:
+                self.pending.discard(folder_path)
+            try:
+                backup_folder(folder_path, *get_backup_settings(self.db_path))
+            except Exception as e:
+                logging.error(f"Backup of {folder_path} failed: {e}")
+            finally:
+                self.queue.task_done()
+
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+
+def request_backup(folder_path, db_path='data.db'):
+    """Queue a background backup of a folder and return the worker doing it"""
+    with _workers_lock:
+        worker = _workers.get(db_path)
+        if worker is None:
+            worker = _workers[db_path] = BackupWorker(db_path)
+            worker.start()
+    worker.request(folder_path)
+    return worker
@@ -0,0 +1,83 @@
+import os
+import time
+import logging
+import threading
+
+from database_utils import load_saved_paths
+from import_engine import is_importable_file, resolve_import_folders
+
+# Seconds between scans of the watched folders
+POLL_SECONDS = 5
+
+# A folder must be quiet this long after its last change before it is imported,
+# so a sync client writing a batch of workbooks triggers a single import
+DEBOUNCE_SECONDS = 10
+
+
+def snapshot_folder(folder_path):
+    """Map each importable workbook in a folder to its (size, mtime)"""
+    snapshot = {}
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if entry.is_file() and is_importable_file(entry.name):
+                stat = entry.stat()
+                snapshot[entry.name] = (stat.st_size, stat.st_mtime)
+    return snapshot
+
+
+class FolderWatcher(threading.Thread):
+    """Polls the folders saved in the paths table for changed workbooks.
+
+    Once a changed folder has been quiet for ``debounce`` seconds,
+    ``on_change`` is called from the watcher thread with the configuration
+    types read from it. Unless fixed ``folders`` are given, folders are
+    re-read from the paths table on every scan, so paths saved in Manage
+    Lists are picked up without a restart.
+    """
+
+    def __init__(self, on_change, db_path='data.db', interval=POLL_SECONDS, debounce=DEBOUNCE_SECONDS,
+                 folders=None):
+        super().__init__(name='FolderWatcher', daemon=True)
+        self.on_change = on_change
+        self.db_path = db_path
+        self.folders = folders
+        self.interval = interval
+        self.debounce = debounce
+        self.snapshots = {}
+        self.pending = {}
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def scan(self):
+        """Scan the watched folders once and return the configuration types ready to import"""
+        folders = resolve_import_folders(self.folders or load_saved_paths(self.db_path))
+        now = time.monotonic()
+        for folder_path in set(folders.values()):
+            try:
+                snapshot = snapshot_folder(folder_path)
+            except OSError as e:
+                logging.debug(f"Cannot scan watched folder {folder_path}: {e}")
+                continue
+            previous = self.snapshots.get(folder_path)
+            self.snapshots[folder_path] = snapshot
+            # The first scan of a folder only records its state
+            if previous is not None and snapshot != previous:
+                self.pending[folder_path] = now
+        ready = {folder_path for folder_path, changed in self.pending.items() if now - changed >= self.debounce}
+        for folder_path in ready:
+            del self.pending[folder_path]
+        return [config_type for config_type, folder_path in folders.items() if folder_path in ready]
+
+    def run(self):
+        logging.info(f"Watching the saved folders every {self.interval}s")
+        self.scan()
+        while not self._stop_event.wait(self.interval):
+            try:
+                config_types = self.scan()
+                if config_types:
+                    logging.info(f"Workbooks changed for {', '.join(config_types)}")
+                    self.on_change(config_types)
+            except Exception as e:
+                logging.error(f"Folder watcher error: {e}")
@@ -0,0 +1,212 @@
+"""Headless importer for scheduled rebuilds of data.db.
+
+Imports the workbooks in the folders saved in the paths table (or the folders
+given with --folder) without starting the GUI, and prints a JSON report with
+per-file timings, row counts and errors. Exits with 1 when any workbook failed
+and 2 when the import was interrupted. With --watch it keeps running after the
+import and incrementally imports workbooks as they change, printing one report
+per line. An interrupted import keeps its progress, and running the same
+import again (or --resume) picks it up from the last checkpoint. Every import
+records the rows it added, removed and modified; --changelog lists the recent
+generations and --generation prints the rows one of them changed.
+
+    python import_cli.py --db data.db
+    python import_cli.py --folder blacklist=D:/Lists/Black --folder goldlist=D:/Lists/Gold --incremental
+    python import_cli.py --generation 12 --make Honda
+"""
+import sys
+import json
+import time
+import signal
+import logging
+import argparse
+import threading
+from queue import Queue, Empty
+
+from database_utils import initialize_db, load_saved_paths
+from changelog import recent_generations, generation_changes
+from import_engine import IMPORT_ORDER, build_import_jobs, run_import, interrupted_imports
+from folder_watcher import FolderWatcher
+from preflight import preflight_jobs, loadable_jobs
+from spreadsheet_readers import EXCEL_ENGINES, select_reader_engine
+
+
+def parse_folder(value):
+    """Parse a --folder CONFIG=PATH argument"""
+    config_type, sep, folder_path = value.partition('=')
+    if not sep or config_type not in IMPORT_ORDER or not folder_path:
+        raise argparse.ArgumentTypeError(
+            f"expected CONFIG=PATH with CONFIG one of {', '.join(IMPORT_ORDER)}, got {value!r}")
+    return config_type, folder_path
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Import the AnalyzerPlus workbooks without the GUI.")
+    parser.add_argument('--db', default='data.db', help="database to import into (default: data.db)")
+    parser.add_argument('--folder', action='append', type=parse_folder, default=[], metavar='CONFIG=PATH',
+                        help="import CONFIG from PATH instead of the saved paths; may be repeated")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only import new or changed workbooks instead of rebuilding every table")
+    parser.add_argument('--resume', action='store_true',
+                        help="finish the imports that were interrupted instead of importing the saved folders")
+    parser.add_argument('--workers', type=int, help="parser processes (default: the import_workers setting)")
+    parser.add_argument('--memory-mb', type=int,
+                        help="memory budget in MB past which workbooks aren't parsed ahead of the writer; "
+                             "0 for unlimited (default: the import_memory_mb setting)")
+    stream = parser.add_mutually_exclusive_group()
+    stream.add_argument('--stream', dest='streaming', action='store_true', default=None,
+                        help="stream manufacturer charts row by row")
+    stream.add_argument('--no-stream', dest='streaming', action='store_false',
+                        help="parse manufacturer charts whole")
+    parser.add_argument('--reader', choices=EXCEL_ENGINES,
+                        help="Excel backend to parse with (default: the reader_engine setting)")
+    parser.add_argument('--benchmark-readers', action='store_true',
+                        help="time the installed Excel backends on a sample of the workbooks, save the fastest "
+                             "one with identical output and print the results without importing")
+    parser.add_argument('--preflight', action='store_true',
+                        help="scan sheet names and headers first and skip the workbooks that can't be loaded, "
+                             "keeping their rows")
+    parser.add_argument('--preflight-only', action='store_true',
+                        help="print the per-folder preflight report without importing anything")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep watching the folders and import changed workbooks until interrupted")
+    parser.add_argument('--changelog', nargs='?', const='', metavar='CONFIG',
+                        help="print the recent import generations, optionally of one list, without importing")
+    parser.add_argument('--generation', type=int,
+                        help="print the rows an import generation added, removed and modified without importing")
+    parser.add_argument('--make', help="with --generation, only print the changes to this make")
+    parser.add_argument('--output', help="write the JSON report to this file instead of stdout")
+    parser.add_argument('--verbose', action='store_true', help="log progress to stderr")
+    return parser
+
+
+def make_report(report, args, folders, skipped, started_at, preflight=None):
+    """Turn a run_import report into the JSON-serialisable CLI report"""
+    files = report['files']
+    result = {
+        'db': args.db,
+        'mode': 'incremental' if args.incremental else 'rebuild',
+        'started_at': started_at,
+        'seconds': report['seconds'],
+        'workers': report.get('workers'),
+        'reader_engine': report.get('reader_engine'),
+        'cancelled': report['cancelled'],
+        'folders': folders,
+        'loaded': sorted(report['loaded']),
+        'rows': sum(entry['rows'] for entry in files),
+        'errors': sum(1 for entry in files if entry['error']),
+        'unchanged': report['unchanged'],
+        'removed': report['removed'],
+        'resumed': report['resumed'],
+        'changes': report.get('changes'),
+        'deduplication': report.get('deduplication'),
+        'memory': report.get('memory'),
+        'pipeline': report.get('pipeline'),
+        'skipped': [{'config_type': config_type, 'folder': folder_path, 'reason': reason}
+                    for config_type, folder_path, reason in skipped],
+        'files': files,
+    }
+    if preflight is not None:
+        result['preflight'] = preflight
+    return result
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, stream=sys.stderr,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    initialize_db(args.db)
+    if args.changelog is not None:
+        write_report({'db': args.db, 'generations': recent_generations(args.db, args.changelog or None)}, args.output)
+        return 0
+    if args.generation is not None:
+        changes = generation_changes(args.db, args.generation, args.make)
+        write_report({'db': args.db, 'generation': args.generation, 'make': args.make, 'changes': changes},
+                     args.output)
+        return 0
+
+    if args.resume:
+        jobs, args.incremental = interrupted_imports(args.db)
+        folders = {config_type: folder_path for config_type, folder_path, _ in jobs}
+        skipped = []
+    else:
+        folders = dict(args.folder) if args.folder else load_saved_paths(args.db)
+        jobs, skipped = build_import_jobs(folders)
+    for config_type, folder_path, reason in skipped:
+        logging.info(f"Skipping {config_type}: {reason}{f' ({folder_path})' if folder_path else ''}")
+
+    if args.benchmark_readers:
+        engine, results = select_reader_engine(jobs, args.db)
+        write_report({'db': args.db, 'selected': engine, 'readers': results}, args.output)
+        return 0
+
+    preflight = None
+    held_back = None
+    if args.preflight or args.preflight_only:
+        preflight = preflight_jobs(jobs, args.workers, args.db)
+        if args.preflight_only:
+            write_report({'db': args.db, 'folders': folders, 'preflight': preflight}, args.output)
+            return 0
+        jobs, held_back = loadable_jobs(jobs, preflight)
+
+    # SIGINT/SIGTERM stop the import at the next checkpoint and leave the live tables as they were
+    cancel_event = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: cancel_event.set())
+
+    def log_progress(progress):
+        if progress['file']:
+            logging.info(f"[{progress['files_done']}/{progress['files_total']}] {progress['file']}")
+
+    started_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+    report = run_import(jobs, db_path=args.db, workers=args.workers, progress_callback=log_progress,
+                        incremental=args.incremental, streaming=args.streaming, cancel_event=cancel_event,
+                        reader_engine=args.reader, memory_budget_mb=args.memory_mb, held_back=held_back)
+    result = make_report(report, args, folders, skipped, started_at, preflight)
+    write_report(result, args.output, indent=None if args.watch else 2)
+    if args.watch and not result['cancelled']:
+        watch(args, cancel_event, log_progress)
+
+    if result['cancelled']:
+        return 2
+    return 1 if result['errors'] else 0
+
+
+def write_report(result, output=None, indent=2):
+    text = json.dumps(result, indent=indent, default=str)
+    if output:
+        with open(output, 'a' if indent is None else 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text, flush=True)
+
+
+def watch(args, cancel_event, log_progress):
+    """Import changed workbooks incrementally until cancel_event is set"""
+    changes = Queue()
+    watcher = FolderWatcher(changes.put, args.db, folders=dict(args.folder) if args.folder else None)
+    watcher.start()
+    args.incremental = True
+    try:
+        while not cancel_event.is_set():
+            try:
+                config_types = set(changes.get(timeout=1))
+            except Empty:
+                continue
+            # Fold in everything else that is already queued
+            while not changes.empty():
+                config_types.update(changes.get())
+            folders = dict(args.folder) if args.folder else load_saved_paths(args.db)
+            jobs, skipped = build_import_jobs(folders, config_types)
+            started_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+            report = run_import(jobs, db_path=args.db, workers=args.workers, progress_callback=log_progress,
+                                incremental=True, streaming=args.streaming, cancel_event=cancel_event,
+                                reader_engine=args.reader, memory_budget_mb=args.memory_mb)
+            write_report(make_report(report, args, folders, skipped, started_at), args.output, indent=None)
+    finally:
+        watcher.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
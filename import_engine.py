@@ -0,0 +1,1413 @@
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from queue import Queue, Empty, Full
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from database_utils import load_setting_from_db
+from db_connections import connect, read_connection
+from parse_cache import get_cache_settings, read_cached_frame, write_cached_frame, evict_parse_cache
+from dataset_schemas import (
+    SCHEMAS, apply_schema, compact_frame, storage_frame, normalize_value, record_hash, resolve_columns, schema_columns
+)
+from changelog import initialize_changelog_tables, log_changes
+from dtc_search import initialize_dtc_search, sync_dtc_search, DTC_SEARCH_TABLES
+from spreadsheet_readers import (
+    DelimitedWorkbook, open_workbook, read_sheet, is_delimited, resolve_reader_engine
+)
+
+# Table written by each configuration type. CarSys and Mag Glass are read
+# from the goldlist workbooks but are tracked as configurations of their own.
+CONFIG_TABLES = {
+    'blacklist': 'blacklist',
+    'goldlist': 'goldlist',
+    'CarSys': 'carsys',
+    'mag_glass': 'mag_glass',
+    'prequal': 'prequal',
+    'manufacturer_chart': 'manufacturer_chart',
+}
+
+MAG_GLASS_TABLE_SQL = (
+    'CREATE TABLE IF NOT EXISTS mag_glass (id INTEGER PRIMARY KEY, '
+    + ', '.join(f'"{col}" TEXT' for col in schema_columns('mag_glass'))
+    + ', source_file TEXT)'
+)
+
+# Prequal records keep their longsheet columns typed; any other columns go in extra as JSON
+PREQUAL_TABLE_SQL = (
+    'CREATE TABLE IF NOT EXISTS prequal (id INTEGER PRIMARY KEY, folder_path TEXT, '
+    + ', '.join(f'"{col}" {"INTEGER" if col == "Year" else "TEXT"}' for col in schema_columns('prequal'))
+    + ', extra TEXT, source_file TEXT, row_hash TEXT, source_files TEXT)'
+)
+
+# The chart's Year is an integer, so 2021 and 2021.0 in the workbooks are the same year
+MANUFACTURER_CHART_TABLE_SQL = (
+    'CREATE TABLE IF NOT EXISTS manufacturer_chart (id INTEGER PRIMARY KEY AUTOINCREMENT, '
+    + ', '.join(f'{col} {"INTEGER" if col == "Year" else "TEXT"}' for col in schema_columns('manufacturer_chart'))
+    + ', source_file TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)'
+)
+
+# Files smaller than this are treated as unsynced SharePoint placeholders
+PLACEHOLDER_SIZE = 1024
+
+# Rows held in memory at a time when streaming a manufacturer chart
+STREAM_CHUNK_ROWS = 5000
+
+# Imports load "<table>_staging" and rename it over the live table once complete
+STAGING_SUFFIX = '_staging'
+
+# Tables an incremental import refreshes one source workbook at a time. Their
+# staging table holds only the rows of the changed workbooks, which replace
+# those workbooks' rows in the live table, so a new OEM chart rewrites that
+# OEM's rows instead of copying the whole table.
+PARTITIONED_CONFIGS = {'manufacturer_chart'}
+
+# Tables that store each distinct record once, keyed by a hash of the
+# normalized record, with the list of workbooks it appears in. Removing a
+# workbook only deletes the records no other workbook still holds.
+DEDUPLICATED_CONFIGS = {'prequal'}
+
+# Share of a DTC list's rows an import may rewrite in place (see
+# merge_staging_table); past it the staging table is swapped in and the
+# search indexes rebuilt, which costs less than firing their triggers per row
+MERGE_MAX_CHANGES = 0.5
+
+# Rows passed to each executemany call when bulk loading
+BULK_BATCH_ROWS = 50000
+
+# Rows written between import journal checkpoints
+CHECKPOINT_ROWS = 50000
+
+# Row batches parsed ahead of the writer. The parsers wait while the queue is
+# full, so memory stays bounded however far ahead of the writes parsing gets.
+PIPELINE_QUEUE_SIZE = 8
+
+# Default memory budget of an import in MB (the app plus its parser
+# processes). Past it, workbooks are no longer parsed ahead of the writer.
+DEFAULT_MEMORY_BUDGET_MB = 2048
+
+# Connection settings used while bulk loading. synchronous is left at the
+# connection's own setting: with it OFF a power cut mid-load could corrupt
+# data.db, not just lose the load.
+BULK_LOAD_PRAGMAS = {
+    'temp_store': 'MEMORY',
+    'cache_size': -65536,
+}
+
+
+# Schema (see dataset_schemas) and sheet read by each configuration type. A
+# sheet is a name or an index; a list holds candidates tried in order.
+CONFIG_DATASETS = {
+    'blacklist': 'dtc_list',
+    'goldlist': 'dtc_list',
+    'CarSys': 'carsys',
+    'mag_glass': 'mag_glass',
+    'prequal': 'prequal',
+    'manufacturer_chart': 'manufacturer_chart',
+}
+CONFIG_SHEETS = {
+    'blacklist': 1,
+    'goldlist': 1,
+    'CarSys': 0,
+    'mag_glass': 'Mag Glass',
+    'prequal': 0,
+    'manufacturer_chart': ['Model Version', 0],
+}
+
+# Configuration types in the order an import loads them. CarSys and Mag Glass
+# are read from the goldlist folder unless they have a folder of their own.
+IMPORT_ORDER = ['blacklist', 'goldlist', 'prequal', 'mag_glass', 'CarSys', 'manufacturer_chart']
+GOLDLIST_SHEETS = ['mag_glass', 'CarSys']
+
+# Sheets exported as CSV or TSV are imported like single-sheet workbooks
+EXCEL_FILE_PATTERN = re.compile(r'(.+)\.(xlsx|csv|tsv)$', re.IGNORECASE)
+SKIP_FILE_PATTERN = re.compile(r'.*X\.X\.xlsx$', re.IGNORECASE)
+# Office ("~$Book.xlsx") and LibreOffice (".~lock.Book.xlsx#") lock files and
+# hidden sync-client temporaries are never workbooks of our own
+TEMP_FILE_PREFIXES = ('~', '.')
+
+
+def is_importable_file(file_name):
+    """Check whether a file name is a workbook an import should read"""
+    return bool(EXCEL_FILE_PATTERN.match(file_name) and not SKIP_FILE_PATTERN.match(file_name)
+                and not file_name.startswith(TEMP_FILE_PREFIXES))
+
+
+def get_valid_excel_files(folder_path):
+    """Map the names of the importable workbooks in a folder to their full paths"""
+    valid_files = {}
+    for file_name in os.listdir(folder_path):
+        if is_importable_file(file_name):
+            valid_files[file_name] = os.path.join(folder_path, file_name)
+    if not valid_files:
+        logging.error("No valid Excel files found.")
+    return valid_files
+
+
+def resolve_import_folders(folders):
+    """Fill in the goldlist folder for CarSys and Mag Glass when they have none of their own"""
+    resolved = {}
+    for config_type in IMPORT_ORDER:
+        folder_path = folders.get(config_type)
+        if not folder_path and config_type in GOLDLIST_SHEETS:
+            folder_path = folders.get('goldlist')
+        if folder_path:
+            resolved[config_type] = folder_path
+    return resolved
+
+
+def build_import_jobs(folders, config_types=None):
+    """Turn a {config_type: folder} mapping into run_import jobs.
+
+    ``config_types`` limits the jobs to those configurations. Returns
+    ``(jobs, skipped)`` where ``skipped`` lists ``(config_type, folder,
+    reason)`` for configurations that have nothing to import.
+    """
+    jobs = []
+    skipped = []
+    folders = resolve_import_folders(folders)
+    for config_type in IMPORT_ORDER:
+        if config_types is not None and config_type not in config_types:
+            continue
+        folder_path = folders.get(config_type)
+        if not folder_path:
+            skipped.append((config_type, None, 'No folder configured'))
+            continue
+        if not os.path.isdir(folder_path):
+            skipped.append((config_type, folder_path, 'Folder not found'))
+            continue
+        files = get_valid_excel_files(folder_path)
+        if not files:
+            skipped.append((config_type, folder_path, 'No valid Excel files found'))
+            continue
+        jobs.append((config_type, folder_path, files))
+    return jobs, skipped
+
+
+def select_sheet(sheet_names, config_type):
+    """Get the name of the sheet a configuration type reads, or None if the workbook lacks it"""
+    candidates = CONFIG_SHEETS[config_type]
+    for candidate in candidates if isinstance(candidates, list) else [candidates]:
+        if isinstance(candidate, int):
+            if candidate < len(sheet_names):
+                return sheet_names[candidate]
+        elif candidate in sheet_names:
+            return candidate
+    return None
+
+
+def get_import_worker_count(db_path='data.db'):
+    """Get the number of parser processes to use for an import"""
+    try:
+        workers = int(load_setting_from_db('import_workers', 0, db_path))
+    except (TypeError, ValueError):
+        workers = 0
+    if workers <= 0:
+        # Leave one core free for the GUI
+        workers = max(1, (os.cpu_count() or 2) - 1)
+    return workers
+
+
+def get_memory_budget_mb(db_path='data.db'):
+    """Get the memory budget of an import in MB; 0 means unlimited"""
+    try:
+        budget = int(load_setting_from_db('import_memory_mb', DEFAULT_MEMORY_BUDGET_MB, db_path))
+    except (TypeError, ValueError):
+        budget = DEFAULT_MEMORY_BUDGET_MB
+    return max(0, budget)
+
+
+# Parsers take a workbook path or a workbook opened with spreadsheet_readers.open_workbook
+
+def parse_dtc_list(excel_path):
+    """Parse the DTC sheet (second sheet) of a blacklist or goldlist workbook"""
+    return apply_schema(read_sheet(excel_path, sheet_name=1), 'dtc_list')
+
+
+def parse_carsys(excel_path):
+    """Parse the CarSys sheet (first sheet, columns A:D) of a goldlist workbook"""
+    return apply_schema(read_sheet(excel_path, sheet_name=0, usecols="A:D", header=0), 'carsys')
+
+
+def parse_mag_glass(excel_path):
+    """Parse the 'Mag Glass' sheet of a goldlist workbook"""
+    return apply_schema(read_sheet(excel_path, sheet_name="Mag Glass"), 'mag_glass')
+
+
+def parse_prequal(excel_path):
+    """Parse the first sheet of a prequal longsheet"""
+    return apply_schema(read_sheet(excel_path), 'prequal')
+
+
+def current_rss_mb():
+    """Get the resident memory of this process in MB, or None if unavailable"""
+    if psutil:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def check_placeholder(excel_path):
+    """Raise if a workbook looks like an unsynced SharePoint placeholder"""
+    file_size = os.path.getsize(excel_path)
+    if file_size < PLACEHOLDER_SIZE:
+        raise ValueError(f"File appears to be a placeholder or empty (size: {file_size} bytes)")
+
+
+def iter_manufacturer_chart_chunks(excel_path, chunk_size=STREAM_CHUNK_ROWS, skip_rows=0):
+    """Yield lists of manufacturer chart rows without loading the whole sheet.
+
+    Uses openpyxl's read-only mode (or the csv module for a CSV/TSV export)
+    so only the current row is materialised. Rows are raw value tuples in the manufacturer_chart schema's column order;
+    blank rows are skipped, as are the first ``skip_rows`` non-blank rows when
+    resuming a load.
+    """
+    from openpyxl import load_workbook
+
+    check_placeholder(excel_path)
+    if is_delimited(excel_path):
+        wb = DelimitedWorkbook(excel_path)
+        rows = wb.iter_rows()
+    else:
+        wb = load_workbook(excel_path, read_only=True, data_only=True)
+        rows = wb[select_sheet(wb.sheetnames, 'manufacturer_chart')].iter_rows(values_only=True)
+    try:
+        # Headers are resolved once; each row is then picked apart by position
+        header = [col if col is not None else '' for col in next(rows, ())]
+        resolved = resolve_columns(header, 'manufacturer_chart')
+        positions = [header.index(resolved[col]) if col in resolved else None
+                     for col in schema_columns('manufacturer_chart')]
+
+        chunk = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            if skip_rows:
+                skip_rows -= 1
+                continue
+            values = [row[i] if i is not None and i < len(row) else '' for i in positions]
+            chunk.append(tuple(values))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        rows.close()
+        wb.close()
+
+
+def begin_bulk_load(conn):
+    """Apply BULK_LOAD_PRAGMAS and return the previous values for end_bulk_load"""
+    cursor = conn.cursor()
+    previous = {}
+    for name, value in BULK_LOAD_PRAGMAS.items():
+        previous[name] = cursor.execute(f"PRAGMA {name}").fetchone()[0]
+        cursor.execute(f"PRAGMA {name} = {value}")
+    return previous
+
+
+def end_bulk_load(conn, previous):
+    """Restore the connection settings changed by begin_bulk_load.
+
+    Work left uncommitted (a failed load) is rolled back first, as SQLite
+    refuses to change these settings inside a transaction.
+    """
+    if conn.in_transaction:
+        conn.rollback()
+    cursor = conn.cursor()
+    for name, value in previous.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def insert_manufacturer_chart(cursor, chart, source_file=None, batch_size=BULK_BATCH_ROWS,
+                              table_name='manufacturer_chart'):
+    """Bulk insert a cleaned manufacturer chart frame in executemany batches.
+
+    The caller owns the transaction. Returns the number of rows inserted.
+    """
+    columns = schema_columns('manufacturer_chart')
+    values = chart[columns]
+    if source_file is not None:
+        columns.append('source_file')
+        values = values.assign(source_file=source_file)
+    insert_sql = (f"INSERT INTO {table_name} ({', '.join(columns)}) "
+                  f"VALUES ({', '.join('?' for _ in columns)})")
+    rows = values.itertuples(index=False, name=None)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        cursor.executemany(insert_sql, batch)
+    return len(values)
+
+
+def parse_manufacturer_chart(excel_path, engine=None):
+    """Parse the 'Model Version' sheet (or the first sheet) of a manufacturer chart"""
+    if not isinstance(excel_path, (pd.ExcelFile, DelimitedWorkbook)):
+        check_placeholder(excel_path)
+        with open_workbook(excel_path, engine) as workbook:
+            return parse_manufacturer_chart(workbook)
+    sheet = select_sheet(excel_path.sheet_names, 'manufacturer_chart')
+    return apply_schema(read_sheet(excel_path, sheet_name=sheet), 'manufacturer_chart')
+
+
+PARSERS = {
+    'blacklist': parse_dtc_list,
+    'goldlist': parse_dtc_list,
+    'CarSys': parse_carsys,
+    'mag_glass': parse_mag_glass,
+    'prequal': parse_prequal,
+    'manufacturer_chart': parse_manufacturer_chart,
+}
+
+
+def initialize_import_tables(cursor):
+    """Create the import manifest and tag data tables with their source workbook"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS import_manifest (
+            config_type TEXT,
+            file_path TEXT,
+            file_size INTEGER,
+            mtime REAL,
+            content_hash TEXT,
+            row_count INTEGER,
+            imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (config_type, file_path)
+        );
+    ''')
+    # Progress of the import filling the staging tables. The row with an empty
+    # file_path records how a configuration's staging table was started.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS import_journal (
+            config_type TEXT,
+            file_path TEXT,
+            folder_path TEXT,
+            incremental INTEGER,
+            file_size INTEGER,
+            mtime REAL,
+            content_hash TEXT,
+            row_offset INTEGER DEFAULT 0,
+            row_count INTEGER DEFAULT 0,
+            done INTEGER DEFAULT 0,
+            streamed INTEGER,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (config_type, file_path)
+        );
+    ''')
+    cursor.execute("PRAGMA table_info(import_journal)")
+    if 'streamed' not in [row[1] for row in cursor.fetchall()]:
+        # Older journals did not record how a workbook was read
+        cursor.execute("ALTER TABLE import_journal ADD COLUMN streamed INTEGER")
+    for table_name in CONFIG_TABLES.values():
+        cursor.execute(f"PRAGMA table_info({table_name})")
+        columns = [row[1] for row in cursor.fetchall()]
+        if not columns:
+            continue
+        if table_name == 'mag_glass' and not set(schema_columns('mag_glass')) <= set(columns):
+            # Older databases shaped Mag Glass after whichever workbook was loaded last
+            cursor.execute('DROP TABLE mag_glass')
+            cursor.execute(MAG_GLASS_TABLE_SQL)
+            cursor.execute("DELETE FROM import_manifest WHERE config_type = 'mag_glass'")
+            logging.info("Recreated mag_glass with the schema registry's columns")
+            continue
+        if table_name == 'prequal' and 'extra' not in columns:
+            # Older databases stored each record as JSON in a data column
+            _migrate_prequal(cursor, columns)
+        elif table_name == 'manufacturer_chart' and _column_type(cursor, table_name, 'Year') != 'INTEGER':
+            # Older databases stored the chart's years as text such as '2021.0'
+            _migrate_manufacturer_chart(cursor, columns)
+        elif 'source_file' not in columns:
+            cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN source_file TEXT")
+            logging.info(f"Added source_file column to {table_name}")
+        if table_name in ['blacklist', 'goldlist', 'prequal', 'manufacturer_chart']:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table_name}_source_file ON {table_name} (source_file)")
+        if table_name == 'prequal':
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_prequal_row_hash ON prequal (row_hash)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_prequal_vehicle ON prequal (Year, Make, Model)")
+        if table_name == 'manufacturer_chart':
+            # Cover the dropdown and CMC lookups; makes are matched case-insensitively
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_manufacturer_chart_make_year "
+                           "ON manufacturer_chart (Make COLLATE NOCASE, Year, Model)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_manufacturer_chart_year_make "
+                           "ON manufacturer_chart (Year, Make COLLATE NOCASE)")
+    initialize_changelog_tables(cursor)
+    initialize_dtc_search(cursor)
+
+
+def _migrate_prequal(cursor, columns):
+    """Move the prequal records older versions stored as JSON into the typed table"""
+    # An interrupted import staged rows in the old layout
+    cursor.execute('DROP TABLE IF EXISTS prequal' + STAGING_SUFFIX)
+    cursor.execute("DELETE FROM import_journal WHERE config_type = 'prequal'")
+    cursor.execute('ALTER TABLE prequal RENAME TO prequal_legacy')
+    cursor.execute(PREQUAL_TABLE_SQL)
+    sources = 'source_files' if 'source_files' in columns else 'NULL'
+    source_file = 'source_file' if 'source_file' in columns else 'NULL'
+    cursor.execute(f"SELECT folder_path, data, {source_file}, {sources} FROM prequal_legacy")
+    by_file = {}
+    for folder_path, data, filepath, source_files in cursor.fetchall():
+        try:
+            records = json.loads(data) or []
+        except (TypeError, ValueError):
+            continue
+        # Deduplicated tables hold one record per row, older ones a list per workbook
+        if isinstance(records, dict):
+            records = [records]
+        for path in (json.loads(source_files) if source_files else [filepath]):
+            by_file.setdefault(path, (folder_path, []))[1].extend(records)
+    migrated = 0
+    for filepath, (folder_path, records) in by_file.items():
+        migrated += write_frame(cursor, 'prequal', folder_path, filepath,
+                                apply_schema(pd.DataFrame(records), CONFIG_DATASETS['prequal']))
+    cursor.execute('DROP TABLE prequal_legacy')
+    logging.info(f"Moved {migrated} prequal records into the typed prequal table")
+
+
+def _column_type(cursor, table_name, column):
+    cursor.execute(f"PRAGMA table_info({table_name})")
+    return next((row[2].upper() for row in cursor.fetchall() if row[1] == column), None)
+
+
+def _migrate_manufacturer_chart(cursor, columns):
+    """Rebuild a manufacturer chart with a text Year so its years are stored as integers"""
+    cursor.execute('DROP TABLE IF EXISTS manufacturer_chart' + STAGING_SUFFIX)
+    cursor.execute("DELETE FROM import_journal WHERE config_type = 'manufacturer_chart'")
+    cursor.execute('ALTER TABLE manufacturer_chart RENAME TO manufacturer_chart_legacy')
+    cursor.execute(MANUFACTURER_CHART_TABLE_SQL)
+    kept = [col for col in ['id'] + schema_columns('manufacturer_chart') + ['source_file', 'created_at']
+            if col in columns]
+    # The INTEGER column turns '2021' and '2021.0' into 2021 and keeps any other text as it is
+    selected = ', '.join('TRIM(Year)' if col == 'Year' else col for col in kept)
+    cursor.execute(f"INSERT INTO manufacturer_chart ({', '.join(kept)}) "
+                   f"SELECT {selected} FROM manufacturer_chart_legacy")
+    migrated = cursor.rowcount
+    cursor.execute('DROP TABLE manufacturer_chart_legacy')
+    logging.info(f"Stored the years of {migrated} manufacturer chart rows as integers")
+
+
+def file_hash(path):
+    """Get the SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    """Get the (size, mtime, content hash) recorded in the import manifest"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime, file_hash(path)
+
+
+def parse_workbook(excel_path, config_types, cache_dir=None, engine=None):
+    """Parse one workbook for every configuration type that reads from it.
+
+    The workbook is opened once and each parser reads only its own sheet, so a
+    goldlist workbook feeds the goldlist, CarSys and Mag Glass tables from a
+    single pass. With ``cache_dir`` sheets already parsed from a workbook with
+    the same content are read from the parse cache, and the workbook is not
+    opened at all when every sheet is cached. ``engine`` is the Excel backend
+    (see spreadsheet_readers). Frames are compacted (see
+    dataset_schemas.compact_frame) before they are cached or returned.
+    Returns ``(frames, fingerprint, error, stats)`` where ``frames`` maps each
+    configuration type to ``(df, error)`` and ``stats`` holds the parse time
+    and the process id and resident memory of the process that parsed it.
+
+    Runs inside the worker processes, so it must stay importable without Qt and
+    must only return picklable values.
+    """
+    started = time.perf_counter()
+
+    def stats():
+        return {'seconds': time.perf_counter() - started, 'pid': os.getpid(), 'rss_mb': current_rss_mb()}
+
+    frames = {}
+    try:
+        fingerprint = file_fingerprint(excel_path)
+        if 'manufacturer_chart' in config_types:
+            check_placeholder(excel_path)
+        content_hash = fingerprint[2]
+        if cache_dir:
+            for config_type in config_types:
+                df = read_cached_frame(cache_dir, content_hash, config_type)
+                if df is not None:
+                    frames[config_type] = (df, None)
+        uncached = [config_type for config_type in config_types if config_type not in frames]
+        if uncached:
+            with open_workbook(excel_path, engine) as workbook:
+                for config_type in uncached:
+                    try:
+                        df = compact_frame(PARSERS[config_type](workbook), CONFIG_DATASETS[config_type])
+                        frames[config_type] = (df, None)
+                        if cache_dir:
+                            write_cached_frame(cache_dir, content_hash, config_type, df)
+                    except Exception as e:
+                        frames[config_type] = (None, str(e))
+        return frames, fingerprint, None, stats()
+    except Exception as e:
+        return frames, None, str(e), stats()
+
+
+def plan_incremental_import(cursor, config_type, files, held_back=()):
+    """Work out which workbooks changed since they were last imported.
+
+    Returns ``(changed, removed)``: the files that need to be parsed again and
+    the manifest paths whose workbooks are gone. Workbooks in ``held_back``
+    are still in the folder but left out of this import (e.g. rejected by
+    the preflight), so they are not taken for removed ones. Returns None when
+    the table must be rebuilt, i.e. it is missing or holds rows without a
+    source file (or, for a deduplicated table, without a record hash).
+    """
+    table_name = CONFIG_TABLES[config_type]
+    untracked = 'source_file IS NULL OR row_hash IS NULL' if config_type in DEDUPLICATED_CONFIGS else 'source_file IS NULL'
+    try:
+        cursor.execute(f"SELECT 1 FROM {table_name} WHERE {untracked} LIMIT 1")
+        if cursor.fetchone():
+            return None
+    except sqlite3.OperationalError:
+        return None
+
+    cursor.execute(
+        'SELECT file_path, file_size, mtime, content_hash FROM import_manifest WHERE config_type = ?',
+        (config_type,)
+    )
+    manifest = {row[0]: row[1:] for row in cursor.fetchall()}
+    changed = {}
+    for filename, filepath in files.items():
+        entry = manifest.get(filepath)
+        if entry:
+            stat = os.stat(filepath)
+            if (stat.st_size, stat.st_mtime) == (entry[0], entry[1]):
+                continue
+            # Touched but not edited (e.g. re-synced): only the mtime is stale
+            if file_hash(filepath) == entry[2]:
+                cursor.execute(
+                    'UPDATE import_manifest SET file_size = ?, mtime = ? WHERE config_type = ? AND file_path = ?',
+                    (stat.st_size, stat.st_mtime, config_type, filepath)
+                )
+                continue
+        changed[filename] = filepath
+    # Rows can outlive their manifest entry (e.g. after the manifest was cleared)
+    cursor.execute(f"SELECT DISTINCT source_file FROM {table_name}")
+    imported = set(manifest) | {row[0] for row in cursor.fetchall()}
+    paths = set(files.values()) | set(held_back)
+    removed = sorted(path for path in imported if path not in paths)
+    return changed, removed
+
+
+def _insert_frame(cursor, table_name, df):
+    columns = ', '.join(f'"{col}"' for col in df.columns)
+    placeholders = ', '.join('?' for _ in df.columns)
+    cursor.executemany(
+        f'INSERT INTO {table_name} ({columns}) VALUES ({placeholders})',
+        df.itertuples(index=False, name=None)
+    )
+
+
+def _write_deduplicated(cursor, table_name, dataset, folder_path, filepath, df):
+    """Store the records of a workbook that aren't stored yet and add the workbook to the sources of the rest"""
+    columns = schema_columns(dataset)
+    extra_column = SCHEMAS[dataset]['extra_column']
+    records = df.to_dict(orient='records')
+    hashes = [record_hash(record) for record in records]
+    stored = {}
+    distinct = list(dict.fromkeys(hashes))
+    for start in range(0, len(distinct), 500):
+        chunk = distinct[start:start + 500]
+        cursor.execute(f"SELECT row_hash, id, source_files FROM {table_name} "
+                       f"WHERE row_hash IN ({', '.join('?' for _ in chunk)})", chunk)
+        stored.update({row[0]: (row[1], json.loads(row[2] or '[]')) for row in cursor.fetchall()})
+    new_rows = {}
+    for record, row_hash in zip(records, hashes):
+        if row_hash in stored:
+            row_id, sources = stored[row_hash]
+            if filepath not in sources:
+                sources.append(filepath)
+                cursor.execute(f"UPDATE {table_name} SET source_files = ? WHERE id = ?", (json.dumps(sources), row_id))
+        elif row_hash not in new_rows:
+            extra = {key: value for key, value in record.items()
+                     if key not in columns and normalize_value(value) is not None}
+            new_rows[row_hash] = ((folder_path,) + tuple(record.get(column) for column in columns)
+                                  + (json.dumps(extra, default=str), filepath, row_hash, json.dumps([filepath])))
+    names = ', '.join(['folder_path'] + [f'"{column}"' for column in columns]
+                      + [extra_column, 'source_file', 'row_hash', 'source_files'])
+    cursor.executemany(
+        f"INSERT INTO {table_name} ({names}) VALUES ({', '.join('?' for _ in range(len(columns) + 5))})",
+        new_rows.values()
+    )
+    return len(records)
+
+
+def write_frame(cursor, config_type, folder_path, filepath, df, table_name=None):
+    """Write a parsed frame into its table (or ``table_name``) and return the number of rows read"""
+    table_name = table_name or CONFIG_TABLES[config_type]
+    if df.empty:
+        return 0
+    df = storage_frame(df, CONFIG_DATASETS[config_type])
+    if config_type in DEDUPLICATED_CONFIGS:
+        return _write_deduplicated(cursor, table_name, CONFIG_DATASETS[config_type], folder_path, filepath, df)
+    if config_type == 'manufacturer_chart':
+        return insert_manufacturer_chart(cursor, df, filepath, table_name=table_name)
+    df = df.assign(source_file=filepath)
+    _insert_frame(cursor, table_name, df)
+    return len(df)
+
+
+def _delete_source_rows(cursor, config_type, table_name, filepath):
+    if config_type not in DEDUPLICATED_CONFIGS:
+        cursor.execute(f"DELETE FROM {table_name} WHERE source_file = ?", (filepath,))
+        return
+    # Records other workbooks also hold stay, listed under their remaining sources
+    cursor.execute(f"SELECT {table_name}.id, source_files FROM {table_name}, json_each(source_files) "
+                   f"WHERE json_each.value = ?", (filepath,))
+    for row_id, source_files in cursor.fetchall():
+        sources = [source for source in json.loads(source_files) if source != filepath]
+        if sources:
+            cursor.execute(f"UPDATE {table_name} SET source_file = ?, source_files = ? WHERE id = ?",
+                           (sources[0], json.dumps(sources), row_id))
+        else:
+            cursor.execute(f"DELETE FROM {table_name} WHERE id = ?", (row_id,))
+    cursor.execute(f"DELETE FROM {table_name} WHERE source_file = ? AND source_files IS NULL", (filepath,))
+
+
+def _keep_source_rows(cursor, config_type, table_name, filepaths):
+    """Delete the rows of every workbook but ``filepaths`` from a copy of a live table"""
+    if config_type in DEDUPLICATED_CONFIGS:
+        cursor.execute(f"SELECT DISTINCT json_each.value FROM {table_name}, json_each({table_name}.source_files)")
+        sources = {row[0] for row in cursor.fetchall()}
+        cursor.execute(f"DELETE FROM {table_name} WHERE source_file IS NULL OR row_hash IS NULL")
+    else:
+        sources = set()
+        cursor.execute(f"DELETE FROM {table_name} WHERE source_file IS NULL")
+    cursor.execute(f"SELECT DISTINCT source_file FROM {table_name}")
+    sources.update(row[0] for row in cursor.fetchall())
+    for source in sources - set(filepaths):
+        _delete_source_rows(cursor, config_type, table_name, source)
+
+
+def deduplication_stats(cursor, config_type, manifest):
+    """Count the records read from a deduplicated table's workbooks against the distinct ones stored"""
+    table_name = CONFIG_TABLES[config_type]
+    cursor.execute(f"SELECT COUNT(*), COALESCE(SUM(json_array_length(source_files) > 1), 0) FROM {table_name}")
+    unique, shared = cursor.fetchone()
+    records = sum(entry[3] or 0 for entry in manifest.values())
+    return {'records': records, 'unique': unique, 'duplicates': max(0, records - unique), 'shared': shared}
+
+
+def _load_manifest(cursor, config_type):
+    cursor.execute(
+        'SELECT file_path, file_size, mtime, content_hash, row_count, imported_at '
+        'FROM import_manifest WHERE config_type = ?',
+        (config_type,)
+    )
+    return {row[0]: row[1:] for row in cursor.fetchall()}
+
+
+def _write_manifest(cursor, config_type, manifest):
+    cursor.execute('DELETE FROM import_manifest WHERE config_type = ?', (config_type,))
+    cursor.executemany('''
+        INSERT INTO import_manifest
+        (config_type, file_path, file_size, mtime, content_hash, row_count, imported_at)
+        VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+    ''', [(config_type, filepath) + tuple(entry) for filepath, entry in manifest.items()])
+
+
+def create_staging_table(cursor, table_name, copy_rows=False):
+    """Create ``<table>_staging`` with the live table's schema and return its name.
+
+    With ``copy_rows`` the live rows are copied across, so an incremental
+    refresh can edit the copy while readers keep using the live table.
+    """
+    staging = table_name + STAGING_SUFFIX
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+    row = cursor.fetchone()
+    if not row:
+        raise ValueError(f"Table {table_name} does not exist")
+    create_sql = re.sub(r'^\s*CREATE\s+TABLE\s+(IF\s+NOT\s+EXISTS\s+)?["`\[]?\w+["`\]]?',
+                        f'CREATE TABLE {staging}', row[0], count=1, flags=re.IGNORECASE)
+    cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+    cursor.execute(create_sql)
+    if copy_rows:
+        cursor.execute(f"INSERT INTO {staging} SELECT * FROM {table_name}")
+    return staging
+
+
+def swap_staging_table(cursor, table_name):
+    """Replace a live table with its staging table, recreating the live indexes.
+
+    Run inside a transaction so readers see either the old or the new table.
+    """
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                   (table_name,))
+    indexes = [row[0] for row in cursor.fetchall()]
+    cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+    cursor.execute(f"ALTER TABLE {table_name}{STAGING_SUFFIX} RENAME TO {table_name}")
+    for index_sql in indexes:
+        try:
+            cursor.execute(index_sql)
+        except sqlite3.OperationalError as e:
+            logging.warning(f"Could not recreate index on {table_name}: {e}")
+
+
+def merge_staging_table(cursor, table_name):
+    """Publish a staging table by writing only the rows that differ from the live table.
+
+    Rows are matched on every column but id; live rows with no identical
+    staged row are deleted and staged rows with no identical live row are
+    inserted, then the staging table is dropped, so triggers on the live
+    table (those of the DTC search indexes) fire for the changes alone.
+    Returns False, leaving both tables untouched, when more than
+    MERGE_MAX_CHANGES of the live rows would be rewritten; swapping the
+    table in is then faster. Run inside a transaction.
+    """
+    staging = table_name + STAGING_SUFFIX
+    cursor.execute(f"PRAGMA table_info({table_name})")
+    columns = ', '.join(f'"{row[1]}"' for row in cursor.fetchall() if row[1] != 'id')
+    # A row's values -> ids of the live rows holding them
+    live = {}
+    reader = cursor.connection.cursor()
+    reader.execute(f"SELECT id, {columns} FROM {table_name}")
+    live_count = 0
+    for row in reader:
+        live.setdefault(row[1:], []).append(row[0])
+        live_count += 1
+    added = []
+    reader.execute(f"SELECT id, {columns} FROM {staging}")
+    for row in reader:
+        ids = live.get(row[1:])
+        if ids:
+            ids.pop()
+        else:
+            added.append(row[0])
+    removed = sorted(row_id for ids in live.values() for row_id in ids)
+    if len(added) + len(removed) > MERGE_MAX_CHANGES * live_count:
+        return False
+    for start in range(0, len(removed), 500):
+        chunk = removed[start:start + 500]
+        cursor.execute(f"DELETE FROM {table_name} WHERE id IN ({', '.join('?' for _ in chunk)})", chunk)
+    for start in range(0, len(added), 500):
+        chunk = added[start:start + 500]
+        cursor.execute(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {staging} "
+                       f"WHERE id IN ({', '.join('?' for _ in chunk)}) ORDER BY id", chunk)
+    cursor.execute(f"DROP TABLE {staging}")
+    logging.info(f"Merged {table_name}: {len(added)} rows inserted, {len(removed)} deleted")
+    return True
+
+
+def replace_partitions(cursor, config_type, source_files):
+    """Publish a partitioned staging table by replacing only the rows of ``source_files``.
+
+    The staging table holds the new rows of those workbooks (none for a
+    removed one) and is dropped afterwards. Run inside a transaction.
+    """
+    table_name = CONFIG_TABLES[config_type]
+    staging = table_name + STAGING_SUFFIX
+    cursor.execute(f"PRAGMA table_info({table_name})")
+    columns = ', '.join(f'"{row[1]}"' for row in cursor.fetchall() if row[1] != 'id')
+    source_files = list(source_files)
+    placeholders = ', '.join('?' for _ in source_files)
+    cursor.execute(f"DELETE FROM {table_name} WHERE source_file IN ({placeholders})", source_files)
+    cursor.execute(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {staging}")
+    cursor.execute(f"DROP TABLE {staging}")
+
+
+def drop_staging_table(conn, table_name):
+    """Discard an unfinished staging table"""
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        conn.execute(f"DROP TABLE IF EXISTS {table_name}{STAGING_SUFFIX}")
+        conn.commit()
+    except sqlite3.Error as e:
+        logging.error(f"Failed to drop staging table for {table_name}: {e}")
+
+
+def _start_journal(cursor, config_type, folder_path, incremental):
+    cursor.execute('DELETE FROM import_journal WHERE config_type = ?', (config_type,))
+    cursor.execute(
+        "INSERT INTO import_journal (config_type, file_path, folder_path, incremental) VALUES (?, '', ?, ?)",
+        (config_type, folder_path, int(incremental))
+    )
+
+
+def _load_journal(cursor, config_type):
+    cursor.execute(
+        'SELECT file_path, folder_path, incremental, file_size, mtime, content_hash, row_offset, row_count, done, '
+        'streamed FROM import_journal WHERE config_type = ?',
+        (config_type,)
+    )
+    return {row[0]: row[1:] for row in cursor.fetchall()}
+
+
+def _checkpoint(cursor, config_type, filepath, fingerprint, row_offset, row_count, streamed, done=False):
+    """Record how far a workbook has been written; ``row_offset`` counts sheet rows consumed.
+
+    A streamed read counts every non-blank sheet row while a parsed one counts
+    the rows left after apply_schema, so the offset is only valid in the mode
+    recorded with it.
+    """
+    cursor.execute('''
+        INSERT OR REPLACE INTO import_journal
+        (config_type, file_path, file_size, mtime, content_hash, row_offset, row_count, done, streamed, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ''', (config_type, filepath) + tuple(fingerprint) + (row_offset, row_count, int(done), int(streamed)))
+
+
+def _discard_journal_file(cursor, config_type, staging, filepath):
+    _delete_source_rows(cursor, config_type, staging, filepath)
+    cursor.execute('DELETE FROM import_journal WHERE config_type = ? AND file_path = ?', (config_type, filepath))
+
+
+def interrupted_imports(db_path='data.db'):
+    """List the imports that stopped before publishing, as run_import jobs.
+
+    Returns ``(jobs, incremental)``; running these jobs again with the same
+    ``incremental`` flag resumes them from their last checkpoint.
+    """
+    conn = read_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        tables = {row[0] for row in cursor.fetchall()}
+        if 'import_journal' not in tables:
+            return [], False
+        cursor.execute("SELECT config_type, folder_path, incremental FROM import_journal WHERE file_path = ''")
+        markers = [row for row in cursor.fetchall()
+                   if CONFIG_TABLES[row[0]] + STAGING_SUFFIX in tables and row[1] and os.path.isdir(row[1])]
+    finally:
+        conn.close()
+    order = {config_type: i for i, config_type in enumerate(IMPORT_ORDER)}
+    markers.sort(key=lambda row: order.get(row[0], len(order)))
+    jobs = [(config_type, folder_path, get_valid_excel_files(folder_path)) for config_type, folder_path, _ in markers]
+    return [job for job in jobs if job[2]], any(row[2] for row in markers)
+
+
+def discard_interrupted_imports(cursor, config_type=None):
+    """Drop the staging tables and journal of interrupted imports"""
+    config_types = [config_type] if config_type else list(CONFIG_TABLES)
+    for name in config_types:
+        cursor.execute(f"DROP TABLE IF EXISTS {CONFIG_TABLES[name]}{STAGING_SUFFIX}")
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'import_journal'")
+    if cursor.fetchone():
+        if config_type:
+            cursor.execute('DELETE FROM import_journal WHERE config_type = ?', (config_type,))
+        else:
+            cursor.execute('DELETE FROM import_journal')
+
+
+def is_streaming_enabled(db_path='data.db'):
+    """Check whether manufacturer charts should be streamed instead of parsed whole"""
+    return str(load_setting_from_db('stream_manufacturer_chart', '0', db_path)) == '1'
+
+
+class ImportCancelled(Exception):
+    """Raised inside run_import when the caller asks it to stop"""
+
+
+def check_cancelled(cancel_event):
+    """Raise ImportCancelled once ``cancel_event`` (a threading.Event) is set"""
+    if cancel_event is not None and cancel_event.is_set():
+        raise ImportCancelled()
+
+
+class BatchProducer(threading.Thread):
+    """Feeds the row batches of run_import's tasks, in task order, onto a bounded queue.
+
+    For each task it queues ``('start', i, info, offset)``, then
+    ``('rows', i, frame, source_rows)`` batches and ``('done', i, info,
+    source_rows)``; ``('error', i, message, None)`` replaces whatever is left
+    when the workbook can't be read. ``source_rows`` counts the sheet rows
+    consumed, for the import journal. Workbooks are parsed in a process pool
+    kept at most two per worker ahead of the writer, and only the workbook the
+    writer needs next while the app and its parser processes use more than
+    ``memory_budget_mb``; streamed charts are read here chunk by chunk while
+    the writer inserts the previous chunk.
+    """
+
+    def __init__(self, tasks, streamed, offsets, workers, cache_dir=None, reader_engine=None,
+                 memory_budget_mb=0):
+        super().__init__(name='ImportProducer', daemon=True)
+        self.tasks = tasks
+        self.streamed = streamed
+        self.offsets = offsets
+        self.workers = workers
+        self.cache_dir = cache_dir
+        self.reader_engine = reader_engine
+        self.queue = Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        self.wait_seconds = 0.0
+        self.memory_budget_mb = memory_budget_mb
+        self.worker_rss = {}
+        self.parse_peak_mb = None
+        self.throttled = 0
+        self.executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        self._stop_event = threading.Event()
+
+        # Each workbook is parsed once for all the configurations it feeds
+        self.sheets_by_file = {}
+        for i, (config_type, _, _, filepath) in enumerate(tasks):
+            if not streamed[i]:
+                self.sheets_by_file.setdefault(filepath, []).append(config_type)
+        self.parse_order = list(self.sheets_by_file)
+        self.futures = {}
+        self.parsed = {}
+
+    def stop(self):
+        """Stop producing, wait for the thread and shut the parser pool down"""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
+        if self.executor:
+            self.executor.shutdown(cancel_futures=True)
+
+    def get(self, cancel_event=None):
+        """Take the next queued item, raising ImportCancelled if cancel_event is set while waiting"""
+        while True:
+            check_cancelled(cancel_event)
+            try:
+                return self.queue.get(timeout=0.1)
+            except Empty:
+                if not self.is_alive() and self.queue.empty():
+                    raise RuntimeError("The import's parser thread stopped unexpectedly")
+
+    def put(self, *item):
+        started = time.perf_counter()
+        while not self._stop_event.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                break
+            except Full:
+                continue
+        self.wait_seconds += time.perf_counter() - started
+
+    def pipeline_rss_mb(self):
+        """Get the resident memory of this process plus the last seen size of each parser process"""
+        rss = current_rss_mb()
+        if rss is None:
+            return None
+        return rss + sum(worker_rss for pid, worker_rss in self.worker_rss.items() if pid != os.getpid())
+
+    def over_budget(self):
+        if not self.memory_budget_mb:
+            return False
+        rss = self.pipeline_rss_mb()
+        return rss is not None and rss > self.memory_budget_mb
+
+    def parse(self, filepath):
+        """Get a workbook's parse result, keeping the pool busy with the workbooks after it"""
+        if filepath not in self.parsed:
+            config_types = self.sheets_by_file[filepath]
+            if self.executor:
+                while self.parse_order and len(self.futures) < 2 * self.workers:
+                    # The workbook needed next is always submitted first
+                    if self.futures and self.over_budget():
+                        self.throttled += 1
+                        break
+                    next_file = self.parse_order.pop(0)
+                    self.futures[next_file] = self.executor.submit(
+                        parse_workbook, next_file, self.sheets_by_file[next_file], self.cache_dir,
+                        self.reader_engine)
+                try:
+                    self.parsed[filepath] = self.futures.pop(filepath).result()
+                except BrokenProcessPool as e:
+                    logging.error(f"Parser process failed, parsing {filepath} in-process: {e}")
+                    self.parsed[filepath] = parse_workbook(filepath, config_types, self.cache_dir, self.reader_engine)
+            else:
+                self.parsed[filepath] = parse_workbook(filepath, config_types, self.cache_dir, self.reader_engine)
+            stats = self.parsed[filepath][3]
+            if stats['rss_mb'] is not None:
+                self.worker_rss[stats['pid']] = stats['rss_mb']
+            rss = self.pipeline_rss_mb()
+            if rss is not None and (self.parse_peak_mb is None or rss > self.parse_peak_mb):
+                self.parse_peak_mb = rss
+        return self.parsed[filepath]
+
+    def produce_parsed(self, i, config_type, filepath, offset):
+        frames, fingerprint, error, stats = self.parse(filepath)
+        df, sheet_error = frames.pop(config_type, (None, None))
+        if not frames:
+            del self.parsed[filepath]
+        if error or sheet_error:
+            self.put('error', i, error or sheet_error, None)
+            return
+        self.put('start', i, {'fingerprint': fingerprint, 'parse_seconds': round(stats['seconds'], 3),
+                              'frame_mb': round(float(df.memory_usage(deep=True).sum()) / (1024 * 1024), 1)}, offset)
+        for start in range(offset, len(df), CHECKPOINT_ROWS):
+            if self._stop_event.is_set():
+                return
+            self.put('rows', i, df.iloc[start:start + CHECKPOINT_ROWS], min(start + CHECKPOINT_ROWS, len(df)))
+        self.put('done', i, {}, len(df))
+
+    def produce_streamed(self, i, filepath, offset):
+        started = time.perf_counter()
+        self.put('start', i, {'fingerprint': file_fingerprint(filepath)}, offset)
+        source_rows = offset
+        for chunk in iter_manufacturer_chart_chunks(filepath, STREAM_CHUNK_ROWS, offset):
+            if self._stop_event.is_set():
+                return
+            source_rows += len(chunk)
+            chart = apply_schema(pd.DataFrame(chunk, columns=schema_columns('manufacturer_chart')), 'manufacturer_chart')
+            self.put('rows', i, chart, source_rows)
+        self.put('done', i, {'seconds': round(time.perf_counter() - started, 3)}, source_rows)
+
+    def run(self):
+        for i, (config_type, _, _, filepath) in enumerate(self.tasks):
+            if self._stop_event.is_set():
+                return
+            try:
+                if self.streamed[i]:
+                    self.produce_streamed(i, filepath, self.offsets[i])
+                else:
+                    self.produce_parsed(i, config_type, filepath, self.offsets[i])
+            except Exception as e:
+                self.put('error', i, str(e), None)
+
+
+def _table_exists(cursor, table_name):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+    return cursor.fetchone() is not None
+
+
+def run_import(jobs, db_path='data.db', workers=None, progress_callback=None, incremental=False,
+               streaming=None, cancel_event=None, reader_engine=None, memory_budget_mb=None, held_back=None):
+    """Import workbooks for several configuration types.
+
+    ``jobs`` is a list of ``(config_type, folder_path, files)`` tuples where
+    ``files`` maps file names to full paths. Workbooks are parsed in a process
+    pool by a BatchProducer thread, which queues their rows in batches on a
+    bounded queue; this thread is the only writer and drains the queue over a
+    single connection, in the order the jobs were given. With
+    ``incremental`` only new or changed workbooks are parsed and the rows of
+    removed workbooks are deleted; otherwise each configuration is rebuilt. With ``streaming`` (defaults to the saved
+    setting) manufacturer charts are read row by row by the producer instead
+    of being parsed whole in the pool.
+
+    Every table that changes is loaded into a staging copy and all staging
+    tables are renamed over the live ones in a single transaction at the end,
+    so readers only ever see complete generations. An incremental import of a
+    partitioned table (PARTITIONED_CONFIGS) stages only the changed workbooks
+    and replaces just their rows. Writes are committed every
+    CHECKPOINT_ROWS rows and recorded in the import_journal table; when an
+    import is cancelled, crashes or the app is closed, the staging tables are
+    kept and running the same jobs again resumes from the last checkpoint,
+    skipping finished workbooks. A workbook that fails is dropped on its own.
+    ``reader_engine`` is the Excel backend to parse with; by default it is
+    the saved choice, benchmarked on the first import when more than one is
+    installed (see spreadsheet_readers). ``memory_budget_mb`` (defaults to
+    the saved setting) caps how many workbooks are parsed ahead of the writer.
+    ``held_back`` maps configuration types to workbooks left out of the jobs
+    (e.g. by preflight.loadable_jobs); their rows and manifest entries are
+    kept as they are, by a rebuild too.
+    ``progress_callback`` is called with a dict holding files_done,
+    files_total, bytes_done, bytes_total, rows and the current file.
+    Parsed sheets are kept in the parse cache (see parse_cache), so rebuilding
+    from unchanged workbooks skips Excel parsing.
+    Returns a report with one entry per workbook. Each published table is
+    diffed against the rows it replaces and recorded as a generation in the
+    changelog (see changelog): ``changes`` holds each configuration's
+    generation and counts of rows added, removed and modified, and
+    ``changed_makes`` maps it to the makes of those rows, or to None on a
+    first load, when every make is new. ``deduplication`` counts the records read
+    and stored for each published DEDUPLICATED_CONFIGS table, and ``memory``
+    holds the resident memory in MB at the start, while parsing, while
+    writing and after publishing.
+    """
+    report = {'files': [], 'loaded': set(), 'unchanged': 0, 'removed': [], 'resumed': [], 'changed_makes': {},
+              'changes': {}, 'deduplication': {}, 'cancelled': False}
+    started = time.perf_counter()
+    if memory_budget_mb is None:
+        memory_budget_mb = get_memory_budget_mb(db_path)
+    memory = {'budget_mb': memory_budget_mb, 'start_mb': current_rss_mb(), 'parse_peak_mb': None,
+              'write_peak_mb': None, 'publish_mb': None, 'throttled': 0}
+
+    # The import writes through a connection of its own (see db_connections)
+    conn = connect(db_path)
+    previous_pragmas = begin_bulk_load(conn)
+    producer = None
+    cache_dir = None
+    staged = {}
+    manifests = {}
+    partitions = {}
+    try:
+        cursor = conn.cursor()
+        initialize_import_tables(cursor)
+
+        tasks = []
+        rebuilt = set()
+        journals = {}
+        for config_type, folder_path, files in jobs:
+            table_name = CONFIG_TABLES[config_type]
+            journal = _load_journal(cursor, config_type)
+            marker = journal.pop('', None)
+            # An interrupted import of the same folder, in the same mode, is picked up where it stopped
+            resumable = (marker is not None and marker[0] == folder_path
+                         and _table_exists(cursor, table_name + STAGING_SUFFIX))
+            kept = (held_back or {}).get(config_type, [])
+            plan = plan_incremental_import(cursor, config_type, files, kept) if incremental else None
+            if plan is None:
+                rebuilt.add(config_type)
+                changed = files
+                manifest = _load_manifest(cursor, config_type) if kept else {}
+                manifests[config_type] = {path: manifest[path] for path in kept if path in manifest}
+                resume = resumable and not marker[1]
+                if not resume:
+                    staged[config_type] = create_staging_table(cursor, table_name, copy_rows=bool(kept))
+                    if kept:
+                        _keep_source_rows(cursor, config_type, staged[config_type], kept)
+            else:
+                changed, removed = plan
+                report['removed'].extend(removed)
+                report['unchanged'] += len(files) - len(changed)
+                if not changed and not removed:
+                    continue
+                manifests[config_type] = _load_manifest(cursor, config_type)
+                resume = resumable and marker[1]
+                if config_type in PARTITIONED_CONFIGS:
+                    partitions[config_type] = list(changed.values()) + removed
+                if not resume:
+                    staged[config_type] = create_staging_table(cursor, table_name,
+                                                               copy_rows=config_type not in partitions)
+                for filepath in removed:
+                    if config_type not in partitions:
+                        _delete_source_rows(cursor, config_type, table_name + STAGING_SUFFIX, filepath)
+                    manifests[config_type].pop(filepath, None)
+                    logging.info(f"Removed rows of deleted workbook {filepath} from {config_type}")
+            if resume:
+                staged[config_type] = table_name + STAGING_SUFFIX
+                report['resumed'].append(config_type)
+                logging.info(f"Resuming the interrupted {config_type} import")
+                # Rows of workbooks that are no longer part of the import are dropped
+                for filepath in set(journal) - set(changed.values()):
+                    _discard_journal_file(cursor, config_type, staged[config_type], filepath)
+                    del journal[filepath]
+            else:
+                _start_journal(cursor, config_type, folder_path, plan is not None)
+                journal = {}
+            journals[config_type] = journal
+
+            for filename, filepath in changed.items():
+                entry = journal.get(filepath)
+                if entry:
+                    stat = os.stat(filepath)
+                    if (stat.st_size, stat.st_mtime) != (entry[2], entry[3]):
+                        # Edited since the interrupted import wrote part of it
+                        _discard_journal_file(cursor, config_type, staged[config_type], filepath)
+                        del journal[filepath]
+                    elif entry[7]:
+                        manifests[config_type][filepath] = (entry[2], entry[3], entry[4], entry[6], None)
+                        report['files'].append({'config_type': config_type, 'file': filepath, 'rows': entry[6],
+                                                'resumed': True, 'error': None})
+                        if entry[6]:
+                            report['loaded'].add(config_type)
+                        continue
+                tasks.append((config_type, folder_path, filename, filepath))
+        conn.commit()
+
+        if streaming is None:
+            streaming = is_streaming_enabled(db_path)
+        streamed = [streaming and task[0] == 'manufacturer_chart' for task in tasks]
+        if workers is None:
+            workers = get_import_worker_count(db_path)
+        workers = max(1, min(workers, (len(tasks) - sum(streamed)) or 1))
+        report['workers'] = workers
+        if reader_engine is None:
+            reader_engine = resolve_reader_engine(jobs, db_path)
+        report['reader_engine'] = reader_engine
+        cache_dir, cache_bytes = get_cache_settings(db_path)
+        if not cache_bytes:
+            cache_dir = None
+
+        tasks_left = {}
+        for config_type, _, _, filepath in tasks:
+            tasks_left[filepath] = tasks_left.get(filepath, 0) + 1
+        file_sizes = {}
+        for filepath in tasks_left:
+            try:
+                file_sizes[filepath] = os.path.getsize(filepath)
+            except OSError:
+                file_sizes[filepath] = 0
+        progress = {'files_done': 0, 'files_total': len(tasks), 'bytes_done': 0,
+                    'bytes_total': sum(file_sizes.values()), 'rows': 0, 'file': None}
+
+        def notify(**changes):
+            progress.update(changes)
+            if progress_callback:
+                progress_callback(dict(progress))
+
+        # Where an interrupted import of each workbook stopped: (sheet rows, rows written)
+        resume_points = []
+        for i, (config_type, _, _, filepath) in enumerate(tasks):
+            resume_entry = journals[config_type].get(filepath)
+            if resume_entry and resume_entry[8] != int(streamed[i]):
+                # The offset was counted by the other read mode; start the workbook over
+                logging.info(f"Restarting {filepath}: it was interrupted while read in the other mode")
+                _discard_journal_file(cursor, config_type, staged[config_type], filepath)
+                resume_entry = None
+            resume_points.append((resume_entry[5], resume_entry[6]) if resume_entry else None)
+        conn.commit()
+        producer = BatchProducer(tasks, streamed, [point[0] if point else 0 for point in resume_points],
+                                 workers, cache_dir, reader_engine, memory_budget_mb)
+        producer.start()
+        writer_wait = 0.0
+
+        for i, (config_type, folder_path, filename, filepath) in enumerate(tasks):
+            check_cancelled(cancel_event)
+            notify(file=filepath)
+            staging = staged[config_type]
+            offset, prior_rows = resume_points[i] or (0, 0)
+            checkpointed = bool(offset)
+            last_checkpoint = offset
+            rows_before = progress['rows']
+            rows = prior_rows
+            write_seconds = 0.0
+            peak_rss = None
+            entry = {'config_type': config_type, 'file': filepath, 'rows': 0, 'error': None}
+
+            while True:
+                wait_started = time.perf_counter()
+                kind, index, payload, source_rows = producer.get(cancel_event)
+                writer_wait += time.perf_counter() - wait_started
+                if index != i:
+                    raise RuntimeError(f"Import batches out of order: expected task {i}, got {index}")
+                if kind == 'error':
+                    entry['error'] = entry['error'] or payload
+                    break
+                if kind == 'done':
+                    entry.update(payload)
+                    break
+                if entry['error']:
+                    # A failed write skips the rest of the workbook
+                    continue
+                write_started = time.perf_counter()
+                try:
+                    if kind == 'start':
+                        fingerprint = payload.pop('fingerprint')
+                        entry.update(payload)
+                        if config_type not in rebuilt and not offset:
+                            _delete_source_rows(cursor, config_type, staging, filepath)
+                        continue
+                    rows += write_frame(cursor, config_type, folder_path, filepath, payload, staging)
+                except sqlite3.Error as e:
+                    entry['error'] = str(e)
+                    continue
+                finally:
+                    write_seconds += time.perf_counter() - write_started
+                rss = current_rss_mb()
+                if rss is not None and (peak_rss is None or rss > peak_rss):
+                    peak_rss = rss
+                    if memory['write_peak_mb'] is None or rss > memory['write_peak_mb']:
+                        memory['write_peak_mb'] = rss
+                notify(rows=rows_before + rows - prior_rows)
+                # Commit every CHECKPOINT_ROWS sheet rows, and before stopping on a cancel
+                if (source_rows - last_checkpoint >= CHECKPOINT_ROWS
+                        or (cancel_event is not None and cancel_event.is_set())):
+                    _checkpoint(cursor, config_type, filepath, fingerprint, source_rows, rows, streamed[i])
+                    conn.commit()
+                    checkpointed = True
+                    last_checkpoint = source_rows
+                check_cancelled(cancel_event)
+
+            if resume_points[i]:
+                entry['resumed_from'] = offset
+            if not entry['error']:
+                try:
+                    _checkpoint(cursor, config_type, filepath, fingerprint, source_rows, rows, streamed[i], done=True)
+                    entry['rows'] = rows
+                except sqlite3.Error as e:
+                    entry['error'] = str(e)
+            if entry['error']:
+                logging.error(f"Error loading {filename} for {config_type}: {entry['error']}")
+                conn.rollback()
+                if checkpointed:
+                    # Part of the workbook was already committed; drop it and have the next import retry it
+                    _discard_journal_file(cursor, config_type, staging, filepath)
+                    conn.commit()
+                if config_type in partitions:
+                    # The live rows of the workbook's previous version stay in place
+                    partitions[config_type].remove(filepath)
+                elif checkpointed:
+                    manifests[config_type].pop(filepath, None)
+                entry['rows'] = 0
+            else:
+                conn.commit()
+                entry['write_seconds'] = round(write_seconds, 3)
+                if streamed[i]:
+                    seconds = entry.get('seconds') or 0
+                    entry['rows_per_second'] = round(rows / seconds) if seconds else rows
+                    entry['peak_rss_mb'] = round(peak_rss, 1) if peak_rss is not None else None
+                    logging.info(f"Streamed {rows} manufacturer chart rows from {filename}: "
+                                 f"{entry['rows_per_second']} rows/s, peak RSS {entry['peak_rss_mb']} MB")
+                manifests[config_type][filepath] = tuple(fingerprint) + (entry['rows'], None)
+                if entry['rows']:
+                    report['loaded'].add(config_type)
+                logging.info(f"Loaded {entry['rows']} rows for {config_type} from {filename}")
+            report['files'].append(entry)
+
+            tasks_left[filepath] -= 1
+            notify(files_done=i + 1,
+                   bytes_done=progress['bytes_done'] + (file_sizes[filepath] if not tasks_left[filepath] else 0),
+                   rows=rows_before + entry['rows'] - prior_rows)
+
+        # Time the writer sat idle waiting for rows, and the parsers waited on a full queue
+        report['pipeline'] = {'queue_size': PIPELINE_QUEUE_SIZE, 'writer_wait_seconds': round(writer_wait, 3),
+                              'parser_wait_seconds': round(producer.wait_seconds, 3)}
+
+        check_cancelled(cancel_event)
+        # Publish every staged table, and its manifest, as one new generation
+        cursor.execute('BEGIN')
+        for config_type in staged:
+            table_name = CONFIG_TABLES[config_type]
+            changes = log_changes(cursor, config_type, CONFIG_DATASETS[config_type], table_name,
+                                  table_name + STAGING_SUFFIX, partitions.get(config_type))
+            report['changes'][config_type] = changes
+            report['changed_makes'][config_type] = changes['makes']
+            if config_type in partitions:
+                replace_partitions(cursor, config_type, partitions[config_type])
+            elif not (table_name in DTC_SEARCH_TABLES and merge_staging_table(cursor, table_name)):
+                # DTC lists with few changed rows are merged in place, where their search triggers
+                # index just those rows; anything else is swapped in and its indexes rebuilt
+                swap_staging_table(cursor, table_name)
+                sync_dtc_search(cursor, table_name)
+            _write_manifest(cursor, config_type, manifests[config_type])
+            if config_type in DEDUPLICATED_CONFIGS:
+                report['deduplication'][config_type] = deduplication_stats(cursor, config_type, manifests[config_type])
+            cursor.execute('DELETE FROM import_journal WHERE config_type = ?', (config_type,))
+        conn.commit()
+        memory['publish_mb'] = current_rss_mb()
+    except ImportCancelled:
+        report['cancelled'] = True
+        report['loaded'] = set()
+        logging.info("Import cancelled, the live tables were left untouched; running it again resumes it")
+    finally:
+        if producer:
+            producer.stop()
+        if cache_dir:
+            evict_parse_cache(cache_dir, cache_bytes)
+        # Staging tables of an unfinished import are kept so it can be resumed
+        end_bulk_load(conn, previous_pragmas)
+        conn.close()
+
+    if producer:
+        memory['parse_peak_mb'] = producer.parse_peak_mb
+        memory['throttled'] = producer.throttled
+    report['memory'] = {key: round(value, 1) if isinstance(value, float) else value for key, value in memory.items()}
+    report['seconds'] = round(time.perf_counter() - started, 3)
+    return report
@@ -0,0 +1,19 @@
+from dataset_schemas import quoted_columns, make_column
+from repository import table_exists, fetch_frame
+
+QUERIES = {
+    'rows': f"SELECT {quoted_columns('mag_glass')} FROM mag_glass",
+    'rows_by_make': f"SELECT {quoted_columns('mag_glass')} FROM mag_glass WHERE {make_column('mag_glass')} = ?",
+}
+
+
+def mag_glass_exists(db_path='data.db'):
+    """Check whether the mag glass list has been loaded"""
+    return table_exists('mag_glass', db_path)
+
+
+def get_mag_glass_rows(make=None, db_path='data.db'):
+    """Get the mag glass rows, or one make's, as a DataFrame of the schema columns"""
+    if make is None:
+        return fetch_frame(QUERIES['rows'], (), db_path)
+    return fetch_frame(QUERIES['rows_by_make'], (make,), db_path)
@@ -5,7 +5,7 @@ from PyQt5.QtWidgets import (
     QFormLayout, QScrollArea, QFrame
 )
 from modern_components import ModernDialog, ModernComboBox, ModernButton, ModernTextBrowser
-from database_utils import get_prequal_data, get_unique_years, get_unique_makes, get_unique_models
+from prequal_repository import query_prequal, get_prequal_years, get_prequal_makes, get_prequal_models
 import logging
 
 class VehicleSelector(QWidget):
@@ -97,15 +97,12 @@ class VehicleSelector(QWidget):
             return
             
         try:
-            data = get_prequal_data()
-            if data:
-                # Get unique models for selected year and make
-                models = get_unique_models(data, year, make)
-                logging.debug(f"Found {len(models)} models for {year} {make}")
-                logging.debug(f"Models: {models}")
-                
-                for model in models:
-                    self.model.addItem(model)
+            models = get_prequal_models(year, make)
+            logging.debug(f"Found {len(models)} models for {year} {make}")
+            logging.debug(f"Models: {models}")
+
+            for model in models:
+                self.model.addItem(model)
         except Exception as e:
             logging.error(f"Error updating models: {e}")
             
@@ -259,12 +256,9 @@ class MultiVehicleCompareDialog(ModernDialog):
     def populate_dropdowns(self, selector):
         """Populate the dropdowns for a vehicle selector"""
         try:
-            data = get_prequal_data()
-            if data:
-                # Extract unique years and makes
-                years = get_unique_years(data)
-                makes = get_unique_makes(data)
-                
+            years = get_prequal_years()
+            makes = get_prequal_makes()
+            if years or makes:
                 logging.debug(f"Found {len(years)} years and {len(makes)} makes")
                 logging.debug(f"Years: {years}")
                 logging.debug(f"Makes: {makes}")
@@ -303,10 +297,6 @@ class MultiVehicleCompareDialog(ModernDialog):
     def update_adas_systems(self):
         """Update the ADAS systems filter dropdown based on selected vehicles"""
         try:
-            data = get_prequal_data()
-            if not data:
-                return
-                
             # Get all complete vehicle selections
             vehicles = []
             for selector in self.vehicle_selectors:
@@ -319,17 +309,10 @@ class MultiVehicleCompareDialog(ModernDialog):
             # Get unique ADAS systems for all selected vehicles
             adas_systems = set()
             for vehicle in vehicles:
-                for item in data:
-                    try:
-                        if (str(int(float(item['Year']))) == vehicle['year'] and
-                            item['Make'].strip() == vehicle['make'].strip() and
-                            item['Model'].strip() == vehicle['model'].strip() and
-                            'Parent Component' in item and
-                            item['Parent Component'] and
-                            str(item['Parent Component']).lower() not in ['nan', 'none', 'null']):
-                            adas_systems.add(str(item['Parent Component']).strip())
-                    except (ValueError, TypeError):
-                        continue
+                for item in query_prequal(vehicle['year'], vehicle['make'], vehicle['model']):
+                    if (item['Parent Component'] and
+                        str(item['Parent Component']).lower() not in ['nan', 'none', 'null']):
+                        adas_systems.add(str(item['Parent Component']).strip())
                         
             # Update dropdown
             current_text = self.adas_filter.currentText()
@@ -364,29 +347,19 @@ class MultiVehicleCompareDialog(ModernDialog):
             
         # Get data for all vehicles
         vehicle_data = []
-        data = get_prequal_data()
         adas_filter = self.adas_filter.currentText()
-        
-        if data:
-            for vehicle in vehicles:
-                # Filter data for selected vehicle
-                vehicle_systems = {}
-                for item in data:
-                    try:
-                        if (str(int(float(item['Year']))) == vehicle['year'] and
-                            item['Make'].strip() == vehicle['make'].strip() and
-                            item['Model'].strip() == vehicle['model'].strip() and
-                            'Parent Component' in item and
-                            item['Parent Component'] and
-                            str(item['Parent Component']).lower() not in ['nan', 'none', 'null']):
-                            
-                            system = str(item['Parent Component']).strip()
-                            if adas_filter == "All" or system == adas_filter:
-                                vehicle_systems[system] = item
-                    except (ValueError, TypeError):
-                        continue
-                
-                vehicle_data.append((vehicle, vehicle_systems))
+
+        for vehicle in vehicles:
+            # Indexed lookup of the selected vehicle's records
+            vehicle_systems = {}
+            for item in query_prequal(vehicle['year'], vehicle['make'], vehicle['model']):
+                if (item['Parent Component'] and
+                    str(item['Parent Component']).lower() not in ['nan', 'none', 'null']):
+                    system = str(item['Parent Component']).strip()
+                    if adas_filter == "All" or system == adas_filter:
+                        vehicle_systems[system] = item
+
+            vehicle_data.append((vehicle, vehicle_systems))
                 
         if not vehicle_data:
             self.results_display.setPlainText("No data found for the selected vehicles.")
@@ -0,0 +1,156 @@
+import os
+import time
+import logging
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 - enables Parquet support in pandas
+except ImportError:
+    pyarrow = None
+
+from database_utils import load_setting_from_db
+
+# Bump whenever a parser in import_engine changes its output, so frames
+# cached by an older reader are never reused
+READER_VERSION = 4
+
+# Default size limit of the cache in MB; 0 disables caching
+DEFAULT_CACHE_MB = 500
+
+CACHE_EXTENSIONS = ('.parquet', '.pkl')
+
+
+def get_cache_settings(db_path='data.db'):
+    """Get the cache folder and its size limit in bytes (0 means disabled)"""
+    default_dir = os.path.join(os.path.dirname(os.path.abspath(db_path)), 'parse_cache')
+    cache_dir = load_setting_from_db('parse_cache_dir', default_dir, db_path) or default_dir
+    try:
+        max_mb = int(load_setting_from_db('parse_cache_mb', DEFAULT_CACHE_MB, db_path))
+    except (TypeError, ValueError):
+        max_mb = DEFAULT_CACHE_MB
+    return cache_dir, max(0, max_mb) * 1024 * 1024
+
+
+def _cache_key(content_hash, config_type):
+    return f"{content_hash}_{config_type}_v{READER_VERSION}"
+
+
+def _find_cached(cache_dir, key):
+    for extension in CACHE_EXTENSIONS:
+        path = os.path.join(cache_dir, key + extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def read_cached_frame(cache_dir, content_hash, config_type):
+    """Return the cached frame for a workbook sheet, or None on a miss"""
+    path = _find_cached(cache_dir, _cache_key(content_hash, config_type))
+    if path is None:
+        return None
+    try:
+        df = pd.read_parquet(path) if path.endswith('.parquet') else pd.read_pickle(path)
+    except Exception as e:
+        logging.warning(f"Discarding unreadable cache entry {path}: {e}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    # The modification time doubles as the last-used time for eviction
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return df
+
+
+def write_cached_frame(cache_dir, content_hash, config_type, df):
+    """Store a parsed frame, as Parquet when pyarrow is installed, else as a pickle"""
+    key = _cache_key(content_hash, config_type)
+    # Write under a temporary name so parallel workers never read half a file
+    temp_path = os.path.join(cache_dir, f".{key}.{os.getpid()}.tmp")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        path = None
+        if pyarrow is not None:
+            try:
+                df.to_parquet(temp_path, index=False)
+                path = os.path.join(cache_dir, key + '.parquet')
+            except Exception:
+                # Mixed-type object columns (e.g. prequal) can't be stored as Parquet
+                path = None
+        if path is None:
+            df.to_pickle(temp_path)
+            path = os.path.join(cache_dir, key + '.pkl')
+        os.replace(temp_path, path)
+    except Exception as e:
+        # A sheet that can't be cached is simply parsed again next time
+        logging.warning(f"Failed to cache {config_type} frame: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def inspect_parse_cache(cache_dir):
+    """Describe the cache: one entry per cached sheet, newest first, plus totals"""
+    entries = []
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            base, extension = os.path.splitext(name)
+            if extension not in CACHE_EXTENSIONS:
+                continue
+            parts = base.rsplit('_v', 1)
+            content_hash, _, config_type = parts[0].partition('_')
+            stat = os.stat(os.path.join(cache_dir, name))
+            entries.append({
+                'file': name,
+                'content_hash': content_hash,
+                'config_type': config_type,
+                'reader_version': parts[1] if len(parts) > 1 else None,
+                'format': extension.lstrip('.'),
+                'bytes': stat.st_size,
+                'last_used': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stat.st_mtime)),
+            })
+    entries.sort(key=lambda entry: entry['last_used'], reverse=True)
+    return {'cache_dir': cache_dir, 'entries': entries,
+            'total_bytes': sum(entry['bytes'] for entry in entries)}
+
+
+def evict_parse_cache(cache_dir, max_bytes):
+    """Delete least recently used entries, and those of older readers, until under max_bytes"""
+    if not os.path.isdir(cache_dir):
+        return 0
+    files = []
+    removed = 0
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        base, extension = os.path.splitext(name)
+        if extension not in CACHE_EXTENSIONS:
+            continue
+        if not base.endswith(f"_v{READER_VERSION}"):
+            os.remove(path)
+            removed += 1
+            continue
+        stat = os.stat(path)
+        files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError as e:
+            logging.warning(f"Failed to evict {path}: {e}")
+    if removed:
+        logging.info(f"Evicted {removed} parse cache entries, {total / (1024 * 1024):.1f} MB left")
+    return removed
+
+
+def clear_parse_cache(cache_dir):
+    """Delete every cached frame"""
+    return evict_parse_cache(cache_dir, 0)
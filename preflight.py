@@ -0,0 +1,176 @@
+import os
+import time
+import logging
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from dataset_schemas import missing_key_columns
+from import_engine import PLACEHOLDER_SIZE, CONFIG_DATASETS, select_sheet, get_import_worker_count
+from spreadsheet_readers import DelimitedWorkbook, is_delimited
+
+# Preflight statuses, from best to worst; a workbook takes the worst status of
+# the configuration types read from it
+LOADABLE = 'loadable'
+SCHEMA_MISMATCH = 'schema_mismatch'
+PLACEHOLDER = 'placeholder'
+STATUS_ORDER = [LOADABLE, SCHEMA_MISMATCH, PLACEHOLDER]
+
+# CarSys is read from columns A:D only
+HEADER_WIDTHS = {'CarSys': 4}
+
+
+def read_workbook_headers(excel_path, config_types):
+    """Read a workbook's sheet names and the header row each configuration type would use.
+
+    Only the workbook's metadata and the first row of those sheets are read;
+    a CSV/TSV export is a single sheet that every configuration type reads.
+    Returns ``(sheet_names, {config_type: (sheet, header)})`` with ``sheet``
+    None when the workbook has no sheet for that configuration type.
+    """
+    from openpyxl import load_workbook
+
+    if is_delimited(excel_path):
+        wb = DelimitedWorkbook(excel_path)
+        rows = wb.iter_rows()
+        try:
+            row = next(rows, [])
+        finally:
+            rows.close()
+        header = [str(value).strip() if value is not None else '' for value in row]
+        return wb.sheet_names, {config_type: (wb.sheet_names[0], header[:HEADER_WIDTHS.get(config_type)])
+                                for config_type in config_types}
+
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        rows = {}
+        headers = {}
+        for config_type in config_types:
+            sheet = select_sheet(wb.sheetnames, config_type)
+            if sheet is not None and sheet not in rows:
+                row = next(wb[sheet].iter_rows(min_row=1, max_row=1, values_only=True), ())
+                rows[sheet] = [str(value).strip() if value is not None else '' for value in row]
+            header = rows.get(sheet, [])[:HEADER_WIDTHS.get(config_type)]
+            headers[config_type] = (sheet, header)
+        return wb.sheetnames, headers
+    finally:
+        wb.close()
+
+
+def preflight_workbook(excel_path, config_types):
+    """Classify one workbook for each configuration type that reads from it.
+
+    Returns a dict with the workbook's overall status, its sheet names and,
+    per configuration type, the status and the reason it can't be loaded.
+    """
+    started = time.perf_counter()
+    result = {'file': excel_path, 'status': LOADABLE, 'sheets': [], 'configs': {}}
+
+    def classify(config_type, status, reason=None):
+        result['configs'][config_type] = {'status': status, 'reason': reason}
+        if STATUS_ORDER.index(status) > STATUS_ORDER.index(result['status']):
+            result['status'] = status
+
+    try:
+        size = os.path.getsize(excel_path)
+        if is_delimited(excel_path):
+            reason = None
+        elif size < PLACEHOLDER_SIZE:
+            reason = f"File appears to be a placeholder or empty (size: {size} bytes)"
+        elif not zipfile.is_zipfile(excel_path):
+            reason = "File is not a downloaded .xlsx workbook"
+        else:
+            reason = None
+        if reason:
+            for config_type in config_types:
+                classify(config_type, PLACEHOLDER, reason)
+            return result
+
+        sheet_names, headers = read_workbook_headers(excel_path, config_types)
+        result['sheets'] = sheet_names
+        for config_type, (sheet, header) in headers.items():
+            if sheet is None:
+                classify(config_type, SCHEMA_MISMATCH, "Workbook has no sheet for this list")
+                continue
+            missing = missing_key_columns(header, CONFIG_DATASETS[config_type])
+            if missing:
+                classify(config_type, SCHEMA_MISMATCH, f"Sheet '{sheet}' is missing columns: {', '.join(missing)}")
+            else:
+                classify(config_type, LOADABLE)
+    except Exception as e:
+        # openpyxl rejects workbooks that are still being synced or are damaged
+        for config_type in config_types:
+            if config_type not in result['configs']:
+                classify(config_type, PLACEHOLDER, f"Cannot open workbook: {e}")
+    finally:
+        result['seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def preflight_jobs(jobs, workers=None, db_path='data.db'):
+    """Scan the workbooks of run_import jobs before any of them is parsed.
+
+    Workbooks are scanned concurrently and each is opened once for every
+    configuration type that reads it. Returns one report per folder with the
+    status of each workbook and the number of workbooks in each status.
+    """
+    started = time.perf_counter()
+    config_types_by_file = {}
+    folder_by_file = {}
+    for config_type, folder_path, files in jobs:
+        for filepath in files.values():
+            config_types_by_file.setdefault(filepath, []).append(config_type)
+            folder_by_file.setdefault(filepath, folder_path)
+    if workers is None:
+        workers = get_import_worker_count(db_path)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = list(executor.map(lambda item: preflight_workbook(*item), config_types_by_file.items()))
+
+    reports = {}
+    for result in results:
+        folder_path = folder_by_file[result['file']]
+        report = reports.setdefault(folder_path, {
+            'folder': folder_path, 'files': [], 'counts': {status: 0 for status in STATUS_ORDER}})
+        report['files'].append(result)
+        report['counts'][result['status']] += 1
+    for report in reports.values():
+        logging.info(f"Preflight of {report['folder']}: " +
+                     ", ".join(f"{count} {status}" for status, count in report['counts'].items()))
+    logging.info(f"Preflight scanned {len(results)} workbooks in {time.perf_counter() - started:.2f}s")
+    return list(reports.values())
+
+
+def loadable_jobs(jobs, reports):
+    """Drop the workbooks the preflight found unloadable from run_import jobs.
+
+    Returns ``(jobs, held_back)`` where ``held_back`` maps each configuration
+    type to the workbooks dropped from it, for run_import to keep their rows.
+    """
+    statuses = {}
+    for report in reports:
+        for result in report['files']:
+            for config_type, config in result['configs'].items():
+                statuses[(config_type, result['file'])] = config['status']
+    filtered = []
+    held_back = {}
+    for config_type, folder_path, files in jobs:
+        loadable = {}
+        for filename, filepath in files.items():
+            if statuses.get((config_type, filepath), LOADABLE) == LOADABLE:
+                loadable[filename] = filepath
+            else:
+                held_back.setdefault(config_type, []).append(filepath)
+        if loadable:
+            filtered.append((config_type, folder_path, loadable))
+    return filtered, held_back
+
+
+def preflight_problems(reports):
+    """List '<file> (<config type>): <reason>' for every workbook that can't be loaded"""
+    problems = []
+    for report in reports:
+        for result in report['files']:
+            for config_type, config in result['configs'].items():
+                if config['status'] != LOADABLE:
+                    problems.append(f"{os.path.basename(result['file'])} ({config_type}): {config['reason']}")
+    return problems
@@ -0,0 +1,111 @@
+import json
+import sqlite3
+import logging
+from itertools import combinations
+
+from dataset_schemas import schema_columns, quoted_columns
+from repository import stored_year, fetch_all, fetch_values
+
+# Values the prequal sheets use for an unknown make or model
+UNKNOWN_VALUES = ('unknown', 'nan', 'none', 'null')
+
+# Columns a vehicle lookup can filter on, in the order of the (Year, Make, Model) index
+VEHICLE_COLUMNS = ('Year', 'Make', 'Model')
+
+_UNKNOWN_PLACEHOLDERS = ', '.join('?' for _ in UNKNOWN_VALUES)
+
+# Condition each vehicle column's listed values must meet
+VALUE_CONDITIONS = {
+    'Year': "Year BETWEEN 1900 AND 2100",
+    'Make': f"Make != '' AND LOWER(Make) NOT IN ({_UNKNOWN_PLACEHOLDERS})",
+    'Model': f"Model != '' AND LOWER(Model) NOT IN ({_UNKNOWN_PLACEHOLDERS})",
+}
+
+# One distinct-values query per vehicle column and combination of the other
+# columns it is filtered on, keyed by (column, filtered columns)
+QUERIES = {
+    (column, filtered): f"SELECT DISTINCT {column} FROM prequal WHERE {condition}"
+                        + ''.join(f" AND {other} = ?" for other in filtered)
+                        + f" ORDER BY {column}" + (" DESC" if column == 'Year' else '')
+    for column, condition in VALUE_CONDITIONS.items()
+    for size in range(len(VEHICLE_COLUMNS))
+    for filtered in combinations([other for other in VEHICLE_COLUMNS if other != column], size)
+}
+
+# One records query per combination of filtered vehicle columns
+RECORD_QUERIES = {
+    filtered: f"SELECT {quoted_columns('prequal')}, extra FROM prequal"
+              + (f" WHERE {' AND '.join(f'{column} = ?' for column in filtered)}" if filtered else '')
+              + " ORDER BY id"
+    for size in range(len(VEHICLE_COLUMNS) + 1)
+    for filtered in combinations(VEHICLE_COLUMNS, size)
+}
+
+
+def _vehicle_filters(year, make, model):
+    """The vehicle columns given a value and their values as stored"""
+    filtered, params = [], []
+    for column, value in zip(VEHICLE_COLUMNS, (stored_year(year) if year is not None else None, make, model)):
+        if value is not None:
+            filtered.append(column)
+            params.append(value.strip() if isinstance(value, str) else value)
+    return tuple(filtered), tuple(params)
+
+
+def _vehicle_values(column, year=None, make=None, model=None, db_path='data.db'):
+    filtered, params = _vehicle_filters(year, make, model)
+    unknown = UNKNOWN_VALUES if column != 'Year' else ()
+    return fetch_values(QUERIES[column, filtered], unknown + params, db_path)
+
+
+def query_prequal(year=None, make=None, model=None, db_path='data.db'):
+    """Get the prequal records of a vehicle as dicts, using the (Year, Make, Model) index.
+
+    Any of year, make and model left out matches every value.
+    """
+    columns = schema_columns('prequal')
+    filtered, params = _vehicle_filters(year, make, model)
+    result = []
+    try:
+        for row in fetch_all(RECORD_QUERIES[filtered], params, db_path):
+            record = dict(zip(columns, row))
+            if row[-1]:
+                record.update(json.loads(row[-1]))
+            record['Make'] = str(record['Make']).strip() if record['Make'] is not None else "Unknown"
+            record['Model'] = str(record['Model']).strip() if record['Model'] is not None else "Unknown"
+            result.append(record)
+    except (sqlite3.Error, ValueError) as e:
+        logging.error(f"Failed to load prequal records: {e}")
+    return result
+
+
+def get_prequal_data(db_path='data.db'):
+    """Get prequal data from database"""
+    return query_prequal(db_path=db_path)
+
+
+def get_prequal_years(db_path='data.db', make=None, model=None):
+    """Get the prequal model years, newest first, optionally of one make and/or model"""
+    try:
+        return [str(year) for year in _vehicle_values('Year', make=make, model=model, db_path=db_path)]
+    except sqlite3.Error as e:
+        logging.error(f"Failed to load prequal years: {e}")
+        return []
+
+
+def get_prequal_makes(db_path='data.db', year=None, model=None):
+    """Get the prequal makes, sorted, optionally of one year and/or model"""
+    try:
+        return _vehicle_values('Make', year=year, model=model, db_path=db_path)
+    except sqlite3.Error as e:
+        logging.error(f"Failed to load prequal makes: {e}")
+        return []
+
+
+def get_prequal_models(year=None, make=None, db_path='data.db'):
+    """Get the prequal models, sorted, optionally of one year and/or make"""
+    try:
+        return _vehicle_values('Model', year=year, make=make, db_path=db_path)
+    except sqlite3.Error as e:
+        logging.error(f"Failed to load prequal models for {year} {make}: {e}")
+        return []
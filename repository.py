@@ -0,0 +1,50 @@
+import pandas as pd
+
+from db_connections import read_connection, write_connection
+
+# Each dataset's repository module (dtc_repository, mag_glass_repository,
+# carsys_repository, chart_repository, prequal_repository, user_repository,
+# audit_repository) keeps its SQL in a QUERIES dict of named, parameterized
+# statements built once at import. Values are always bound as parameters, so
+# the text of a query never changes: each one is prepared once per connection
+# and then reused from the connection's statement cache (see db_connections),
+# and a value such as "Land Rover's" is just a value.
+
+
+def stored_year(year):
+    """Turn a dropdown year ('2021' or '2021.0') into the integer the prequal and chart tables store"""
+    try:
+        return int(float(year))
+    except (TypeError, ValueError):
+        return year
+
+
+def table_exists(table_name, db_path='data.db'):
+    """Check whether a table exists"""
+    return fetch_one("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,), db_path) is not None
+
+
+def fetch_all(sql, params=(), db_path='data.db'):
+    """Run a read query on the calling thread's connection and return every row"""
+    return read_connection(db_path).execute(sql, params).fetchall()
+
+
+def fetch_one(sql, params=(), db_path='data.db'):
+    """Run a read query and return its first row, or None"""
+    return read_connection(db_path).execute(sql, params).fetchone()
+
+
+def fetch_values(sql, params=(), db_path='data.db'):
+    """Run a read query and return the first column of every row"""
+    return [row[0] for row in fetch_all(sql, params, db_path)]
+
+
+def fetch_frame(sql, params=(), db_path='data.db'):
+    """Run a read query and return its rows as a DataFrame"""
+    return pd.read_sql_query(sql, read_connection(db_path), params=params)
+
+
+def execute(sql, params=(), db_path='data.db'):
+    """Run a write query in a transaction of its own on the shared writer; returns the rows changed"""
+    with write_connection(db_path) as conn:
+        return conn.execute(sql, params).rowcount
@@ -0,0 +1,202 @@
+import os
+import csv
+import time
+import logging
+
+import pandas as pd
+
+from database_utils import load_setting_from_db, save_setting_to_db
+
+# Excel backends pandas can read with. The first is the reference the others
+# must match, and the fallback when the configured backend isn't installed.
+EXCEL_ENGINES = ['openpyxl', 'calamine']
+DEFAULT_ENGINE = EXCEL_ENGINES[0]
+
+# Module each backend needs
+ENGINE_MODULES = {'openpyxl': 'openpyxl', 'calamine': 'python_calamine'}
+
+# Sheets exported as delimited text are read directly, without an Excel backend
+DELIMITED_EXTENSIONS = {'.csv': ',', '.tsv': '\t'}
+
+# Workbooks read by the engine benchmark
+BENCHMARK_SAMPLES = 3
+
+
+def engine_available(engine):
+    """Check whether an Excel backend's module is installed"""
+    try:
+        __import__(ENGINE_MODULES[engine])
+        return True
+    except (KeyError, ImportError):
+        return False
+
+
+def available_engines():
+    return [engine for engine in EXCEL_ENGINES if engine_available(engine)]
+
+
+def is_delimited(path):
+    """Check whether a file is a sheet exported as CSV or TSV"""
+    return os.path.splitext(str(path))[1].lower() in DELIMITED_EXTENSIONS
+
+
+def _column_positions(usecols):
+    """Turn an Excel column range such as "A:D" into column positions"""
+    def position(letters):
+        number = 0
+        for letter in letters.strip().upper():
+            number = number * 26 + ord(letter) - ord('A') + 1
+        return number - 1
+    first, _, last = usecols.partition(':')
+    return list(range(position(first), position(last or first) + 1))
+
+
+class DelimitedWorkbook:
+    """A sheet exported as CSV or TSV, read through the same calls as a pd.ExcelFile.
+
+    The file holds a single sheet, which is returned whichever sheet is asked for.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.sep = DELIMITED_EXTENSIONS[os.path.splitext(path)[1].lower()]
+        self.sheet_names = [os.path.splitext(os.path.basename(path))[0]]
+
+    def parse(self, sheet_name=0, usecols=None, header=0, **kwargs):
+        if isinstance(usecols, str):
+            usecols = _column_positions(usecols)
+        return pd.read_csv(self.path, sep=self.sep, usecols=usecols, header=header, **kwargs)
+
+    def iter_rows(self):
+        """Yield the rows as lists of strings, header first, with blank cells as None"""
+        with open(self.path, newline='', encoding='utf-8-sig') as f:
+            for row in csv.reader(f, delimiter=self.sep):
+                yield [value if value != '' else None for value in row]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_workbook(path, engine=None):
+    """Open a workbook with the given Excel backend, or a delimited export directly"""
+    if is_delimited(path):
+        return DelimitedWorkbook(path)
+    return pd.ExcelFile(path, engine=engine or DEFAULT_ENGINE)
+
+
+def read_sheet(workbook, sheet_name=0, engine=None, **kwargs):
+    """Read one sheet from a workbook path or an open workbook"""
+    if isinstance(workbook, (pd.ExcelFile, DelimitedWorkbook)):
+        return workbook.parse(sheet_name=sheet_name, **kwargs)
+    with open_workbook(workbook, engine) as opened:
+        return opened.parse(sheet_name=sheet_name, **kwargs)
+
+
+def get_reader_engine(db_path='data.db'):
+    """Get the Excel backend to parse with.
+
+    The reader_engine setting names a backend, or is 'auto' (the default) to use
+    the one the last benchmark picked. Falls back to openpyxl when the backend
+    isn't installed.
+    """
+    engine = str(load_setting_from_db('reader_engine', 'auto', db_path) or 'auto')
+    if engine == 'auto':
+        engine = str(load_setting_from_db('reader_engine_selected', DEFAULT_ENGINE, db_path) or DEFAULT_ENGINE)
+    if not engine_available(engine):
+        logging.warning(f"Spreadsheet reader {engine} is not installed, using {DEFAULT_ENGINE}")
+        engine = DEFAULT_ENGINE
+    return engine
+
+
+def _same_frames(frames, reference):
+    return len(frames) == len(reference) and all(
+        df.reset_index(drop=True).equals(ref.reset_index(drop=True)) for df, ref in zip(frames, reference))
+
+
+def benchmark_engines(samples, engines=None, repeats=1):
+    """Time each Excel backend parsing sample workbooks.
+
+    ``samples`` is a list of ``(path, config_types)``. Each backend parses
+    every sample with the import parsers, and its frames are compared with
+    those of the reference backend (openpyxl). Returns ``{engine: {'seconds',
+    'identical', 'error'}}``.
+    """
+    from import_engine import PARSERS
+
+    engines = engines or available_engines()
+    if DEFAULT_ENGINE in engines:
+        engines = [DEFAULT_ENGINE] + [engine for engine in engines if engine != DEFAULT_ENGINE]
+    results = {}
+    reference = None
+    for engine in engines:
+        result = {'seconds': None, 'identical': False, 'error': None}
+        try:
+            started = time.perf_counter()
+            for _ in range(max(1, repeats)):
+                frames = []
+                for path, config_types in samples:
+                    with open_workbook(path, engine) as workbook:
+                        frames.extend(PARSERS[config_type](workbook) for config_type in config_types)
+            result['seconds'] = round((time.perf_counter() - started) / max(1, repeats), 4)
+            if reference is None:
+                reference = frames
+            result['identical'] = _same_frames(frames, reference)
+        except Exception as e:
+            result['error'] = str(e)
+        results[engine] = result
+    return results
+
+
+def fastest_engine(results):
+    """Pick the fastest backend whose output matched the reference"""
+    candidates = [(result['seconds'], engine) for engine, result in results.items()
+                  if result['identical'] and not result['error']]
+    return min(candidates)[1] if candidates else DEFAULT_ENGINE
+
+
+def benchmark_samples(jobs, sample_size=BENCHMARK_SAMPLES):
+    """Pick up to ``sample_size`` Excel workbooks from run_import jobs, with the sheets read from each"""
+    samples = {}
+    for config_type, _, files in jobs:
+        for filepath in files.values():
+            if is_delimited(filepath):
+                continue
+            if filepath in samples:
+                samples[filepath].append(config_type)
+            elif len(samples) < sample_size:
+                samples[filepath] = [config_type]
+    return list(samples.items())
+
+
+def select_reader_engine(jobs, db_path='data.db', sample_size=BENCHMARK_SAMPLES):
+    """Benchmark the installed backends on workbooks from the jobs and save the winner.
+
+    Returns ``(engine, results)``; the choice is used from then on while the
+    reader_engine setting is 'auto'.
+    """
+    samples = benchmark_samples(jobs, sample_size)
+    if not samples:
+        return get_reader_engine(db_path), {}
+    results = benchmark_engines(samples)
+    engine = fastest_engine(results)
+    for name, result in results.items():
+        logging.info(f"Reader {name}: {result['seconds']}s, identical={result['identical']}, "
+                     f"error={result['error']}")
+    logging.info(f"Selected spreadsheet reader {engine}")
+    save_setting_to_db('reader_engine_selected', engine, db_path)
+    return engine, results
+
+
+def resolve_reader_engine(jobs, db_path='data.db'):
+    """Get the backend for an import, benchmarking first if it's automatic and hasn't been picked yet"""
+    setting = str(load_setting_from_db('reader_engine', 'auto', db_path) or 'auto')
+    if (setting == 'auto' and load_setting_from_db('reader_engine_selected', None, db_path) is None
+            and len(available_engines()) > 1):
+        return select_reader_engine(jobs, db_path)[0]
+    return get_reader_engine(db_path)
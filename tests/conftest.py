@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+from openpyxl import Workbook
+
+# The modules live at the top of the repository rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_utils import initialize_db  # noqa: E402
+from db_connections import close_connections  # noqa: E402
+
+DTC_HEADER = ['Generic System Name', 'DTC Code', 'DTC Description', 'DTC Sys', 'Car Make', 'Comments']
+CHART_HEADER = ['Year', 'Make', 'Model', 'Manufacturer']
+
+# The DTC lists are read from the second sheet of their workbooks
+DTC_SHEET = 1
+
+
+def write_workbook(path, header, rows, position=0):
+    """Write a workbook with the rows on its sheet at ``position``; empty strings are left as blank cells"""
+    workbook = Workbook()
+    for _ in range(position):
+        workbook.create_sheet()
+    sheet = workbook.worksheets[position]
+    sheet.append(header)
+    for row in rows:
+        sheet.append([None if value == '' else value for value in row])
+    workbook.save(path)
+    return str(path)
+
+
+def workbooks(folder):
+    """The workbooks of a folder by file name, as the import jobs list them"""
+    return {name: str(folder / name) for name in sorted(os.listdir(folder)) if name.endswith('.xlsx')}
+
+
+def dtc_rows(first, count, make='Acura'):
+    """Rows of a DTC list sheet with the codes U<first> onwards"""
+    return [[f'SYS{n % 5}', f'U{n:04d}', f'lost communication {n}', 'ADAS', make, '']
+            for n in range(first, first + count)]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'data.db')
+    initialize_db(path)
+    yield path
+    close_connections(path)
@@ -0,0 +1,78 @@
+import sqlite3
+
+import pytest
+
+from changelog import diff_tables
+
+COLUMNS = ['dtcCode', 'genericSystemName', 'dtcDescription', 'dtcSys', 'carMake', 'comments', 'source_file']
+
+
+@pytest.fixture
+def cursor():
+    conn = sqlite3.connect(':memory:')
+    for table_name in ('old', 'new'):
+        conn.execute(f"CREATE TABLE {table_name} (id INTEGER PRIMARY KEY, {', '.join(COLUMNS)})")
+    yield conn.cursor()
+    conn.close()
+
+
+def fill(cursor, table_name, rows):
+    """Insert (code, system, description) rows of one make; returns their ids"""
+    ids = []
+    for code, system, description in rows:
+        cursor.execute(f"INSERT INTO {table_name} ({', '.join(COLUMNS)}) "
+                       f"VALUES (?, ?, ?, 'ADAS', 'Acura', '', 'a.xlsx')", (code, system, description))
+        ids.append(cursor.lastrowid)
+    return ids
+
+
+def diff(cursor):
+    changes, old_count, new_count = diff_tables(cursor, 'dtc_list', 'old', 'new')
+    return sorted(changes, key=lambda change: (change[0], change[1] or 0, change[2] or 0)), old_count, new_count
+
+
+def test_identical_tables_have_no_changes(cursor):
+    rows = [('U0100', 'NET', 'lost comm'), ('U0101', 'NET', 'lost comm')]
+    fill(cursor, 'old', rows)
+    fill(cursor, 'new', reversed(rows))
+    assert diff(cursor) == ([], 2, 2)
+
+
+def test_added_and_removed_rows(cursor):
+    old = fill(cursor, 'old', [('U0100', 'NET', 'a'), ('U0101', 'NET', 'b')])
+    new = fill(cursor, 'new', [('U0100', 'NET', 'a'), ('U0102', 'NET', 'c')])
+    assert diff(cursor) == ([('added', None, new[1]), ('removed', old[1], None)], 2, 2)
+
+
+def test_changed_values_under_the_same_key_are_modified(cursor):
+    old = fill(cursor, 'old', [('U0100', 'NET', 'a'), ('U0101', 'NET', 'b')])
+    new = fill(cursor, 'new', [('U0100', 'NET', 'a'), ('U0101', 'NET', 'b, edited')])
+    assert diff(cursor) == ([('modified', old[1], new[1])], 2, 2)
+
+
+def test_values_are_compared_normalized(cursor):
+    fill(cursor, 'old', [('U0100', 'NET', 'a')])
+    fill(cursor, 'new', [(' U0100 ', 'NET', 'a')])
+    assert diff(cursor) == ([], 1, 1)
+
+
+def test_duplicate_keys_pair_up_the_unmatched_rows(cursor):
+    # Three old rows share a key; one is kept as is, one is edited and one dropped
+    old = fill(cursor, 'old', [('U0100', 'NET', 'a'), ('U0100', 'NET', 'b'), ('U0100', 'NET', 'c')])
+    new = fill(cursor, 'new', [('U0100', 'NET', 'b'), ('U0100', 'NET', 'd')])
+    assert diff(cursor) == ([('modified', old[0], new[1]), ('removed', old[2], None)], 3, 2)
+
+
+def test_duplicate_keys_with_more_new_rows_are_added(cursor):
+    old = fill(cursor, 'old', [('U0100', 'NET', 'a'), ('U0100', 'NET', 'a')])
+    new = fill(cursor, 'new', [('U0100', 'NET', 'a'), ('U0100', 'NET', 'x'), ('U0100', 'NET', 'y')])
+    assert diff(cursor) == ([('added', None, new[2]), ('modified', old[0], new[1])], 2, 3)
+
+
+def test_old_rows_can_be_limited_to_source_files(cursor):
+    fill(cursor, 'old', [('U0100', 'NET', 'a')])
+    cursor.execute("UPDATE old SET source_file = 'b.xlsx'")
+    fill(cursor, 'old', [('U0101', 'NET', 'b')])
+    fill(cursor, 'new', [('U0101', 'NET', 'b')])
+    changes, old_count, new_count = diff_tables(cursor, 'dtc_list', 'old', 'new', ['a.xlsx'])
+    assert (changes, old_count, new_count) == ([], 1, 1)
@@ -0,0 +1,113 @@
+import os
+import sqlite3
+
+import pytest
+
+from conftest import DTC_HEADER, DTC_SHEET, write_workbook, workbooks, dtc_rows
+from import_engine import run_import, plan_incremental_import
+from preflight import preflight_jobs, loadable_jobs
+
+
+@pytest.fixture
+def imported(tmp_path, db_path):
+    """A blacklist folder of three workbooks, fully imported"""
+    folder = tmp_path / 'black'
+    folder.mkdir()
+    for i in range(3):
+        write_workbook(folder / f'black{i}.xlsx', DTC_HEADER, dtc_rows(i * 10, 10), DTC_SHEET)
+    report = run_import([('blacklist', str(folder), workbooks(folder))], db_path, workers=1)
+    assert report['files'] and not any(entry['error'] for entry in report['files'])
+    return folder, db_path
+
+
+def plan(folder, db_path, held_back=()):
+    conn = sqlite3.connect(db_path)
+    try:
+        return plan_incremental_import(conn.cursor(), 'blacklist', workbooks(folder), held_back)
+    finally:
+        conn.commit()
+        conn.close()
+
+
+def test_unchanged_workbooks_are_skipped(imported):
+    folder, db_path = imported
+    assert plan(folder, db_path) == ({}, [])
+
+
+def test_touched_workbook_with_the_same_content_is_skipped(imported):
+    folder, db_path = imported
+    path = str(folder / 'black1.xlsx')
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 60))
+    assert plan(folder, db_path) == ({}, [])
+    # The manifest picks up the new mtime, so the file is not hashed again
+    conn = sqlite3.connect(db_path)
+    mtime = conn.execute("SELECT mtime FROM import_manifest WHERE file_path = ?", (path,)).fetchone()[0]
+    conn.close()
+    assert mtime == os.stat(path).st_mtime
+
+
+def test_changed_and_new_workbooks_are_reimported(imported):
+    folder, db_path = imported
+    write_workbook(folder / 'black1.xlsx', DTC_HEADER, dtc_rows(10, 11), DTC_SHEET)
+    write_workbook(folder / 'black3.xlsx', DTC_HEADER, dtc_rows(30, 5), DTC_SHEET)
+    changed, removed = plan(folder, db_path)
+    assert changed == {'black1.xlsx': str(folder / 'black1.xlsx'), 'black3.xlsx': str(folder / 'black3.xlsx')}
+    assert removed == []
+
+
+def test_removed_workbooks_are_listed(imported):
+    folder, db_path = imported
+    os.remove(folder / 'black0.xlsx')
+    assert plan(folder, db_path) == ({}, [str(folder / 'black0.xlsx')])
+
+
+def test_rows_without_a_source_file_force_a_rebuild(imported):
+    folder, db_path = imported
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO blacklist (dtcCode, carMake) VALUES ('U9999', 'Acura')")
+    conn.commit()
+    conn.close()
+    assert plan(folder, db_path) is None
+
+
+def test_incremental_import_applies_the_plan(imported):
+    folder, db_path = imported
+    os.remove(folder / 'black0.xlsx')
+    write_workbook(folder / 'black1.xlsx', DTC_HEADER, dtc_rows(10, 11), DTC_SHEET)
+    report = run_import([('blacklist', str(folder), workbooks(folder))], db_path,
+                        workers=1, incremental=True)
+    assert report['unchanged'] == 1
+    assert report['removed'] == [str(folder / 'black0.xlsx')]
+    conn = sqlite3.connect(db_path)
+    counts = dict(conn.execute("SELECT source_file, COUNT(*) FROM blacklist GROUP BY source_file").fetchall())
+    conn.close()
+    assert counts == {str(folder / 'black1.xlsx'): 11, str(folder / 'black2.xlsx'): 10}
+
+
+def test_held_back_workbooks_are_not_removed(imported):
+    folder, db_path = imported
+    path = str(folder / 'black0.xlsx')
+    os.rename(path, folder / 'black0.xlsx.part')
+    assert plan(folder, db_path, [path]) == ({}, [])
+
+
+@pytest.mark.parametrize('incremental', [True, False], ids=['incremental', 'rebuild'])
+def test_workbooks_rejected_by_the_preflight_keep_their_rows(imported, incremental):
+    folder, db_path = imported
+    # The workbook was replaced by an unsynced cloud placeholder
+    path = str(folder / 'black0.xlsx')
+    with open(path, 'wb') as f:
+        f.write(b'0' * 10)
+    write_workbook(folder / 'black1.xlsx', DTC_HEADER, dtc_rows(10, 11), DTC_SHEET)
+    jobs = [('blacklist', str(folder), workbooks(folder))]
+    jobs, held_back = loadable_jobs(jobs, preflight_jobs(jobs, workers=1, db_path=db_path))
+    assert held_back == {'blacklist': [path]}
+    report = run_import(jobs, db_path, workers=1, incremental=incremental, held_back=held_back)
+    assert report['removed'] == []
+    conn = sqlite3.connect(db_path)
+    counts = dict(conn.execute("SELECT source_file, COUNT(*) FROM blacklist GROUP BY source_file").fetchall())
+    manifest = [row[0] for row in conn.execute("SELECT file_path FROM import_manifest ORDER BY file_path")]
+    conn.close()
+    assert counts == {path: 10, str(folder / 'black1.xlsx'): 11, str(folder / 'black2.xlsx'): 10}
+    assert manifest == [path, str(folder / 'black1.xlsx'), str(folder / 'black2.xlsx')]
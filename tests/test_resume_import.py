@@ -0,0 +1,101 @@
+import sqlite3
+import threading
+
+import pytest
+
+import import_engine
+from conftest import CHART_HEADER, write_workbook, workbooks
+from import_engine import run_import, interrupted_imports
+
+CHART_ROWS = 1000
+
+
+@pytest.fixture
+def chart_job(tmp_path, monkeypatch):
+    """A manufacturer chart folder imported in small checkpoints.
+
+    Some rows only hold a note outside the chart's columns: a streamed read
+    counts them toward its resume offset, a parsed one drops them first.
+    """
+    monkeypatch.setattr(import_engine, 'CHECKPOINT_ROWS', 100)
+    monkeypatch.setattr(import_engine, 'STREAM_CHUNK_ROWS', 50)
+    folder = tmp_path / 'chart'
+    folder.mkdir()
+    rows = []
+    for n in range(CHART_ROWS):
+        rows.append([2010 + n % 10, 'Acura', f'Model{n}', 'Honda', ''])
+        if n % 7 == 0:
+            rows.append(['', '', '', '', 'see below'])
+    path = write_workbook(folder / 'Acura.xlsx', CHART_HEADER + ['Notes'], rows)
+    return ('manufacturer_chart', str(folder), workbooks(folder)), path
+
+
+def interrupt(job, db_path, streaming, after_rows=300):
+    """Run an import and cancel it once ``after_rows`` rows were written"""
+    cancel = threading.Event()
+
+    def progress(state):
+        if state['rows'] >= after_rows:
+            cancel.set()
+
+    return run_import([job], db_path, workers=1, progress_callback=progress, streaming=streaming,
+                      cancel_event=cancel)
+
+
+def chart_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*), COUNT(DISTINCT Model) FROM manufacturer_chart").fetchone()
+    finally:
+        conn.close()
+
+
+def journal(db_path, filepath):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT row_offset, row_count, done, streamed FROM import_journal WHERE file_path = ?",
+                            (filepath,)).fetchone()
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize('streaming', [True, False], ids=['streamed', 'parsed'])
+def test_cancelled_import_resumes_from_its_checkpoint(db_path, chart_job, streaming):
+    job, path = chart_job
+    report = interrupt(job, db_path, streaming)
+    assert report['cancelled']
+    # The live table is untouched; the staged rows wait in the journal
+    assert chart_rows(db_path) == (0, 0)
+    row_offset, row_count, done, streamed = journal(db_path, path)
+    assert 0 < row_count < CHART_ROWS and not done and streamed == int(streaming)
+    assert interrupted_imports(db_path) == ([job], False)
+
+    report = run_import([job], db_path, workers=1, streaming=streaming)
+    assert report['resumed'] == ['manufacturer_chart']
+    [entry] = report['files']
+    assert entry['resumed_from'] == row_offset and entry['rows'] == CHART_ROWS
+    assert chart_rows(db_path) == (CHART_ROWS, CHART_ROWS)
+    assert interrupted_imports(db_path) == ([], False)
+
+
+@pytest.mark.parametrize('streaming', [True, False], ids=['streamed', 'parsed'])
+def test_resume_in_the_other_mode_restarts_the_workbook(db_path, chart_job, streaming):
+    job, path = chart_job
+    interrupt(job, db_path, streaming)
+    report = run_import([job], db_path, workers=1, streaming=not streaming)
+    assert chart_rows(db_path) == (CHART_ROWS, CHART_ROWS)
+    [entry] = report['files']
+    assert 'resumed_from' not in entry and entry['rows'] == CHART_ROWS
+
+
+def test_journal_without_a_mode_restarts_the_workbook(db_path, chart_job):
+    job, path = chart_job
+    interrupt(job, db_path, streaming=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE import_journal SET streamed = NULL")
+    conn.commit()
+    conn.close()
+    report = run_import([job], db_path, workers=1, streaming=True)
+    [entry] = report['files']
+    assert 'resumed_from' not in entry
+    assert chart_rows(db_path) == (CHART_ROWS, CHART_ROWS)
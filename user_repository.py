@@ -0,0 +1,55 @@
+from repository import fetch_all, fetch_one, execute
+
+QUERIES = {
+    'users': "SELECT pin, name FROM leader_log ORDER BY name",
+    'pin_by_name': "SELECT pin FROM leader_log WHERE name = ?",
+    'name_by_pin': "SELECT name FROM leader_log WHERE pin = ?",
+    'add': "INSERT INTO leader_log (pin, name) VALUES (?, ?)",
+    'add_missing': "INSERT INTO leader_log (pin, name) SELECT ?, ? "
+                   "WHERE NOT EXISTS (SELECT 1 FROM leader_log WHERE name = ?)",
+    'update': "UPDATE leader_log SET pin = ?, name = ? WHERE name = ?",
+    'set_pin': "UPDATE leader_log SET pin = ? WHERE name = ?",
+    'delete': "DELETE FROM leader_log WHERE name = ?",
+}
+
+
+def get_users(db_path='data.db'):
+    """Get every user as (pin, name), sorted by name"""
+    return fetch_all(QUERIES['users'], (), db_path)
+
+
+def get_user_pin(name, db_path='data.db'):
+    """Get a user's PIN, or None if there is no such user"""
+    row = fetch_one(QUERIES['pin_by_name'], (name,), db_path)
+    return row[0] if row else None
+
+
+def get_user_by_pin(pin, db_path='data.db'):
+    """Get the name of the user with a PIN, or None"""
+    row = fetch_one(QUERIES['name_by_pin'], (pin,), db_path)
+    return row[0] if row else None
+
+
+def add_user(pin, name, db_path='data.db'):
+    """Add a user; raises sqlite3.IntegrityError if the PIN or name is taken"""
+    execute(QUERIES['add'], (pin, name), db_path)
+
+
+def ensure_user(pin, name, db_path='data.db'):
+    """Add a user unless one with that name exists; returns True if it was added"""
+    return execute(QUERIES['add_missing'], (pin, name, name), db_path) > 0
+
+
+def update_user(name, pin, new_name, db_path='data.db'):
+    """Change a user's PIN and name"""
+    execute(QUERIES['update'], (pin, new_name, name), db_path)
+
+
+def set_user_pin(name, pin, db_path='data.db'):
+    """Change a user's PIN"""
+    execute(QUERIES['set_pin'], (pin, name), db_path)
+
+
+def delete_user(name, db_path='data.db'):
+    """Delete a user"""
+    execute(QUERIES['delete'], (name,), db_path)